@@ -0,0 +1,262 @@
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import SmiteDataAPIFrame as smite
+from SmiteFakeServer import FakeHiRezServer
+
+
+##############################################################################
+############################### Benchmarks ###################################
+##############################################################################
+
+def _percentile(values, q):
+    # values must be sorted, nearest-rank percentile
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, math.ceil(q / 100.0 * len(values)) - 1))
+    return values[index]
+
+
+def _summary(name, latencies, elapsed, calls, **extra):
+    latencies = sorted(latencies)
+    result = {
+        "name" : name,
+        "calls" : calls,
+        "seconds" : round(elapsed, 6),
+        "per_second" : round(calls / elapsed, 2) if elapsed > 0 else None,
+        "mean_ms" : round(sum(latencies) / len(latencies) * 1000, 6) if latencies else None,
+        "p50_ms" : round(_percentile(latencies, 50) * 1000, 6),
+        "p99_ms" : round(_percentile(latencies, 99) * 1000, 6),
+        "max_ms" : round(latencies[-1] * 1000, 6) if latencies else None,
+    }
+    result.update(extra)
+    return result
+
+
+def measure(name, func, calls, threads=1, warmup=0, **extra):
+    """
+    Calls func(index) calls times over threads threads and returns the throughput/latency summary.
+
+    Parameters:
+    - name (str): Name of the result
+    - func (callable): Takes the call index, so calls can use distinct arguments (no caching/coalescing)
+    - calls (int): Timed calls
+    - threads (int): Calls made at the same time
+    - warmup (int): Untimed calls made first (session creation, connection pool, ...)
+    - extra: Added to the result as is, ex. items per call
+    """
+    for index in range(warmup):
+        func(-1 - index)
+
+    def timed(index):
+        start = time.perf_counter()
+        func(index)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if threads <= 1:
+        latencies = [timed(index) for index in range(calls)]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            latencies = list(executor.map(timed, range(calls)))
+    elapsed = time.perf_counter() - start
+    return _summary(name, latencies, elapsed, calls, threads=threads, **extra)
+
+
+def measure_tight(name, func, calls, repeat=5):
+    """
+    For sub-microsecond/microsecond operations: times calls back to back in repeat rounds, per-call time comes from
+    each round's average (timing every single call would mostly measure perf_counter itself).
+    """
+    rounds = []
+    total = 0.0
+    for round_number in range(repeat):
+        start = time.perf_counter()
+        for index in range(calls):
+            func(index)
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        rounds.append(elapsed / calls)
+    return _summary(name, rounds, total, calls * repeat, rounds=repeat)
+
+
+# individual benchmarks, each returns a list of results
+
+def bench_signing(calls):
+    signer = smite.get_signer()
+    return [measure_tight("general_API_url", lambda index: smite.general_API_url(method="getmatchdetails", session_id="SESSION"), calls),
+            measure_tight("RequestSigner.url", lambda index: signer.url("getmatchdetails", "SESSION"), calls)]
+
+
+def bench_session_check(calls):
+    def plain(session_id=None, value=None):
+        return value
+
+    checked = smite.valid_session_check(plain)
+    smite.session_manager.get_session_id()
+    base = measure_tight("call_without_valid_session_check", lambda index: plain(value=index), calls)
+    wrapped = measure_tight("valid_session_check", lambda index: checked(value=index), calls)
+    wrapped["overhead_us"] = round((wrapped["mean_ms"] - base["mean_ms"]) * 1000, 4)
+    return [base, wrapped]
+
+
+def bench_json_decode(server, calls, matches=10):
+    # realistic getmatchdetailsbatch body: matches x players_per_match rows with every MatchPlayer field
+    rows = server.synthetic("getmatchdetailsbatch", [",".join(str(1000 + number) for number in range(matches))])
+    body = json.dumps(rows).encode('utf-8')
+    results = []
+    previous = smite.json_backend
+    try:
+        for backend in smite.JSON_BACKENDS:
+            try:
+                smite.set_json_backend(backend)
+            except ValueError:
+                continue
+            result = measure_tight(f"json_decode[{backend}]", lambda index: smite.json_loads(body), calls)
+            result.update({"bytes" : len(body), "rows" : len(rows)})
+            results.append(result)
+        result = measure_tight("MatchPlayer.from_rows", lambda index: smite.MatchPlayer.from_rows(rows), calls)
+        result["rows"] = len(rows)
+        results.append(result)
+    finally:
+        smite.set_json_backend(previous)
+    return results
+
+
+def bench_endpoints(calls, threads):
+    results = []
+    results.append(measure("get_player", lambda index: smite.get_player(player_name=f"player{index}"), calls, threads=threads, warmup=1))
+    results.append(measure("get_player_status", lambda index: smite.get_player_status(player_id=index + 1000), calls, threads=threads, warmup=1))
+    # same player every time, so after the first call it's the response cache path (30s ttl)
+    smite.response_cache.enabled = True
+    try:
+        results.append(measure("get_player_status[cached]", lambda index: smite.get_player_status(player_id=1), calls, threads=threads, warmup=1))
+    finally:
+        smite.response_cache.enabled = False
+    return results
+
+
+def bench_batches(calls, threads, matches_per_call=50):
+    def batch(index):
+        first = 10**6 + (index + 10) * matches_per_call
+        smite.get_match_details_BATCH(match_id_list=list(range(first, first + matches_per_call)), max_workers=threads)
+
+    def stream(index):
+        first = 2 * 10**6 + (index + 10) * matches_per_call
+        for row in smite.stream_match_details_BATCH(range(first, first + matches_per_call)):
+            pass
+
+    return [measure("get_match_details_BATCH", batch, calls, warmup=1, matches=matches_per_call, max_workers=threads),
+            measure("stream_match_details_BATCH", stream, calls, warmup=1, matches=matches_per_call)]
+
+
+BENCHMARKS = ('signing', 'session_check', 'json_decode', 'endpoints', 'batches')
+
+
+def _version():
+    # git describe of the library, so results can be lined up with versions
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=os.path.dirname(os.path.abspath(smite.__file__)),
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(only=BENCHMARKS, calls=200, micro_calls=20000, threads=8, latency=0.0, base_url=None):
+    """
+    Runs the benchmarks against a local FakeHiRezServer (or base_url) and returns the results as a dictionary.
+
+    Parameters:
+    - only (tuple): Names from BENCHMARKS to run
+    - calls (int): Calls per endpoint benchmark
+    - micro_calls (int): Calls per round for signing/session check/json decode
+    - threads (int): Concurrent callers for the endpoint benchmarks
+    - latency (float): Seconds the fake server adds to every request
+    - base_url (str): Benchmark an already running server instead of starting a fake one
+
+    Notes:
+    - The rate limiter is lifted and the response cache is off (except the [cached] run) so the library itself is measured
+    - Sessions go to a temp folder, the real CurrentSessionID.txt/timestamp.txt are left alone
+    - Every module setting it changes (client, limiter, session, cache, keys, credential pool, json backend) is put back afterwards
+    """
+    # with a base_url the fake server isn't started, json_decode still uses it for its synthetic rows
+    server = FakeHiRezServer(latency=latency)
+    if base_url is None:
+        server.start()
+    workdir = tempfile.mkdtemp(prefix='smite_bench_')
+    saved = (smite.http_client, smite.rate_limiter, smite.session_manager, smite.response_cache, smite.devId, smite.authKey)
+    saved_pool = smite.credential_pool
+    saved_backend = smite.json_backend
+    try:
+        # one key with the lifted limiter below, a pool's keys would bring their own limits
+        smite.set_credential_pool(None)
+        smite.set_base_url(base_url or server.base_url)
+        smite.rate_limiter = smite.RateLimiter(requests_per_second=None, daily_requests=10**9, daily_sessions=10**6, concurrent_sessions=10**6)
+        smite.session_manager = smite.SessionManager(os.path.join(workdir, 'CurrentSessionID.txt'), os.path.join(workdir, 'timestamp.txt'))
+        smite.response_cache = smite.ResponseCache(os.path.join(workdir, 'cache.sqlite3'), enabled=False)
+        if smite.devId is None:
+            # the fake server takes any key
+            smite.devId, smite.authKey = 1000, 'BENCHMARK'
+
+        results = []
+        if 'signing' in only:
+            results += bench_signing(micro_calls)
+        if 'session_check' in only:
+            results += bench_session_check(micro_calls)
+        if 'json_decode' in only:
+            results += bench_json_decode(server, max(1, micro_calls // 100))
+        if 'endpoints' in only:
+            results += bench_endpoints(calls, threads)
+        if 'batches' in only:
+            results += bench_batches(max(1, calls // 10), threads)
+    finally:
+        if smite.http_client is not saved[0]:
+            # the client set_base_url made for the run
+            smite.http_client.close()
+        smite.http_client, smite.rate_limiter, smite.session_manager, smite.response_cache, smite.devId, smite.authKey = saved
+        smite.set_credential_pool(saved_pool)
+        smite.set_json_backend(saved_backend)
+        if base_url is None:
+            server.stop()
+
+    return {
+        "version" : _version(),
+        "timestamp" : time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        "python" : platform.python_version(),
+        "platform" : platform.platform(),
+        "json_backend" : smite.json_backend,
+        "config" : {"calls" : calls, "micro_calls" : micro_calls, "threads" : threads, "latency" : latency, "base_url" : base_url},
+        "results" : results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput/latency benchmarks for SmiteDataAPIFrame against a local fake HiRez api.")
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument('--calls', type=int, default=200, help="calls per endpoint benchmark")
+    parser.add_argument('--micro-calls', type=int, default=20000, help="calls per round for signing/session check/json decode")
+    parser.add_argument('--threads', type=int, default=8, help="concurrent callers for endpoint benchmarks")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the fake server adds to every request")
+    parser.add_argument('--base-url', default=None, help="benchmark an already running server instead")
+    parser.add_argument('--output', default=None, help="write the json results here (stdout otherwise)")
+    args = parser.parse_args()
+
+    report = run(tuple(args.only), args.calls, args.micro_calls, args.threads, args.latency, args.base_url)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -1,485 +1,2650 @@
+import codecs
+import contextvars
 import hashlib
 import json
+import logging
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import string
 import re
 from functools import wraps
 import os
-from SmiteAPIFrameFolder import PersonalKeys 
-#import PersonalKeys #Swap between this and the above for main (this) vs package (above)
-
-# set your devId and authKey here
-devId=PersonalKeys.devId
-authKey=PersonalKeys.authKey
+import threading
+import asyncio
+import inspect
+import random
+import calendar
+import sqlite3
+from collections import deque
+from dataclasses import make_dataclass
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+try:
+    import aiohttp
+except ImportError:  # only needed for AsyncSmiteClient
+    aiohttp = None
+try:
+    import numpy as np
+except ImportError:  # only needed for match_numpy
+    np = None
+try:
+    import pyarrow as pa
+except ImportError:  # only needed for match_arrow_table/MatchTableWriter
+    pa = None
+try:
+    import orjson
+except ImportError:  # optional, faster json
+    orjson = None
+try:
+    import ujson
+except ImportError:  # optional, faster json when orjson isn't there
+    ujson = None
+try:
+    from SmiteAPIFrameFolder import PersonalKeys 
+    #import PersonalKeys #Swap between this and the above for main (this) vs package (above)
+except ImportError:  # no key file, keys come from the environment (a local SmiteFakeServer accepts any pair, but one has to be set)
+    PersonalKeys = None
+
+# set your devId and authKey here, or SMITE_DEV_ID/SMITE_AUTH_KEY in the environment
+devId=PersonalKeys.devId if PersonalKeys is not None else os.environ.get('SMITE_DEV_ID')
+authKey=PersonalKeys.authKey if PersonalKeys is not None else os.environ.get('SMITE_AUTH_KEY')
 
 
 base_api_url_PC='https://api.smitegame.com/smiteapi.svc/'
 base_api_url_XBOX='http://api.xbox.smitegame.com/smiteapi.svc/'
 base_api_url_PS4='http://api.ps4.smitegame.com/smiteapi.svc/'
 
+LANGUAGE_CODES = (1, 2, 3, 5, 7, 9, 10, 11, 12, 13)
+PORTAL_IDS = (1, 5, 9, 10, 22, 25, 28)
+RANKED_QUEUES = (440, 450, 451)
 
-def valid_session_check(func):
-    
-    @wraps(func)
-    def wrapper(session_id=None,*args, **kwargs):
-            # check if a session is still valid, and generate a new session ID if necessary
-        if is_session_valid():
-            print(f"Session is valid.")
-            # session is still valid, use the existing session ID    
-            with open('CurrentSessionID.txt', 'r') as f:
-                session_id = str(f.read())
-        else:
-            print(f"Session is expired.")
-            # session has expired, generate a new session ID
-            session_id = generate_session_id()
-            print(f"New session created.")
+# diagnostics go through logging, one logger per subsystem, nothing is printed unless the app configures logging
+# ex. logging.basicConfig(level=logging.INFO) or logging.getLogger('SmiteAPIFrame.session').setLevel(logging.DEBUG)
+log = logging.getLogger('SmiteAPIFrame')
+log.addHandler(logging.NullHandler())
+http_log = logging.getLogger('SmiteAPIFrame.http')        # requests, retries, rate limiting, key failover
+session_log = logging.getLogger('SmiteAPIFrame.session')  # createsession/testsession
+static_log = logging.getLogger('SmiteAPIFrame.static')    # god/item files and the god index
 
-        data = func(session_id=session_id,*args, **kwargs)
-        return data
-    
-    return wrapper
 
+# json backends in order of preference, the first installed one is used
+JSON_BACKENDS = ('orjson', 'ujson', 'json')
+json_backend = 'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json'
 
-def general_API_url(method = None, session_id = None, developer_id= None, authorization_key = None):
+
+def set_json_backend(name):
     """
-    General Smite API url for endpoints in json.
-                
-        
+    Picks the json library used for api responses, the response cache and the export files.
 
     Parameters:
-    - method (str): Specifies the api endpoint. Should be provided by other functions 
-                  ex. 'endpoint'
-    - session_id (str): Personal session_id needed to make api calls. Should be provided by other functions
-                created by generate_session_id() function
-    - developer_id (int): devID provided by HiRez
-    - authorization_key (str): authKey provided by HiRez
-
+    - name (str): 'orjson', 'ujson' or 'json' (stdlib)
 
     Returns:
-    - [API_URL]/{method}[ResponseFormat]/{developerId}/{signature}/{session}/{timestamp} as a string
-                Returns None if any parameter is missing
-
+    - The previous backend name
 
     Raises:
-    - Nothing, there's no error catching yet
+    - ValueError: If the backend is unknown or not installed
     """
-    if devId:
-        developer_id = devId
-    if authKey:
-        authorization_key = authKey
-    params = (method, session_id, developer_id, authorization_key)
-    
-    if any(param is None for param in params):
-        return None
+    global json_backend
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown json backend {name!r}, expected one of {JSON_BACKENDS}")
+    if (name == 'orjson' and orjson is None) or (name == 'ujson' and ujson is None):
+        raise ValueError(f"{name} isn't installed")
+    previous, json_backend = json_backend, name
+    return previous
 
-    timestamp = time.strftime('%Y%m%d%H%M%S', time.gmtime())
-    signature = hashlib.md5(f"{developer_id}{method}{authorization_key}{timestamp}".encode('utf-8')).hexdigest()
-    url = f'https://api.smitegame.com/smiteapi.svc/{method}json/{developer_id}/{signature}/{session_id}/{timestamp}'
-    return url
 
-##############################################################################
-########## APIs - Connectivity, Development, & System Status #################
-##############################################################################
+def json_loads(data):
+    """
+    Decodes json (str or bytes) with the selected backend. Raises ValueError on a bad body, same as json.loads.
+    """
+    if json_backend == 'orjson':
+        return orjson.loads(data)
+    if json_backend == 'ujson':
+        return ujson.loads(data)
+    return json.loads(data)
 
-# pings to the hirez api
-def api_ping(platform=0):
+
+def json_dumps(obj, indent=None, sort_keys=False):
     """
-    Send a ping request to the API.
+    Encodes obj to a json str with the selected backend.
 
-    Parameters:
-    - platform (int): Specifies the api platform (if applicable). 
-                  0 for PC (default), 1 for Xbox, 2 for PS4
+    Notes:
+    - orjson only does indent=2, other indents go through the stdlib
+    - Anything the fast backends refuse (ex. ints over 64 bits) falls back to the stdlib too
+    - orjson/ujson don't escape non-ascii characters, so open files with encoding='utf-8'
+    """
+    if json_backend == 'orjson' and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option).decode('utf-8')
+        except TypeError:
+            pass
+    elif json_backend == 'ujson':
+        try:
+            return ujson.dumps(obj, indent=indent or 0, sort_keys=sort_keys, ensure_ascii=False)
+        except (TypeError, OverflowError):
+            pass
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys)
 
-    Returns:
-    - Response result as json.
 
+def json_dump(obj, f, indent=None):
+    # file version of json_dumps(), f is a text file
+    f.write(json_dumps(obj, indent=indent))
 
-    Raises:
-    - ValueError: If platform is not 0, 1 or 2.
-    """
-    try:
-        if platform not in (0, 1, 2):
-            raise ValueError("Platform input can only be 0 (PC), 1 (XBOX), or 2 (PS4)")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-    
 
-    url_list = [base_api_url_PC, base_api_url_XBOX, base_api_url_PS4]
+def json_load(f):
+    # file version of json_loads()
+    return json_loads(f.read())
 
-    url = f'{url_list[platform]}pingJson'
 
-    response = requests.get(url) 
+class SmiteAPIError(Exception):
+    """
+    Base class for errors raised by this module.
+    """
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
-    # print(response.headers)
-    # ourcontent = response.content
-    # print(f'the response body is {len(ourcontent.decode("utf-8"))} bytes i think \n')
-    return response.json()
 
-# create a function to generate a new session ID
-def generate_session_id():
+class QuotaExceededError(SmiteAPIError):
+    """
+    Raised when a request would go over the HiRez daily request/session limits.
     """
-    Creates a new session ID for the user, requires personal DeveloperID and AuthKey.
 
-    Parameters:
-    - platform (int): Specifies the api platform (if applicable). 
-                  0 for PC (default), 1 for Xbox, 2 for PS4
 
-    Returns:
-    - Response result as json.
+class SmiteRequestError(SmiteAPIError):
+    """
+    Raised when an api request fails for good (non-retryable error, or retries ran out).
+
+    Attributes:
+    - method (str): Api endpoint, ex. 'getmatchdetails'
+    - status_code (int): Last HTTP status, None if no response came back (timeout/connection error)
+    - ret_msg (str): HiRez ret_msg of the last response, if any
+    - attempts (int): Number of attempts made
+    """
 
+    def __init__(self, message, method=None, status_code=None, ret_msg=None, attempts=0):
+        super().__init__(message)
+        self.method = method
+        self.status_code = status_code
+        self.ret_msg = ret_msg
+        self.attempts = attempts
 
-    Raises:
-    - ValueError: If platform is not 0, 1 or 2.
+
+class SmiteHTTPClient:
     """
-    method = "createsession"
-    # get the current UTC time formatted as yyyyMMddHHmmss
-    timestamp = time.strftime('%Y%m%d%H%M%S', time.gmtime())
+    Shared HTTP client for every endpoint. Keeps connections to the api alive (pooled) instead of
+    opening a new TCP+TLS connection for every call like the module-level requests.get does.
 
-    # create the signature by concatenating the devId, method name, authKey, and timestamp
-    signature = hashlib.md5(f"{devId}{method}{authKey}{timestamp}".encode('utf-8')).hexdigest()
+    Parameters:
+    - base_url (str): Api url the endpoints are built on, point this at a local stub server for benchmarking
+    - pool_connections (int): Number of hosts to keep connection pools for
+    - pool_maxsize (int): Max number of connections kept alive per host, should be >= the number of threads making calls
+    - timeout (float/tuple): requests timeout, either one number or (connect timeout, read timeout) in seconds
 
-    # make the API request to generate a new session ID
-    url = f"https://api.smitegame.com/smiteapi.svc/{method}Json/{devId}/{signature}/{timestamp}"
-    response = requests.get(url)
+    Notes:
+    - requests.Session is shared between threads, the connection pool itself is thread safe
+    """
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+    def __init__(self, base_url=base_api_url_PC, pool_connections=4, pool_maxsize=16, timeout=(5, 30)):
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
-    # parse the JSON response
-    data = json.loads(response.text)
-    print(data)
-    print("the generate session id function called this\n")
-    # extract the session ID from the response
-    sessionId = data['session_id']
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
 
-    # write the current timestamp value to a file
-    with open('timestamp.txt', 'w') as f:
-        f.write(str(int(time.time())))
+    def close(self):
+        self.session.close()
 
-    with open('CurrentSessionID.txt', 'w') as f:
-        f.write(str(sessionId))
 
-    return sessionId
+# every endpoint goes through this client, swap it with set_http_client()/set_base_url()
+# SMITE_API_URL points it somewhere else from the start, ex. a SmiteFakeServer
+http_client = SmiteHTTPClient(base_url=os.environ.get('SMITE_API_URL') or base_api_url_PC)
 
-# create a function to check if the session is still valid
-def is_session_valid():
+
+def set_http_client(client):
     """
-    Checks the session timestamp for validity. Min-Max session creation limit.
-    Limit is 15min but I changed it to 14min bc I would get kicked out mid get request
+    Replaces the shared HTTP client used by every endpoint function.
 
     Parameters:
-    - None needed
-
-    Errors:
-    - Returns false if the 'timestamp.txt' or 'CurrentSessionID.txt' are not found
+    - client (SmiteHTTPClient): ex. SmiteHTTPClient(base_url='http://127.0.0.1:8080/smiteapi.svc/', pool_maxsize=64)
 
     Returns:
-    - True: if 14 minutes has not passed (is valid)
-    - False: if 14 minutes has passed (not valid)
-
+    - The previous client
     """
-    #Timestamp is stored as int(time.time())
-    if not os.path.exists('timestamp.txt'):
-        return False
-    if not os.path.exists('CurrentSessionID.txt'):
-        return False
-    
-    with open('timestamp.txt', 'r') as f:
-        stored_timestamp = int(f.read())
-
-    current_time = int(time.time())
-    elapsed_time = current_time - stored_timestamp
-    session_length = 14 * 60 
+    global http_client
+    previous = http_client
+    http_client = client
+    return previous
 
-    # Returns True if less than 14min has passed since last session creation
-    return elapsed_time < session_length
 
-# determines if a session is valid or not - endpoint
-def _test_session():
+def set_base_url(base_url):
     """
-    Not sure how to differentiate between a fail or successful test; both return approved ret_msg and a 200 status code
-    Probably not going to use this 
+    Points every endpoint at another api url, keeping the current client's timeout.
+
+    Parameters:
+    - base_url (str): ex. base_api_url_XBOX, or a local SmiteFakeServer's base_url
+
+    Returns:
+    - The previous base url
     """
-    with open('CurrentSessionID.txt', 'r') as f:
-        sesh = str(f.read())
-    url = general_API_url(method='testsession',session_id=sesh)
-    response = requests.get(url)
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
-    print (response)
-    print ("\n\n\n")
-    wow = response.json()
-    
-    print (wow)
-    return 
+    previous = http_client.base_url
+    set_http_client(SmiteHTTPClient(base_url=base_url, timeout=http_client.timeout))
+    return previous
 
-# user's api limits
-@valid_session_check
-def MyData(session_id=None):
+
+class RateLimiter:
     """
-    Checks the user's # of active sessions, session/request limit (500/7500), and current amount of sessions/requests made today.
+    Client-side limiter every api request goes through, so we slow down before HiRez blocks us mid-crawl.
+    Token bucket for per-second bursts plus daily request/session counters (reset at UTC midnight).
 
     Parameters:
-    - None needed
+    - requests_per_second (float): Sustained request rate, None for no per-second limit
+    - burst (int): Requests allowed back to back before the per-second rate kicks in
+    - daily_requests (int): Request_Limit_Daily, 7500 by default
+    - daily_sessions (int): Session_Cap, 500 by default
+    - concurrent_sessions (int): Concurrent_Sessions, max sessions alive at once (a session lives 15min)
 
-    Returns:
-    - Response result as json; a list containing 1 dictionary
-    - Returns nothing if status code fails
+    Raises:
+    - QuotaExceededError: From reserve()/acquire() when the daily request or session budget is used up
 
+    Notes:
+    - Seed it from MyData() (getdataused) at startup with seed_from_data_used(), the api knows about calls made elsewhere
+    - remaining() exposes what is left so schedulers can plan work
     """
-    url = general_API_url(method="getdataused",session_id=session_id)
 
-    response = requests.get(url)
+    def __init__(self, requests_per_second=10, burst=20, daily_requests=7500, daily_sessions=500, concurrent_sessions=50):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.daily_requests = daily_requests
+        self.daily_sessions = daily_sessions
+        self.concurrent_sessions = concurrent_sessions
+        self.session_length = 15 * 60
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._day = self._today()
+        self._requests_today = 0
+        self._sessions_today = 0
+        self._session_times = deque()
+
+    @staticmethod
+    def _today():
+        return time.strftime('%Y%m%d', time.gmtime())
+
+    def _roll_day(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._requests_today = 0
+            self._sessions_today = 0
+
+    def reserve(self):
+        """
+        Takes one request from the budget without blocking.
+
+        Returns:
+        - Seconds the caller should wait before sending the request (0.0 if it can go right away)
+        """
+        with self._lock:
+            self._roll_day()
+            if self._requests_today >= self.daily_requests:
+                raise QuotaExceededError(f"Daily request limit reached ({self.daily_requests}).")
+            self._requests_today += 1
+            if not self.requests_per_second:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.requests_per_second)
+            self._last_refill = now
+            # the bucket is allowed to go negative, whoever is in debt waits it off
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.requests_per_second
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            if http_log.isEnabledFor(logging.DEBUG):
+                http_log.debug("Rate limiter: waiting %.3fs", delay)
+            time.sleep(delay)
+
+    def acquire_session(self):
+        """
+        Takes one session from the daily and concurrent session budgets.
+        """
+        with self._lock:
+            self._roll_day()
+            if self._sessions_today >= self.daily_sessions:
+                raise QuotaExceededError(f"Daily session limit reached ({self.daily_sessions}).")
+            now = time.time()
+            while self._session_times and now - self._session_times[0] >= self.session_length:
+                self._session_times.popleft()
+            if len(self._session_times) >= self.concurrent_sessions:
+                raise QuotaExceededError(f"Concurrent session limit reached ({self.concurrent_sessions}).")
+            self._sessions_today += 1
+            self._session_times.append(now)
+
+    def exhaust(self):
+        """
+        Marks today's request budget as used up, ex. when HiRez says the daily limit is reached.
+        """
+        with self._lock:
+            self._roll_day()
+            self._requests_today = max(self._requests_today, self.daily_requests)
+
+    def seed_from_data_used(self, data):
+        """
+        Syncs the limits and today's counters with a getdataused (MyData()) response.
+
+        Parameters:
+        - data (list/dict): Response of MyData(); a list containing 1 dictionary
+        """
+        if isinstance(data, list):
+            if not data:
+                return
+            data = data[0]
+        if not isinstance(data, dict):
+            return
+        with self._lock:
+            self._roll_day()
+            self.daily_requests = int(data.get('Request_Limit_Daily') or self.daily_requests)
+            self.daily_sessions = int(data.get('Session_Cap') or self.daily_sessions)
+            self.concurrent_sessions = int(data.get('Concurrent_Sessions') or self.concurrent_sessions)
+            if data.get('Session_Time_Limit'):
+                self.session_length = int(data['Session_Time_Limit']) * 60
+            self._requests_today = max(self._requests_today, int(data.get('Total_Requests_Today') or 0))
+            self._sessions_today = max(self._sessions_today, int(data.get('Total_Sessions_Today') or 0))
+
+    def remaining(self):
+        """
+        Returns what is left of today's budget as a dictionary.
+
+        Data:
+        - "requests_today", "requests_remaining", "sessions_today", "sessions_remaining",
+          "concurrent_sessions_remaining", "seconds_until_reset"
+        """
+        with self._lock:
+            self._roll_day()
+            now = time.time()
+            active_sessions = sum(1 for created in self._session_times if now - created < self.session_length)
+            return {
+                "requests_today" : self._requests_today,
+                "requests_remaining" : max(0, self.daily_requests - self._requests_today),
+                "sessions_today" : self._sessions_today,
+                "sessions_remaining" : max(0, self.daily_sessions - self._sessions_today),
+                "concurrent_sessions_remaining" : max(0, self.concurrent_sessions - active_sessions),
+                "seconds_until_reset" : 86400 - int(now) % 86400,
+            }
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
 
-    data = response.json()
-    
-    return data
+# every api request takes from this budget, swap it out for different limits
+rate_limiter = RateLimiter()
 
-# servers down ?
-@valid_session_check
-def get_hirez_server_status(session_id=None):
-    """
-    Checks the availability of HiRez servers of Smite for PC/Switch/Xbox/PS4.
-    Also contains version information
 
-    Parameters:
-    - None needed
+def seed_rate_limiter():
+    """
+    Seeds rate_limiter with today's usage from the getdataused endpoint (MyData()).
+    With a credential_pool set, every key's own limiter is seeded from its own getdataused.
 
     Returns:
-    - Response result as json; a list of dictionaries.
-    - Returns nothing if status code fails
-    
-    Notes:
-    - Most likely used when patch versions between platforms weren't sync'd
-    - Also includes pts status !!!
-
+    - rate_limiter.remaining(), or credential_pool.usage() when a pool is set
     """
- 
+    if credential_pool is None:
+        rate_limiter.seed_from_data_used(MyData())
+        return rate_limiter.remaining()
+    for credential in credential_pool.credentials:
+        token = _active_credential.set(credential)
+        try:
+            credential.rate_limiter.seed_from_data_used(MyData())
+        finally:
+            _active_credential.reset(token)
+    return credential_pool.usage()
 
-    url = general_API_url(method='gethirezserverstatus',session_id=session_id)
-    response = requests.get(url)
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
- 
-    data = response.json()
-  
-    return data
 
-# Patch info, very simple
-@valid_session_check
-def get_patch_info(session_id=None):
+def _api_get(url, limiter=None, **kwargs):
+    # every endpoint request goes through here so it counts against the daily budget (of the key it's signed with)
+    (limiter or rate_limiter).acquire()
+    return http_client.get(url, **kwargs)
+
+
+class RetryPolicy:
     """
-    Checks the version of Smite on live servers.
-    
+    How failed requests are retried: exponential backoff with full jitter.
 
     Parameters:
-    - None needed
+    - max_attempts (int): Total attempts per request, including the first one
+    - base_delay (float): Seconds to back off after the first failure, doubles every attempt
+    - max_delay (float): Cap on a single backoff
+    """
 
-    Returns:
-    - Response result as json; a list of dictionaries.
-    - Returns nothing if status code fails
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=10.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
 
-    Notes:
-    - Similar to get_hirez_server_status() but only specifies patch
+    def delay(self, attempt):
+        # attempt 1 is the first retry
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+retry_policy = RetryPolicy()
+
+# failure kinds, see _failure_kind()
+FAILURE_SESSION = 'session'         # session died early, make a new one and retry
+FAILURE_RATE_LIMIT = 'rate_limit'   # throttled, back off and retry
+FAILURE_QUOTA = 'quota'             # daily limit, no point retrying today
+FAILURE_SERVER = 'server'           # 5xx/timeouts/garbage body, retry
+FAILURE_CLIENT = 'client'           # other 4xx, retrying won't help
 
+
+def _ret_msg(data):
+    first = data[0] if isinstance(data, list) and data else data
+    if isinstance(first, dict) and isinstance(first.get('ret_msg'), str):
+        return first['ret_msg']
+    return None
+
+
+def _failure_kind(status_code, data=None):
     """
- 
+    Classifies a response, returns None if it's fine or one of the FAILURE_* kinds.
+    HiRez reports most problems with a 200 status and a ret_msg, so the body gets checked too.
+    """
+    if status_code == 429:
+        return FAILURE_RATE_LIMIT
+    if status_code >= 500:
+        return FAILURE_SERVER
+    if status_code != 200:
+        return FAILURE_CLIENT
+    ret_msg = _ret_msg(data)
+    if not ret_msg:
+        return None
+    ret_msg = ret_msg.lower()
+    if 'invalid session' in ret_msg or 'session expired' in ret_msg:
+        return FAILURE_SESSION
+    if 'daily' in ret_msg and 'limit' in ret_msg:
+        return FAILURE_QUOTA
+    if 'limit' in ret_msg or 'maximum number' in ret_msg:
+        return FAILURE_RATE_LIMIT
+    # anything else (privacy flags, not found, ...) is a real answer
+    return None
+
+
+def _failed_request(method, kind, status_code, data, attempts):
+    # raises right away if retrying can't help, otherwise returns the error to raise once retries run out
+    ret_msg = _ret_msg(data)
+    error = SmiteRequestError(f"{method} request failed ({kind}): {ret_msg or status_code}",
+                              method=method, status_code=status_code, ret_msg=ret_msg, attempts=attempts)
+    if http_log.isEnabledFor(logging.INFO):
+        http_log.info("%s attempt %d failed (%s): %s", method, attempts, kind, ret_msg or status_code)
+    if kind == FAILURE_QUOTA:
+        raise QuotaExceededError(ret_msg)
+    if kind == FAILURE_CLIENT:
+        raise error
+    return error
 
-    url = general_API_url(method='getpatchinfo',session_id=session_id)
-    response = requests.get(url)
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
- 
-    data = response.json()
-  
-    return data
 
 ##############################################################################
-################## APIs - Gods/Champions & Items #############################
+############################ Instrumentation #################################
 ##############################################################################
 
-# all god info
-@valid_session_check
-def get_gods(session_id= None, language_code = 1):
+# seconds, upper bounds of the request duration histogram (prometheus 'le' buckets)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# request time is split into these stages
+REQUEST_STAGES = ('sign', 'wait', 'network', 'decode')
+
+_metrics_sinks = []
+
+
+def add_metrics_sink(sink):
     """
-    Returns all Gods and their various attributes.
+    Registers a sink that gets every instrumentation event, returns the sink.
 
     Parameters:
-    - language_code (int): Specifies the language return
-    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
-    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
+    - sink: Anything with an emit(event) method, ex. MetricsCounter() or LogSink()
+
+    Data (event dictionaries, "event" says which kind):
+    - "request": one per attempt; "method", "developer_id", "attempt", "status", "ret_msg", "failure" (FAILURE_* or None),
+      "bytes", "sign_seconds", "wait_seconds" (rate limiter), "network_seconds", "decode_seconds", "streamed"
+      (streamed requests have no "bytes" and their decode time only covers the first element)
+    - "session": a createsession call; "developer_id", "ok", "seconds"
+    - "cache": a response_cache lookup; "endpoint", "hit"
+    - "coalesced": a call that shared an identical in-flight request (single_flight); "method"
+    """
+    _metrics_sinks.append(sink)
+    return sink
 
-    Data:
-    - Returns literally everything about every god; abilities, lore, id's etc
-    - No way to retrieve data on a specific god from the api
 
-    Notes:
-    - Probably want to save this in a database and use this to update databases every patch
+def remove_metrics_sink(sink):
+    if sink in _metrics_sinks:
+        _metrics_sinks.remove(sink)
 
-    Returns:
-    - Response result as json
-    - Returns nothing if status code fails
 
+def _emit(event):
+    for sink in list(_metrics_sinks):
+        try:
+            sink.emit(event)
+        except Exception:
+            # a broken sink never breaks a request
+            pass
 
-    Raises:
-    - ValueError: If invalid language code is entered
-    """
-    
-    try:
-        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
-            raise ValueError("Invalid language code")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-    
-    base_url = general_API_url(method="getgods",session_id=session_id)
-    
-    url = base_url + '/' + str(language_code)
-    
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+def _request_event(method, credential, attempt, timings, status=None, data=None, failure=None, size=None, streamed=False):
+    # timings: perf_counter() marks [start, signed, waited, received, decoded], None for stages that didn't happen
+    event = {"event" : "request", "method" : method, "developer_id" : credential.usage_id, "attempt" : attempt + 1,
+             "status" : status, "ret_msg" : _ret_msg(data) if data is not None else None, "failure" : failure,
+             "bytes" : size, "streamed" : streamed}
+    for number, stage in enumerate(REQUEST_STAGES):
+        begin, end = timings[number], timings[number + 1]
+        event[stage + '_seconds'] = end - begin if begin is not None and end is not None else None
+    return event
 
-    data = response.json()
-    
-    return data
 
-# top 100 leaderboard
-@valid_session_check
-def get_god_leaderboard(session_id= None, god_id = None, queue = 451):
+class MetricsCounter:
     """
-    Returns the current season's leaderboard for a god/queue combination.
+    In-process metrics sink: totals per endpoint, per key and per cache entry, plus a latency histogram.
 
     Parameters:
-    - god_id (int): Unique identifier for a god (found in get_gods endpoint)
-    - queue (int): Specifies the gamemode
-    - (440) - Ranked Duel |	(450) - Ranked Joust | (451) - Ranked Conquest 
-    
+    - buckets (tuple): Histogram bucket upper bounds in seconds
 
-    Data:
-    - Returns top 100 ranked players with a specific god
+    Usage:
+    - add_metrics_sink(metrics) once at startup, then
+      metrics.snapshot()["requests"]["getmatchdetailsbatch"]["network_seconds"]
+    - metrics.prometheus() for a /metrics endpoint (Prometheus text exposition format)
 
     Notes:
-    - Not entirely accurate
-
-    Returns:
-    - Response result as json
-    - Returns nothing if status code fails
+    - The module's metrics isn't registered by default, so requests don't build events or take its lock until it is
+    - ret_msg texts are cut at 80 characters and only the first 50 different ones per endpoint are kept
+    """
 
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}
+            self._sessions = {}
+            self._cache = {}
+
+    def _method(self, method):
+        entry = self._requests.get(method)
+        if entry is None:
+            entry = {"requests" : 0, "retries" : 0, "coalesced" : 0, "bytes" : 0, "statuses" : {}, "failures" : {}, "ret_msgs" : {},
+                     "duration_seconds" : 0.0, "histogram" : [0] * (len(self.buckets) + 1)}
+            for stage in REQUEST_STAGES:
+                entry[stage + '_seconds'] = 0.0
+            self._requests[method] = entry
+        return entry
+
+    def emit(self, event):
+        kind = event["event"]
+        with self._lock:
+            if kind == "request":
+                entry = self._method(event["method"])
+                entry["requests"] += 1
+                if event["attempt"] > 1:
+                    entry["retries"] += 1
+                status = str(event["status"]) if event["status"] is not None else "error"
+                entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+                if event["failure"]:
+                    entry["failures"][event["failure"]] = entry["failures"].get(event["failure"], 0) + 1
+                ret_msg = event["ret_msg"]
+                if ret_msg:
+                    ret_msg = str(ret_msg)[:80]
+                    if ret_msg in entry["ret_msgs"] or len(entry["ret_msgs"]) < 50:
+                        entry["ret_msgs"][ret_msg] = entry["ret_msgs"].get(ret_msg, 0) + 1
+                entry["bytes"] += event["bytes"] or 0
+                duration = 0.0
+                for stage in REQUEST_STAGES:
+                    seconds = event[stage + '_seconds'] or 0.0
+                    entry[stage + '_seconds'] += seconds
+                    duration += seconds
+                entry["duration_seconds"] += duration
+                index = 0
+                while index < len(self.buckets) and duration > self.buckets[index]:
+                    index += 1
+                entry["histogram"][index] += 1
+            elif kind == "coalesced":
+                self._method(event["method"])["coalesced"] += 1
+            elif kind == "session":
+                entry = self._sessions.setdefault(str(event["developer_id"]), {"renewals" : 0, "failures" : 0, "seconds" : 0.0})
+                entry["renewals" if event["ok"] else "failures"] += 1
+                entry["seconds"] += event["seconds"]
+            elif kind == "cache":
+                entry = self._cache.setdefault(event["endpoint"], {"hits" : 0, "misses" : 0})
+                entry["hits" if event["hit"] else "misses"] += 1
+
+    def snapshot(self):
+        """
+        Returns a copy of every counter as plain dictionaries.
+
+        Data:
+        - "requests": {method : {"requests", "retries", "coalesced", "bytes", "statuses", "failures", "ret_msgs",
+          "duration_seconds", "sign_seconds", "wait_seconds", "network_seconds", "decode_seconds", "histogram"}}
+        - "sessions": {developer_id : {"renewals", "failures", "seconds"}}
+        - "cache": {endpoint : {"hits", "misses"}}
+        """
+        with self._lock:
+            return json.loads(json.dumps({"requests" : self._requests, "sessions" : self._sessions, "cache" : self._cache}))
+
+    def prometheus(self, prefix='smite'):
+        """
+        Returns the counters in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{_prometheus_escape(value_)}"' for key, value_ in labels)
+                lines.append(f"{prefix}_{name}{suffix}{{{label_text}}} {value}")
+
+        requests_by_method = snapshot["requests"]
+        metric("requests_total", "counter", "Requests sent, every attempt counts",
+               [('', (("method", method), ("status", status)), count)
+                for method, entry in requests_by_method.items() for status, count in entry["statuses"].items()])
+        metric("request_failures_total", "counter", "Failed attempts by failure kind",
+               [('', (("method", method), ("kind", kind)), count)
+                for method, entry in requests_by_method.items() for kind, count in entry["failures"].items()])
+        metric("request_retries_total", "counter", "Attempts after the first one",
+               [('', (("method", method),), entry["retries"]) for method, entry in requests_by_method.items()])
+        metric("requests_coalesced_total", "counter", "Calls that shared an identical in-flight request",
+               [('', (("method", method),), entry["coalesced"]) for method, entry in requests_by_method.items()])
+        metric("response_bytes_total", "counter", "Response body bytes",
+               [('', (("method", method),), entry["bytes"]) for method, entry in requests_by_method.items()])
+        metric("request_stage_seconds_total", "counter", "Request time split into signing, rate limiter wait, network and json decode",
+               [('', (("method", method), ("stage", stage)), entry[stage + '_seconds'])
+                for method, entry in requests_by_method.items() for stage in REQUEST_STAGES])
+        samples = []
+        for method, entry in requests_by_method.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry["histogram"]):
+                cumulative += count
+                samples.append(('_bucket', (("method", method), ("le", "+Inf" if bound == float('inf') else repr(bound))), cumulative))
+            samples.append(('_sum', (("method", method),), entry["duration_seconds"]))
+            samples.append(('_count', (("method", method),), cumulative))
+        metric("request_duration_seconds", "histogram", "Request duration", samples)
+        metric("session_renewals_total", "counter", "createsession calls by result",
+               [('', (("developer_id", developer_id), ("result", result)), entry[field])
+                for developer_id, entry in snapshot["sessions"].items() for result, field in (("ok", "renewals"), ("failed", "failures"))])
+        metric("cache_lookups_total", "counter", "Response cache lookups by result",
+               [('', (("endpoint", endpoint), ("result", result)), entry[field])
+                for endpoint, entry in snapshot["cache"].items() for result, field in (("hit", "hits"), ("miss", "misses"))])
+        return '\n'.join(lines) + '\n'
+
+
+def _prometheus_escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class LogSink:
+    """
+    Structured log sink: every event becomes one json line on a logger.
 
-    Raises:
-    - ValueError: If invalid queue code is entered
+    Parameters:
+    - logger (logging.Logger): Defaults to the 'SmiteAPIFrame.metrics' logger
+    - level (int): Level events are logged at
+    - failures_only (bool): Only log request attempts that failed (and failed session renewals)
     """
-    try:
-        if queue not in (440, 450, 451):
-            raise ValueError("Invalid Queue")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-    
 
-    base_url = general_API_url(method="getgodleaderboard",session_id=session_id)
-    
-    url = base_url + '/' + str(god_id) + '/' + str(queue)
-    
-    response = requests.get(url)
+    def __init__(self, logger=None, level=logging.INFO, failures_only=False):
+        self.logger = logger if logger is not None else logging.getLogger('SmiteAPIFrame.metrics')
+        self.level = level
+        self.failures_only = failures_only
 
-    if response.status_code != 200:
-        print("Error: Get God Leaderboard Request failed.")
-        return
+    def emit(self, event):
+        if self.failures_only:
+            if event["event"] == "request" and not event["failure"]:
+                return
+            if event["event"] == "session" and event["ok"]:
+                return
+            if event["event"] in ("cache", "coalesced"):
+                return
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, json_dumps(event))
 
-    data = response.json()
-    
-    return data
 
-#Returns alt abilities for all gods.
-@valid_session_check
+# in-process counters, off until add_metrics_sink(metrics) is called
+metrics = MetricsCounter()
+
+
+class SingleFlight:
+    """
+    Lets concurrent identical calls share one in-flight request instead of each sending their own.
+
+    Parameters:
+    - enabled (bool): False sends every call on its own
+
+    Notes:
+    - The first caller for a key does the work, callers arriving while it runs wait and get the same result (or error)
+    - Nothing is kept once the request finishes, that's what response_cache is for
+    - Waiters get the same object as the first caller, treat results as read-only
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # key -> [done event, result, error]
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Returns func(), or the result of the identical call that's already running.
+        """
+        if not self.enabled:
+            return func()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = [threading.Event(), None, None]
+                self._calls[key] = call
+
+        if not leader:
+            if _metrics_sinks:
+                _emit({"event" : "coalesced", "method" : key[0]})
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            return call[1]
+
+        try:
+            call[1] = func()
+        except BaseException as e:
+            call[2] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call[0].set()
+        return call[1]
+
+
+# identical requests running at the same time are only sent once
+single_flight = SingleFlight()
+
+
+def _api_request(method, session_id, *params):
+    """
+    Sends an endpoint request with retries and returns the decoded json.
+
+    Parameters:
+    - method (str): Api endpoint, ex. 'getmatchdetails'
+    - session_id (str): Session to start with, replaced if HiRez says it's invalid
+    - params: Url parameters appended after the timestamp, ex. match_id
+
+    Raises:
+    - SmiteRequestError: If the request fails with a non-retryable error or retry_policy runs out of attempts
+    - QuotaExceededError: If the daily limit is hit (on every key of the credential_pool, if one is set)
+
+    Notes:
+    - Concurrent calls with the same method and params share one request through single_flight
+    """
+    key = (method,) + tuple(str(param) for param in params)
+    return single_flight.do(key, lambda: _send_request(method, session_id, *params))
+
+
+def _request_credential(session_id):
+    # the key for a request: the one valid_session_check picked for this call, or the next one of the pool
+    credential = _active_credential.get()
+    if credential is None:
+        credential = _pick_credential()
+        if credential_pool is not None:
+            # a session passed in without valid_session_check can't be matched to a key, use the picked key's own
+            session_id = None
+    return credential, session_id
+
+
+class _RequestAttempts:
+    """
+    Retry state of one request, shared by _send_request, _stream_request and AsyncSmiteClient._send: which key and
+    session the next attempt uses, classifying each answer, key failover, session invalidation, metrics and the
+    error raised once retry_policy runs out. The transports only wait, send and decode.
+
+    Usage:
+    - for attempt in attempts: sleep attempts.delay(), get a session if attempts.session_id is None
+      (attempts.switch_key(error, exhausted=False) if the key is out of sessions),
+      url = attempts.start(params), send, then attempts.done(status, data, size) (True = return data)
+      or one of attempts.switch_key()/connection_failed()/bad_body() and continue; attempts.give_up() after the loop
+
+    Notes:
+    - timings holds perf_counter() marks [start, signed, waited, received, decoded], see _request_event
+    """
+
+    def __init__(self, method, credential, session_id=None, streamed=False):
+        self.method = method
+        self.credential = credential
+        self.session_id = session_id
+        self.streamed = streamed
+        self.attempt = 0
+        self.error = None
+        self.timings = None
+
+    def __iter__(self):
+        for self.attempt in range(retry_policy.max_attempts):
+            yield self.attempt
+
+    def delay(self):
+        return retry_policy.delay(self.attempt) if self.attempt else 0
+
+    def no_session(self):
+        self.error = SmiteRequestError("Could not create a session.", method=self.method, attempts=self.attempt + 1)
+
+    def start(self, params, base_url=None):
+        # signs the url of this attempt
+        self.timings = [time.perf_counter(), None, None, None, None]
+        url = self.credential.url(self.method, self.session_id, base_url)
+        for param in params:
+            url += '/' + str(param)
+        self.timings[1] = time.perf_counter()
+        if http_log.isEnabledFor(logging.DEBUG):
+            http_log.debug("%s %s (attempt %d%s)", self.method, '/'.join(map(str, params)), self.attempt + 1, ", streamed" if self.streamed else "")
+        return url
+
+    def mark(self, stage):
+        # stage: 2 = rate limiter passed, 3 = response received, 4 = body decoded
+        self.timings[stage] = time.perf_counter()
+
+    def _emit(self, status=None, data=None, failure=None, size=None):
+        _emit(_request_event(self.method, self.credential, self.attempt, self.timings, status=status, data=data,
+                             failure=failure, size=size, streamed=self.streamed))
+
+    def switch_key(self, error, exhausted=True):
+        # this key is done for the day (or can't open a session, exhausted=False), the pool moves the request to another one
+        self.credential = _next_credential(self.credential, exhausted)
+        if self.credential is None:
+            raise error
+        self.session_id = None
+
+    def connection_failed(self, error):
+        self.credential.record(ok=False)
+        if _metrics_sinks:
+            # the time until the connection failed counts as network
+            self.mark(3)
+            self._emit(failure=FAILURE_SERVER)
+        reason = str(error) or repr(error)
+        self.error = SmiteRequestError(f"{self.method} request failed: {reason}", method=self.method, attempts=self.attempt + 1)
+        http_log.info("%s attempt %d failed: %s", self.method, self.attempt + 1, reason)
+
+    def bad_body(self, message, status=200, size=None):
+        self.credential.record(ok=False)
+        if _metrics_sinks:
+            self.mark(4)
+            self._emit(status=status, failure=FAILURE_SERVER, size=size)
+        self.error = SmiteRequestError(f"{self.method} returned {message}", method=self.method, status_code=status, attempts=self.attempt + 1)
+
+    def done(self, status, data, size=None):
+        """
+        Classifies an answer, returns True if data is the result, False if the next attempt should go.
+        """
+        kind = _failure_kind(status, data)
+        self.credential.record(ok=kind is None)
+        if _metrics_sinks:
+            self._emit(status=status, data=data, failure=kind, size=size)
+        if kind is None:
+            return True
+        try:
+            self.error = _failed_request(self.method, kind, status, data, self.attempt + 1)
+        except QuotaExceededError as e:
+            self.switch_key(e)
+            return False
+        if kind == FAILURE_SESSION:
+            # the 14min timer was wrong, throw the session away and make a new one on the next attempt
+            # (only if no other thread renewed it already, or every thread holding the dead one wipes the new one)
+            self.credential.session_manager.invalidate(self.session_id)
+            self.session_id = None
+        return False
+
+    def give_up(self):
+        raise self.error
+
+
+def _send_request(method, session_id, *params):
+    # the actual request + retries behind _api_request
+    attempts = _RequestAttempts(method, *_request_credential(session_id))
+    for attempt in attempts:
+        if attempt:
+            time.sleep(attempts.delay())
+        if attempts.session_id is None:
+            try:
+                attempts.session_id = attempts.credential.session_manager.get_session_id()
+            except QuotaExceededError as e:
+                attempts.switch_key(e, exhausted=False)
+                continue
+            if attempts.session_id is None:
+                attempts.no_session()
+                continue
+
+        url = attempts.start(params)
+        try:
+            # rate limiter + http_client, same as _api_get() but timed separately
+            attempts.credential.rate_limiter.acquire()
+            attempts.mark(2)
+            response = http_client.get(url)
+            attempts.mark(3)
+        except QuotaExceededError as e:
+            attempts.switch_key(e)
+            continue
+        except requests.RequestException as e:
+            attempts.connection_failed(e)
+            continue
+
+        data = None
+        if response.status_code == 200:
+            try:
+                data = json_loads(response.content)
+            except ValueError:
+                attempts.bad_body("a body that isn't json.", size=len(response.content))
+                continue
+        attempts.mark(4)
+
+        if attempts.done(response.status_code, data, len(response.content)):
+            return data
+
+    attempts.give_up()
+
+
+class SessionManager:
+    """
+    Keeps the current session ID and its creation time in memory so endpoints don't touch the disk on every call.
+    The session is still written to 'CurrentSessionID.txt' and 'timestamp.txt' so it survives restarts.
+
+    Parameters:
+    - session_file (str): File the session ID is persisted to
+    - timestamp_file (str): File the session creation time is persisted to, stored as int(time.time())
+    - session_length (int): Seconds a session is trusted for. Limit is 15min but 14min bc sessions die mid get request
+
+    Notes:
+    - Safe to share across threads, only one thread creates a new session at a time
+    - The files are only read once (first use), after that memory is the source of truth
+    """
+
+    def __init__(self, session_file='CurrentSessionID.txt', timestamp_file='timestamp.txt', session_length=14 * 60):
+        self.session_file = session_file
+        self.timestamp_file = timestamp_file
+        self.session_length = session_length
+        # (session_id, created_at) kept as one tuple so readers never see a half updated session
+        self._current = (None, 0)
+        self._restored = False
+        self._lock = threading.RLock()
+        # set by Credential, sessions are created with that key (None means PersonalKeys)
+        self.credential = None
+
+    def _restore(self):
+        self._restored = True
+        try:
+            with open(self.timestamp_file, 'r') as f:
+                created_at = int(f.read())
+            with open(self.session_file, 'r') as f:
+                session_id = str(f.read())
+        except (OSError, ValueError):
+            return
+        self._current = (session_id, created_at)
+
+    def _persist(self):
+        session_id, created_at = self._current
+        with open(self.timestamp_file, 'w') as f:
+            f.write(str(created_at))
+        with open(self.session_file, 'w') as f:
+            f.write(str(session_id))
+
+    @property
+    def session_id(self):
+        return self._current[0]
+
+    def _valid_session(self):
+        if not self._restored:
+            with self._lock:
+                if not self._restored:
+                    self._restore()
+        session_id, created_at = self._current
+        if session_id is None or (int(time.time()) - created_at) >= self.session_length:
+            return None
+        return session_id
+
+    def is_valid(self):
+        """
+        Returns True if a session exists and less than session_length seconds have passed since it was created.
+        """
+        return self._valid_session() is not None
+
+    def store(self, session_id, created_at=None):
+        """
+        Saves a freshly created session in memory and on disk.
+        """
+        if created_at is None:
+            created_at = int(time.time())
+        with self._lock:
+            self._current = (str(session_id), int(created_at))
+            self._restored = True
+            self._persist()
+
+    def invalidate(self, session_id=None):
+        """
+        Forgets the current session, the next get_session_id() call will create a new one.
+
+        Parameters:
+        - session_id (str): The session that turned out to be dead. If another thread already replaced it
+                            the current session is kept, None always forgets the current session
+        """
+        with self._lock:
+            if session_id is not None and self._current[0] != str(session_id):
+                return
+            self._current = (None, 0)
+            self._restored = True
+
+    def renew(self):
+        """
+        Creates a new session through the createsession endpoint and stores it.
+
+        Returns:
+        - The new session ID
+        - Returns nothing if the session could not be created
+        """
+        with self._lock:
+            started = time.perf_counter()
+            session_id = _create_session(self.credential)
+            if _metrics_sinks:
+                _emit({"event" : "session", "developer_id" : (self.credential or default_credential).usage_id,
+                       "ok" : session_id is not None, "seconds" : time.perf_counter() - started})
+            if session_id is None:
+                return
+            self.store(session_id)
+            if session_log.isEnabledFor(logging.INFO):
+                session_log.info("New session created for developer id %s.", (self.credential or default_credential).usage_id)
+            return session_id
+
+    def get_session_id(self):
+        """
+        Returns a valid session ID, creating a new session only if the current one has expired.
+        """
+        session_id = self._valid_session()
+        if session_id is not None:
+            return session_id
+        with self._lock:
+            # another thread might have renewed it while we waited for the lock
+            session_id = self._valid_session()
+            if session_id is not None:
+                return session_id
+            return self.renew()
+
+
+# process-wide session shared by every endpoint
+session_manager = SessionManager()
+
+
+class Credential:
+    """
+    One HiRez developer account: its keys, session, rate limit budget and usage counters.
+
+    Parameters:
+    - developer_id (int): devID provided by HiRez, None for PersonalKeys.devId
+    - authorization_key (str): authKey provided by HiRez, None for PersonalKeys.authKey
+    - session_manager (SessionManager): Session of this key. None gives a developer_id its own session files
+                                        ('CurrentSessionID_{devId}.txt', 'timestamp_{devId}.txt'), without a
+                                        developer_id (PersonalKeys) the module's session_manager is used
+    - rate_limiter (RateLimiter): Budget of this key. None gives a developer_id its own RateLimiter,
+                                  without a developer_id the module's rate_limiter is used
+
+    Attributes:
+    - requests (int): Requests sent with this key since startup
+    - failures (int): Requests that came back as errors (or no response at all)
+
+    Notes:
+    - Sessions are tied to the devId that created them, that's why every key needs its own SessionManager
+
+    Raises:
+    - SmiteAPIError: On signing a url when neither the credential nor PersonalKeys/the environment has a devId and authKey
+    """
+
+    def __init__(self, developer_id=None, authorization_key=None, session_manager=None, rate_limiter=None):
+        self.developer_id = developer_id
+        self.authorization_key = authorization_key
+        if developer_id is not None:
+            # another account, sharing PersonalKeys' session would sign with one devId and a session of another
+            if session_manager is None:
+                session_manager = SessionManager(f'CurrentSessionID_{developer_id}.txt', f'timestamp_{developer_id}.txt')
+            if rate_limiter is None:
+                rate_limiter = RateLimiter()
+        self._session_manager = session_manager
+        self._rate_limiter = rate_limiter
+        if session_manager is not None:
+            session_manager.credential = self
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    # properties so the default credential follows set_http_client-style swaps of the module globals
+    @property
+    def session_manager(self):
+        return self._session_manager if self._session_manager is not None else session_manager
+
+    @property
+    def rate_limiter(self):
+        return self._rate_limiter if self._rate_limiter is not None else rate_limiter
+
+    @property
+    def signer(self):
+        signer = get_signer(self.developer_id, self.authorization_key)
+        if signer is None:
+            raise SmiteAPIError("No HiRez devId/authKey: add SmiteAPIFrameFolder/PersonalKeys.py, set SMITE_DEV_ID and SMITE_AUTH_KEY, "
+                                "or use a Credential/CredentialPool with both set.")
+        return signer
+
+    @property
+    def usage_id(self):
+        # devId this credential signs with, for usage/metrics
+        return str(self.developer_id if self.developer_id is not None else devId)
+
+    def url(self, method, session_id=None, base_url=None):
+        """
+        Returns the url for method signed with this key.
+        """
+        return self.signer.url(method, session_id, base_url)
+
+    def record(self, ok=True):
+        with self._lock:
+            self.requests += 1
+            if not ok:
+                self.failures += 1
+
+    def available(self):
+        """
+        Returns True if this key still has requests left today and a live session or the session budget to open one.
+        """
+        remaining = self.rate_limiter.remaining()
+        if remaining["requests_remaining"] <= 0:
+            return False
+        if self.session_manager.is_valid():
+            return True
+        return remaining["sessions_remaining"] > 0 and remaining["concurrent_sessions_remaining"] > 0
+
+    def usage(self):
+        """
+        Returns this key's counters and what's left of its budget as a dictionary.
+        """
+        usage = {"developer_id" : self.usage_id,
+                 "requests" : self.requests, "failures" : self.failures}
+        usage.update(self.rate_limiter.remaining())
+        return usage
+
+
+class CredentialPool:
+    """
+    Spreads requests over several developer accounts so throughput isn't capped by one key's daily budget.
+
+    Parameters:
+    - credentials (list): Credential objects or (developer_id, authorization_key) tuples
+    - strategy (str): 'least_used' (most requests left today) or 'round_robin'
+
+    Usage:
+    - set_credential_pool(CredentialPool([(1234, 'KEY1'), (5678, 'KEY2')]))
+    - every endpoint function then picks a key per call, nothing else changes
+
+    Notes:
+    - Keys given as tuples get their own session files ('CurrentSessionID_{devId}.txt', 'timestamp_{devId}.txt') and RateLimiter
+    - A key that runs out of requests is skipped until the UTC day rolls over, one that can't open a session
+      (daily or concurrent session limit) until it can again
+    - Raises QuotaExceededError when every key is out
+    """
+
+    STRATEGIES = ('least_used', 'round_robin')
+
+    def __init__(self, credentials=(), strategy='least_used'):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {self.STRATEGIES}")
+        self.strategy = strategy
+        self.credentials = []
+        self._next = 0
+        self._lock = threading.Lock()
+        for credential in credentials:
+            if isinstance(credential, Credential):
+                self.credentials.append(credential)
+            else:
+                self.add(*credential)
+
+    def add(self, developer_id, authorization_key, rate_limiter=None):
+        """
+        Adds a key with its own session and budget, returns its Credential.
+        """
+        credential = Credential(developer_id, authorization_key, rate_limiter=rate_limiter)
+        with self._lock:
+            self.credentials.append(credential)
+        return credential
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def pick(self):
+        """
+        Returns the Credential the next request should use.
+        """
+        with self._lock:
+            credentials = list(self.credentials)
+            start = self._next
+            self._next += 1
+        if self.strategy == 'round_robin':
+            for offset in range(len(credentials)):
+                credential = credentials[(start + offset) % len(credentials)]
+                if credential.available():
+                    return credential
+        else:
+            remaining = [(credential.rate_limiter.remaining()["requests_remaining"], credential)
+                         for credential in credentials if credential.available()]
+            if remaining:
+                return max(remaining, key=lambda entry: entry[0])[1]
+        raise QuotaExceededError("Every key in the credential pool is out of requests or sessions.")
+
+    def usage(self):
+        """
+        Returns Credential.usage() of every key.
+        """
+        return [credential.usage() for credential in self.credentials]
+
+
+# PersonalKeys with the module's session_manager/rate_limiter, used while no pool is set
+default_credential = Credential()
+# set with set_credential_pool() to spread requests over several keys
+credential_pool = None
+# key picked for the current endpoint call, so nested calls and _api_request sign with the same key
+_active_credential = contextvars.ContextVar('smite_credential', default=None)
+
+
+def set_credential_pool(pool):
+    """
+    Makes every endpoint schedule its requests over pool's keys, None goes back to PersonalKeys only.
+
+    Returns:
+    - The previous pool
+    """
+    global credential_pool
+    previous, credential_pool = credential_pool, pool
+    return previous
+
+
+def _pick_credential():
+    if credential_pool is None or not len(credential_pool):
+        return default_credential
+    return credential_pool.pick()
+
+
+def _next_credential(credential, exhausted=True):
+    # credential is out of requests (or out of sessions when exhausted is False, its request budget is left alone),
+    # returns another key of the pool or None if there's nothing to switch to
+    if exhausted:
+        credential.rate_limiter.exhaust()
+    if credential_pool is None or credential not in credential_pool.credentials:
+        return None
+    if exhausted:
+        http_log.warning("Developer id %s is out of requests for today, switching keys.", credential.usage_id)
+    else:
+        http_log.warning("Developer id %s can't open a session, switching keys.", credential.usage_id)
+    return credential_pool.pick()
+
+
+def valid_session_check(func):
+    
+    @wraps(func)
+    def wrapper(session_id=None,*args, **kwargs):
+        # picks the key for this call (PersonalKeys unless a credential_pool is set) and grabs its in-memory session,
+        # a new session ID is only generated when the current one has expired
+        credential = _active_credential.get() or _pick_credential()
+        token = _active_credential.set(credential)
+        try:
+            try:
+                session_id = credential.session_manager.get_session_id()
+            except QuotaExceededError:
+                # this key is out of sessions, the request's retry loop moves it to another key of the pool (or raises)
+                session_id = None
+
+            data = func(session_id=session_id,*args, **kwargs)
+        finally:
+            _active_credential.reset(token)
+        return data
+    
+    return wrapper
+
+
+# ttl policies for cached_endpoint, anything else is a number of seconds
+CACHE_FOREVER = 'forever'   # completed matches never change
+CACHE_PATCH = 'patch'       # static data, good until the next patch
+# max age of patch-scoped entries, so a process that never calls get_patch_info() still picks up a new patch
+PATCH_FALLBACK_TTL = 24 * 60 * 60
+
+
+class ResponseCache:
+    """
+    On-disk (SQLite) cache of api responses, keyed by endpoint + arguments.
+
+    Parameters:
+    - path (str): SQLite file the responses are stored in
+    - enabled (bool): Set to False to always hit the api
+
+    Notes:
+    - CACHE_PATCH entries are tagged with the patch version they were fetched on and stop being used once
+      get_patch_info() reports a different version, or once they are PATCH_FALLBACK_TTL old, whichever comes first
+    - Only successful responses (non-empty, no ret_msg error) are stored
+    - The database is opened on first use and shared between threads
+    """
+
+    def __init__(self, path='SmiteResponseCache.sqlite3', enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.patch_version = None
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body TEXT NOT NULL, stored_at REAL NOT NULL, expires_at REAL, patch TEXT)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            row = self._db.execute("SELECT value FROM meta WHERE name = 'patch_version'").fetchone()
+            if row is not None:
+                self.patch_version = row[0]
+            self._db.commit()
+        return self._db
+
+    def get(self, key, policy):
+        """
+        Returns the cached response for key, or None on a miss/expired entry.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._connect().execute("SELECT body, stored_at, expires_at, patch FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        body, stored_at, expires_at, patch = row
+        if policy == CACHE_PATCH:
+            if self.patch_version is not None and patch != self.patch_version:
+                return None
+            # the stored patch_version is only as fresh as the last get_patch_info() call
+            if time.time() - stored_at >= PATCH_FALLBACK_TTL:
+                return None
+        elif expires_at is not None and time.time() >= expires_at:
+            return None
+        return json_loads(body)
+
+    def set(self, key, data, policy):
+        """
+        Stores data under key, unless it looks like an error response.
+        """
+        if not self.enabled or not _is_cacheable(data):
+            return
+        now = time.time()
+        expires_at = None
+        if policy not in (CACHE_FOREVER, CACHE_PATCH):
+            expires_at = now + policy
+        with self._lock:
+            db = self._connect()
+            db.execute("INSERT OR REPLACE INTO responses (key, body, stored_at, expires_at, patch) VALUES (?, ?, ?, ?, ?)",
+                       (key, json_dumps(data), now, expires_at, self.patch_version))
+            db.commit()
+
+    def set_patch_version(self, version):
+        """
+        Records the live patch version, patch-scoped entries from other versions stop being used.
+        """
+        if not version:
+            return
+        with self._lock:
+            self.patch_version = str(version)
+            db = self._connect()
+            db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('patch_version', ?)", (self.patch_version,))
+            db.commit()
+
+    def clear(self):
+        with self._lock:
+            db = self._connect()
+            db.execute("DELETE FROM responses")
+            db.commit()
+
+
+def _is_cacheable(data):
+    if not isinstance(data, (list, dict)) or not data:
+        return False
+    # HiRez reports errors (invalid session, not found, limits) in ret_msg with a 200 status
+    return not _ret_msg(data)
+
+
+# shared by every cached endpoint
+response_cache = ResponseCache()
+
+
+def _cache_key(name, arguments):
+    # always stdlib so keys stay the same whichever json backend is selected
+    return name + ':' + json.dumps(arguments, sort_keys=True, default=str)
+
+
+def _cache_get(endpoint, key, policy):
+    # response_cache.get() plus the cache hit/miss metric
+    data = response_cache.get(key, policy)
+    if _metrics_sinks and response_cache.enabled:
+        _emit({"event" : "cache", "endpoint" : endpoint, "hit" : data is not None})
+    return data
+
+
+def cached_endpoint(policy):
+    """
+    Caches an endpoint's responses in response_cache. Goes above @valid_session_check so
+    cache hits never validate the session or sign a url.
+
+    Parameters:
+    - policy: CACHE_FOREVER, CACHE_PATCH or a number of seconds
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop('session_id', None)
+            # every argument gets str()'d into the url anyway, so 1 and '1' are the same request
+            arguments = {name: (str(value) if isinstance(value, int) else value) for name, value in arguments.items()}
+            key = _cache_key(func.__name__, arguments)
+
+            data = _cache_get(func.__name__, key, policy)
+            if data is not None:
+                return data
+            data = func(*args, **kwargs)
+            response_cache.set(key, data, policy)
+            return data
+
+        return wrapper
+    return decorator
+
+
+class RequestSigner:
+    """
+    Builds signed api urls for one devId/authKey pair.
+
+    Parameters:
+    - developer_id (int): devID provided by HiRez
+    - authorization_key (str): authKey provided by HiRez
+
+    Notes:
+    - The signature only depends on (method, second), so it's computed once per method per second and reused
+    - The timestamp string is formatted once per second, not per request
+    - Url prefixes ([API_URL]/{method}json/{developerId}/) are built once per base url + method
+    - Safe to share across threads; racing threads just compute the same values
+    """
+
+    def __init__(self, developer_id, authorization_key):
+        self.developer_id = str(developer_id)
+        self.authorization_key = str(authorization_key)
+        # (second, timestamp string, {method : signature}) swapped in one piece when the second changes
+        self._current = (None, None, {})
+        self._prefixes = {}
+
+    def sign(self, method):
+        """
+        Returns (signature, timestamp) for method at the current second.
+        """
+        second = int(time.time())
+        current = self._current
+        if current[0] != second:
+            current = (second, time.strftime('%Y%m%d%H%M%S', time.gmtime(second)), {})
+            self._current = current
+        timestamp, signatures = current[1], current[2]
+        signature = signatures.get(method)
+        if signature is None:
+            signature = hashlib.md5(f"{self.developer_id}{method}{self.authorization_key}{timestamp}".encode('utf-8')).hexdigest()
+            signatures[method] = signature
+        return signature, timestamp
+
+    def url(self, method, session_id=None, base_url=None):
+        """
+        Returns the signed url for method, without the session part when session_id is None (createsession).
+        """
+        if base_url is None:
+            base_url = http_client.base_url
+        prefix = self._prefixes.get((base_url, method))
+        if prefix is None:
+            prefix = f'{base_url}{method}json/{self.developer_id}/'
+            self._prefixes[(base_url, method)] = prefix
+        signature, timestamp = self.sign(method)
+        if session_id is None:
+            return prefix + signature + '/' + timestamp
+        return prefix + signature + '/' + str(session_id) + '/' + timestamp
+
+
+_signers = {}
+_signers_lock = threading.Lock()
+
+
+def get_signer(developer_id=None, authorization_key=None):
+    """
+    Returns the shared RequestSigner for a devId/authKey pair, one per pair so their caches are reused.
+
+    Parameters:
+    - developer_id (int): devID provided by HiRez, defaults to PersonalKeys.devId
+    - authorization_key (str): authKey provided by HiRez, defaults to PersonalKeys.authKey
+
+    Returns:
+    - The RequestSigner, or None if either credential is missing
+    """
+    if developer_id is None:
+        developer_id = devId
+    if authorization_key is None:
+        authorization_key = authKey
+    if developer_id is None or authorization_key is None:
+        return None
+    key = (str(developer_id), str(authorization_key))
+    signer = _signers.get(key)
+    if signer is None:
+        with _signers_lock:
+            signer = _signers.setdefault(key, RequestSigner(developer_id, authorization_key))
+    return signer
+
+
+def general_API_url(method = None, session_id = None, developer_id= None, authorization_key = None, base_url = None):
+    """
+    General Smite API url for endpoints in json.
+                
+        
+
+    Parameters:
+    - method (str): Specifies the api endpoint. Should be provided by other functions 
+                  ex. 'endpoint'
+    - session_id (str): Personal session_id needed to make api calls. Should be provided by other functions
+                created by generate_session_id() function
+    - developer_id (int): devID provided by HiRez, defaults to PersonalKeys.devId
+    - authorization_key (str): authKey provided by HiRez, defaults to PersonalKeys.authKey
+    - base_url (str): Api url to build on, defaults to the shared http_client's base_url
+
+
+    Returns:
+    - [API_URL]/{method}[ResponseFormat]/{developerId}/{signature}/{session}/{timestamp} as a string
+                Returns None if any parameter is missing
+
+
+    Notes:
+    - Signing is cached per credential by get_signer(), see RequestSigner
+    - The session must belong to the same devId it's signed with
+
+
+    Raises:
+    - Nothing, there's no error catching yet
+    """
+    if method is None or session_id is None:
+        return None
+    signer = get_signer(developer_id, authorization_key)
+    if signer is None:
+        return None
+    return signer.url(method, session_id, base_url)
+
+def _chunked(iterable, size):
+    # splits any iterable into lists of at most size items, without reading it all in first
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_NOTHING = object()
+
+
+def _fan_out(func, items, max_workers=4, ordered=True):
+    """
+    Calls func(item) for every item on a thread pool and yields (item, result) pairs.
+
+    Parameters:
+    - func (callable): Called as func(item), wrap decorated endpoints in a lambda to pass keyword arguments
+    - items (iterable): Consumed lazily, at most 2 * max_workers items are in flight at once
+    - max_workers (int): Number of threads
+    - ordered (bool): True yields in input order, False yields as soon as each call finishes
+
+    Notes:
+    - An exception raised by func is re-raised when its result is yielded
+    """
+    max_workers = max(1, max_workers)
+    window = 2 * max_workers
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= window:
+                break
+        while pending:
+            if ordered:
+                item, future = pending.popleft()
+                result = future.result()
+            else:
+                wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                index = next(i for i, (_, future) in enumerate(pending) if future.done())
+                item, future = pending[index]
+                del pending[index]
+                result = future.result()
+            # top the window back up before handing the result over
+            next_item = next(items, _NOTHING)
+            if next_item is not _NOTHING:
+                pending.append((next_item, executor.submit(func, next_item)))
+            yield item, result
+
+##############################################################################
+################################ Records #####################################
+##############################################################################
+
+# Optional typed versions of the bulkiest payloads. A dict per row costs a hash table with 100+ keys,
+# these are __slots__ dataclasses that only keep the fields below (ask for them with as_records=True).
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        # some numbers come back as strings, some fields are null/"" when they don't apply
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _as_str(value):
+    return '' if value is None else str(value)
+
+
+_CONVERTERS = {int : _as_int, float : _as_float, str : _as_str}
+
+
+def _record_class(name, fields, doc):
+    """
+    Builds a slots dataclass from a (attribute, api key, type) table, with from_dict()/from_rows()/to_dict().
+    """
+    api_fields = tuple((attribute, key, _CONVERTERS[kind]) for attribute, key, kind in fields)
+
+    def from_dict(cls, row):
+        return cls(*[convert(row.get(key)) for attribute, key, convert in api_fields])
+
+    def from_rows(cls, rows):
+        if isinstance(rows, dict):
+            rows = [rows]
+        return [cls.from_dict(row) for row in rows if isinstance(row, dict)]
+
+    def to_dict(self):
+        return {key : getattr(self, attribute) for attribute, key, convert in api_fields}
+
+    namespace = {
+        '__doc__' : doc,
+        'FIELDS' : tuple(fields),
+        'from_dict' : classmethod(from_dict),
+        'from_rows' : classmethod(from_rows),
+        'to_dict' : to_dict,
+    }
+    return make_dataclass(name, [(attribute, kind) for attribute, key, kind in fields], namespace=namespace, slots=True)
+
+
+MATCH_PLAYER_FIELDS = (
+    ('match', 'Match', int),
+    ('match_queue_id', 'match_queue_id', int),
+    ('entry_datetime', 'Entry_Datetime', str),
+    ('match_duration', 'Match_Duration', int),
+    ('minutes', 'Minutes', int),
+    ('time_in_match_seconds', 'Time_In_Match_Seconds', int),
+    ('map_game', 'Map_Game', str),
+    ('region', 'Region', str),
+    ('has_replay', 'hasReplay', str),
+    ('player_id', 'playerId', int),
+    ('player_name', 'playerName', str),
+    ('hz_player_name', 'hz_player_name', str),
+    ('hz_gamer_tag', 'hz_gamer_tag', str),
+    ('player_portal_id', 'playerPortalId', int),
+    ('player_portal_user_id', 'playerPortalUserId', str),
+    ('account_level', 'Account_Level', int),
+    ('mastery_level', 'Mastery_Level', int),
+    ('party_id', 'PartyId', int),
+    ('team_id', 'TeamId', int),
+    ('team_name', 'Team_Name', str),
+    ('task_force', 'TaskForce', int),
+    ('winning_task_force', 'Winning_TaskForce', int),
+    ('win_status', 'Win_Status', str),
+    ('surrendered', 'Surrendered', str),
+    ('team1_score', 'Team1Score', int),
+    ('team2_score', 'Team2Score', int),
+    ('first_ban_side', 'First_Ban_Side', str),
+    ('god_id', 'GodId', int),
+    ('god_name', 'Reference_Name', str),
+    ('skin', 'Skin', str),
+    ('skin_id', 'SkinId', int),
+    ('role', 'Role', str),
+    ('final_match_level', 'Final_Match_Level', int),
+    ('kills_player', 'Kills_Player', int),
+    ('deaths', 'Deaths', int),
+    ('assists', 'Assists', int),
+    ('kills_bot', 'Kills_Bot', int),
+    ('kills_single', 'Kills_Single', int),
+    ('kills_double', 'Kills_Double', int),
+    ('kills_triple', 'Kills_Triple', int),
+    ('kills_quadra', 'Kills_Quadra', int),
+    ('kills_penta', 'Kills_Penta', int),
+    ('kills_first_blood', 'Kills_First_Blood', int),
+    ('kills_fire_giant', 'Kills_Fire_Giant', int),
+    ('kills_gold_fury', 'Kills_Gold_Fury', int),
+    ('kills_phoenix', 'Kills_Phoenix', int),
+    ('kills_siege_juggernaut', 'Kills_Siege_Juggernaut', int),
+    ('kills_wild_juggernaut', 'Kills_Wild_Juggernaut', int),
+    ('killing_spree', 'Killing_Spree', int),
+    ('multi_kill_max', 'Multi_kill_Max', int),
+    ('objective_assists', 'Objective_Assists', int),
+    ('camps_cleared', 'Camps_Cleared', int),
+    ('towers_destroyed', 'Towers_Destroyed', int),
+    ('structure_damage', 'Structure_Damage', int),
+    ('wards_placed', 'Wards_Placed', int),
+    ('distance_traveled', 'Distance_Traveled', int),
+    ('gold_earned', 'Gold_Earned', int),
+    ('gold_per_minute', 'Gold_Per_Minute', int),
+    ('damage_player', 'Damage_Player', int),
+    ('damage_bot', 'Damage_Bot', int),
+    ('damage_done_in_hand', 'Damage_Done_In_Hand', int),
+    ('damage_done_magical', 'Damage_Done_Magical', int),
+    ('damage_done_physical', 'Damage_Done_Physical', int),
+    ('damage_mitigated', 'Damage_Mitigated', int),
+    ('damage_taken', 'Damage_Taken', int),
+    ('damage_taken_magical', 'Damage_Taken_Magical', int),
+    ('damage_taken_physical', 'Damage_Taken_Physical', int),
+    ('healing', 'Healing', int),
+    ('healing_bot', 'Healing_Bot', int),
+    ('healing_player_self', 'Healing_Player_Self', int),
+    ('item_id1', 'ItemId1', int),
+    ('item_id2', 'ItemId2', int),
+    ('item_id3', 'ItemId3', int),
+    ('item_id4', 'ItemId4', int),
+    ('item_id5', 'ItemId5', int),
+    ('item_id6', 'ItemId6', int),
+    ('item_purch_1', 'Item_Purch_1', str),
+    ('item_purch_2', 'Item_Purch_2', str),
+    ('item_purch_3', 'Item_Purch_3', str),
+    ('item_purch_4', 'Item_Purch_4', str),
+    ('item_purch_5', 'Item_Purch_5', str),
+    ('item_purch_6', 'Item_Purch_6', str),
+    ('active_id1', 'ActiveId1', int),
+    ('active_id2', 'ActiveId2', int),
+    ('active_id3', 'ActiveId3', int),
+    ('active_id4', 'ActiveId4', int),
+    ('item_active_1', 'Item_Active_1', str),
+    ('item_active_2', 'Item_Active_2', str),
+    ('item_active_3', 'Item_Active_3', str),
+    ('item_active_4', 'Item_Active_4', str),
+    ('ban1_id', 'Ban1Id', int),
+    ('ban2_id', 'Ban2Id', int),
+    ('ban3_id', 'Ban3Id', int),
+    ('ban4_id', 'Ban4Id', int),
+    ('ban5_id', 'Ban5Id', int),
+    ('ban6_id', 'Ban6Id', int),
+    ('ban7_id', 'Ban7Id', int),
+    ('ban8_id', 'Ban8Id', int),
+    ('ban9_id', 'Ban9Id', int),
+    ('ban10_id', 'Ban10Id', int),
+    ('ban11_id', 'Ban11Id', int),
+    ('ban12_id', 'Ban12Id', int),
+    ('conquest_tier', 'Conquest_Tier', int),
+    ('rank_stat_conquest', 'Rank_Stat_Conquest', float),
+    ('joust_tier', 'Joust_Tier', int),
+    ('rank_stat_joust', 'Rank_Stat_Joust', float),
+    ('duel_tier', 'Duel_Tier', int),
+    ('rank_stat_duel', 'Rank_Stat_Duel', float),
+)
+
+MatchPlayer = _record_class('MatchPlayer', MATCH_PLAYER_FIELDS, """
+    One player row of getmatchdetails/getmatchdetailsbatch.
+
+    Notes:
+    - Missing/null numbers become 0 and missing strings become ''
+    - to_dict() gives the api keys back, but only for the fields kept here
+    """)
+
+PLAYER_PROFILE_FIELDS = (
+    ('player_id', 'Id', int),
+    ('active_player_id', 'ActivePlayerId', int),
+    ('name', 'Name', str),
+    ('hz_player_name', 'hz_player_name', str),
+    ('hz_gamer_tag', 'hz_gamer_tag', str),
+    ('platform', 'Platform', str),
+    ('region', 'Region', str),
+    ('team_id', 'TeamId', int),
+    ('team_name', 'Team_Name', str),
+    ('level', 'Level', int),
+    ('mastery_level', 'MasteryLevel', int),
+    ('total_worshippers', 'Total_Worshippers', int),
+    ('total_achievements', 'Total_Achievements', int),
+    ('wins', 'Wins', int),
+    ('losses', 'Losses', int),
+    ('leaves', 'Leaves', int),
+    ('hours_played', 'HoursPlayed', int),
+    ('minutes_played', 'MinutesPlayed', int),
+    ('created_datetime', 'Created_Datetime', str),
+    ('last_login_datetime', 'Last_Login_Datetime', str),
+    ('tier_conquest', 'Tier_Conquest', int),
+    ('tier_joust', 'Tier_Joust', int),
+    ('tier_duel', 'Tier_Duel', int),
+    ('rank_stat_conquest', 'Rank_Stat_Conquest', float),
+    ('rank_stat_joust', 'Rank_Stat_Joust', float),
+    ('rank_stat_duel', 'Rank_Stat_Duel', float),
+    ('personal_status_message', 'Personal_Status_Message', str),
+)
+
+PlayerProfile = _record_class('PlayerProfile', PLAYER_PROFILE_FIELDS, """
+    One getplayer result (the nested Ranked* dictionaries are flattened to tier/rank stat).
+    """)
+
+QUEUE_STAT_FIELDS = (
+    ('player_id', 'player_id', int),
+    ('queue', 'Queue', str),
+    ('god_id', 'GodId', int),
+    ('god', 'God', str),
+    ('matches', 'Matches', int),
+    ('wins', 'Wins', int),
+    ('losses', 'Losses', int),
+    ('kills', 'Kills', int),
+    ('deaths', 'Deaths', int),
+    ('assists', 'Assists', int),
+    ('gold', 'Gold', int),
+    ('minutes', 'Minutes', int),
+    ('last_played', 'LastPlayed', str),
+)
+
+QueueStat = _record_class('QueueStat', QUEUE_STAT_FIELDS, """
+    One god row of getqueuestats/getqueuestatsbatch.
+    """)
+
+
+def record_option(record_class):
+    """
+    Adds an as_records keyword to an endpoint; as_records=True turns the json rows into record_class instances.
+    Goes above @cached_endpoint so the cache keeps storing plain json.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, as_records=False, **kwargs):
+            data = func(*args, **kwargs)
+            if as_records and isinstance(data, (list, dict)):
+                return record_class.from_rows(data)
+            return data
+        return wrapper
+    return decorator
+
+
+##############################################################################
+########## APIs - Connectivity, Development, & System Status #################
+##############################################################################
+
+# pings to the hirez api
+def api_ping(platform=0):
+    """
+    Send a ping request to the API.
+
+    Parameters:
+    - platform (int): Specifies the api platform (if applicable). 
+                  0 for PC (default), 1 for Xbox, 2 for PS4
+
+    Returns:
+    - Response result as json.
+
+
+    Raises:
+    - ValueError: If platform is not 0, 1 or 2.
+    """
+    try:
+        if platform not in (0, 1, 2):
+            raise ValueError("Platform input can only be 0 (PC), 1 (XBOX), or 2 (PS4)")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+
+    url_list = [http_client.base_url, base_api_url_XBOX, base_api_url_PS4]
+
+    url = f'{url_list[platform]}pingJson'
+
+    response = http_client.get(url)
+
+    if response.status_code != 200:
+        http_log.error("ping failed with status %s.", response.status_code)
+        return
+    return json_loads(response.content)
+
+# create a function to generate a new session ID
+def generate_session_id():
+    """
+    Creates a new session ID for the user, requires personal DeveloperID and AuthKey.
+
+    Parameters:
+    - None needed
+
+    Returns:
+    - The new session ID as a string
+    - Returns nothing if the session could not be created (the reason is logged to the 'SmiteAPIFrame.session' logger)
+
+    Notes:
+    - The session is kept by session_manager (and written to 'CurrentSessionID.txt'/'timestamp.txt')
+    """
+    return session_manager.renew()
+
+# the actual createsession call, session_manager decides when it happens
+def _create_session(credential=None):
+    if credential is None:
+        credential = default_credential
+    # signed like every other url, just without a session in it
+    url = credential.url("createsession")
+
+    # make the API request to generate a new session ID
+    credential.rate_limiter.acquire_session()
+    try:
+        response = http_client.get(url)
+    except requests.RequestException as e:
+        session_log.error("createsession request failed: %s", e)
+        return
+
+    if response.status_code != 200:
+        session_log.error("createsession failed with status %s.", response.status_code)
+        return
+
+    # parse the JSON response, a broken body is a failed attempt like any other (the retry layer raises)
+    try:
+        data = json_loads(response.content)
+    except ValueError:
+        session_log.error("createsession returned a body that isn't json.")
+        return
+    if not isinstance(data, dict):
+        session_log.error("createsession returned %s instead of an object.", type(data).__name__)
+        return
+    # extract the session ID from the response, it's missing when HiRez refuses (ex. too many sessions)
+    sessionId = data.get('session_id')
+    if not sessionId:
+        session_log.error("createsession refused: %s", data.get('ret_msg'))
+        return
+
+    return sessionId
+
+# create a function to check if the session is still valid
+def is_session_valid():
+    """
+    Checks the session timestamp for validity. Min-Max session creation limit.
+    Limit is 15min but I changed it to 14min bc I would get kicked out mid get request
+
+    Parameters:
+    - None needed
+
+    Errors:
+    - Returns false if the 'timestamp.txt' or 'CurrentSessionID.txt' are not found (only checked on first use)
+
+    Returns:
+    - True: if 14 minutes has not passed (is valid)
+    - False: if 14 minutes has passed (not valid)
+
+    """
+    return session_manager.is_valid()
+
+# determines if a session is valid or not - endpoint
+def _test_session():
+    """
+    Not sure how to differentiate between a fail or successful test; both return approved ret_msg and a 200 status code
+    Probably not going to use this 
+    """
+    sesh = session_manager.get_session_id()
+    url = general_API_url(method='testsession',session_id=sesh)
+    response = _api_get(url)
+    if response.status_code != 200:
+        session_log.error("testsession failed with status %s.", response.status_code)
+        return
+    wow = json_loads(response.content)
+    
+    session_log.debug("testsession: %s", wow)
+    return 
+
+# user's api limits
+@valid_session_check
+def MyData(session_id=None):
+    """
+    Checks the user's # of active sessions, session/request limit (500/7500), and current amount of sessions/requests made today.
+
+    Parameters:
+    - None needed
+
+    Returns:
+    - Response result as json; a list containing 1 dictionary
+    - Raises SmiteRequestError if the request keeps failing
+
+    """
+    data = _api_request("getdataused", session_id)
+    
+    return data
+
+# servers down ?
+@valid_session_check
+def get_hirez_server_status(session_id=None):
+    """
+    Checks the availability of HiRez servers of Smite for PC/Switch/Xbox/PS4.
+    Also contains version information
+
+    Parameters:
+    - None needed
+
+    Returns:
+    - Response result as json; a list of dictionaries.
+    - Raises SmiteRequestError if the request keeps failing
+    
+    Notes:
+    - Most likely used when patch versions between platforms weren't sync'd
+    - Also includes pts status !!!
+
+    """
+ 
+
+    data = _api_request("gethirezserverstatus", session_id)
+  
+    return data
+
+# Patch info, very simple
+@valid_session_check
+def get_patch_info(session_id=None):
+    """
+    Checks the version of Smite on live servers.
+    
+
+    Parameters:
+    - None needed
+
+    Returns:
+    - Response result as json; a list of dictionaries.
+    - Raises SmiteRequestError if the request keeps failing
+
+    Notes:
+    - Similar to get_hirez_server_status() but only specifies patch
+
+    """
+ 
+
+    data = _api_request("getpatchinfo", session_id)
+    # lets the response cache know when patch-scoped data goes stale
+    response_cache.set_patch_version(_patch_version(data))
+  
+    return data
+
+def _patch_version(patch_info):
+    # getpatchinfo comes back as a dictionary, but handle a list of 1 dictionary too
+    if isinstance(patch_info, list):
+        patch_info = patch_info[0] if patch_info else None
+    if isinstance(patch_info, dict):
+        return patch_info.get('version_string')
+    return None
+
+##############################################################################
+################## APIs - Gods/Champions & Items #############################
+##############################################################################
+
+# all god info
+@cached_endpoint(CACHE_PATCH)
+@valid_session_check
+def get_gods(session_id= None, language_code = 1):
+    """
+    Returns all Gods and their various attributes.
+
+    Parameters:
+    - language_code (int): Specifies the language return
+    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
+    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
+
+    Data:
+    - Returns literally everything about every god; abilities, lore, id's etc
+    - No way to retrieve data on a specific god from the api
+
+    Notes:
+    - Probably want to save this in a database and use this to update databases every patch
+    - static_data.gods() keeps a snapshot per patch/language and only calls this when the patch changes
+    - stream_gods() yields the gods one at a time instead of holding the whole response in memory
+
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+
+    Raises:
+    - ValueError: If invalid language code is entered
+    """
+    
+    try:
+        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
+            raise ValueError("Invalid language code")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+    data = _api_request("getgods", session_id, language_code)
+    
+    return data
+
+# top 100 leaderboard
+@valid_session_check
+def get_god_leaderboard(session_id= None, god_id = None, queue = 451):
+    """
+    Returns the current season's leaderboard for a god/queue combination.
+
+    Parameters:
+    - god_id (int): Unique identifier for a god (found in get_gods endpoint)
+    - queue (int): Specifies the gamemode
+    - (440) - Ranked Duel |	(450) - Ranked Joust | (451) - Ranked Conquest 
+    
+
+    Data:
+    - Returns top 100 ranked players with a specific god
+
+    Notes:
+    - Not entirely accurate
+
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+
+    Raises:
+    - ValueError: If invalid queue code is entered
+    """
+    try:
+        if queue not in (440, 450, 451):
+            raise ValueError("Invalid Queue")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+
+    data = _api_request("getgodleaderboard", session_id, god_id, queue)
+    
+    return data
+
+#Returns alt abilities for all gods.
+@cached_endpoint(CACHE_PATCH)
+@valid_session_check
 def get_god_alt_abilities(session_id=None):
     """
-    Returns alt abilities for all gods.
+    Returns alt abilities for all gods.
+
+    Parameters:
+    - None needed
+
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+    Data:
+    - Alt abilities per god with their id
+
+    Notes:
+    - Not up to date (missing ix chel at least)
+    - Weird naming scheme and non-intuitive alt abilities
+    - Probably not entirely useful, only for like merlin, tia, KA, lulu
+
+    """
+    data = _api_request("getgodaltabilities", session_id)
+  
+    return data
+
+# skin details for a particular god
+@cached_endpoint(CACHE_PATCH)
+@valid_session_check
+def get_god_skins(session_id=None, god_id = None, language_code = 1):
+    """
+    Returns the current season's leaderboard for a god/queue combination.
+
+    Parameters:
+    - god_id (int): Unique identifier for a god (found in get_gods endpoint)
+    - language_code (int): Specifies the language return
+    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
+    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
+    
+
+    Data:
+    - God skins for a particular god
+    - Includes its cardart, rarity, skin name and skin id
+
+    Notes:
+    - Legendary/Diamond does not have card art URLs
+
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+
+    Raises:
+    - ValueError: If invalid language code is entered
+    """
+
+    try:
+        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
+            raise ValueError("Invalid language code")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+    data = _api_request("getgodskins", session_id, god_id, language_code)
+    
+    return data
+
+def _all_god_ids():
+    # default god list of the bulk skin fetches, god_index builds itself from static_data.gods() on a clean install
+    god_ids = god_index.ids()
+    if not god_ids:
+        raise SmiteAPIError("No god ids to fetch: the god list (getgods) could not be loaded, pass god_ids explicitly.")
+    return god_ids
+
+# skins for every god at once
+def fetch_all_god_skins(sink, god_ids=None, language_code: int=1, max_workers: int=8):
+    """
+    Fetches get_god_skins for every god concurrently and hands each god's skins to sink as soon as they arrive.
+
+    Parameters:
+    - sink (callable): Called as sink(god_id, skins) for every god that succeeded, from the calling thread
+    - god_ids (list): Gods to fetch, every god in god_index by default
+    - language_code (int): Specifies the language return
+    - max_workers (int): Number of requests sent at the same time
+
+    Returns:
+    - {"succeeded": [god ids], "failed": {god id: exception}}
+
+    Raises:
+    - SmiteAPIError: Without god_ids when the god list can't be loaded, instead of fetching nothing
+
+    Usage:
+    - skins = []
+      report = fetch_all_god_skins(lambda god_id, god_skins: skins.append(god_skins))
+      extractGodURL(skins)
+
+    Notes:
+    - One god failing (after retries) is recorded in "failed", it doesn't stop the others
+    """
+    if god_ids is None:
+        god_ids = _all_god_ids()
+
+    def fetch(god_id):
+        try:
+            return get_god_skins(god_id=god_id, language_code=language_code), None
+        except SmiteAPIError as e:
+            return None, e
+
+    report = {"succeeded" : [], "failed" : {}}
+    for god_id, (skins, error) in _fan_out(fetch, god_ids, max_workers=max_workers, ordered=False):
+        if error is None and not isinstance(skins, list):
+            error = SmiteRequestError(f"getgodskins returned {skins!r}", method="getgodskins")
+        if error is not None:
+            report["failed"][god_id] = error
+            continue
+        sink(god_id, skins)
+        report["succeeded"].append(god_id)
+    return report
+
+#items on the recc part of the item store
+@cached_endpoint(CACHE_PATCH)
+@valid_session_check
+def get_god_recommended_items(session_id=None, god_id = None, language_code = 1):
+    """
+    Returns the Recommended Items for a particular God. 
+
+    Parameters:
+    - god_id (int): Unique identifier for a god (found in get_gods endpoint)
+    - language_code (int): Specifies the language return
+    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
+    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
+    
+
+    Data:
+    - Recommended items with its category, item name, item id, and role (gamemode)
+
+    Notes:
+    - Includes legacy items for some reason, "role_value_id" probably has something to do with it
+
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+
+    Raises:
+    - ValueError: If invalid language code is entered
+    """
+
+    try:
+        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
+            raise ValueError("Invalid language code")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+    data = _api_request("getgodrecommendeditems", session_id, god_id, language_code)
+    
+    return data
+
+#stats and descr of all store items/revamped items/retired items
+@cached_endpoint(CACHE_PATCH)
+@valid_session_check
+def get_items(session_id= None, language_code = 1):
+    """
+    Returns all Items and their various attributes.
+
+    Parameters:
+    - language_code (int): Specifies the language return
+    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
+    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
+
+    Data:
+    - Returns information of all items in the game, stats, icon urls and descriptions
+    - Has an "Active_Flag" to show if it is currently enabled in the game
+
+    Notes:
+    - Some icon url's are screwed up, i believe some can be fixed, but it will need to be done manually
+
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+
+    Raises:
+    - ValueError: If invalid language code is entered
+    """
+    
+    try:
+        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
+            raise ValueError("Invalid language code")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+    data = _api_request("getitems", session_id, language_code)
+    
+    return data
+
+##############################################################################
+#################### APIs - Players & PlayerIds ##############################
+##############################################################################
+
+# the most useful endpoint
+@record_option(PlayerProfile)
+@valid_session_check
+def get_player(session_id=None, player_name: str=None, portal_id: int=None):
+    """
+    Returns league and other high level data for a particular player.
+
+    Parameters:
+    - player_name (str): IGN of the player, not sure how to handle special characters
+    - portal_id (int): Specifies the language return
+    - (1) - Hirez | (5) - Steam | (9) - PS4 | (10) - XBOX | (22) - Switch | (25) - Discord | (28) - Epic |
+    - as_records (bool): Return PlayerProfile records instead of dictionaries
+
+    Returns:
+    - Response as json; a list of dictionaries
+    - Raises SmiteRequestError if the request keeps failing
+
+    Data:
+    - Various accurate stats on ranked modes, wins/losses, games played
+    - Account merge data of players, creation date, last log in etc.
+    - SHOWS ACTUAL TOTAL NUMBER OF HOURS SOMEONE HAS PLAYED
+
+    Raises:
+    - ValueError: If portal id is invald
+    - TypeError: If player name is None or an empty string
+
+    Notes:
+    - Not sure what the difference between account_id and player_id is
+
+    """
+    if not (portal_id is None):
+        try:
+            if portal_id not in (1, 5, 9, 10, 22, 25, 28):
+                raise ValueError("Invalid portal id")
+        except ValueError as e:
+            error = {
+                "status" : "error",
+                "message" : str(e)
+            }
+            return json.dumps(error)
+    
+    try:
+        if (player_name is None) or (player_name == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+    except TypeError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+
+    if portal_id is None:
+        data = _api_request("getplayer", session_id, player_name)
+    else:
+        data = _api_request("getplayer", session_id, player_name, portal_id)
+    # a profile has the player id, so a name looked up here doesn't cost a getplayeridbyname later
+    player_resolver.learn(data, player_name, portal_id)
+    
+    return data
+
+# HiRez caps getplayerbatch at 20 player ids per request
+PLAYER_BATCH_SIZE = 20
+
+@record_option(PlayerProfile)
+def get_player_batch(session_id=None, player_id_list: list=None, max_workers: int=4):
+    """
+    Returns getplayer data for a list of player ids.
+
+    Parameters:
+    - player_id_list (list): Hi-Rez player ids (not names, use player_resolver.player_ids() first), any length
+    - max_workers (int): Number of batch requests sent at the same time
+    - as_records (bool): Return PlayerProfile records instead of dictionaries
+
+    Returns:
+    - Response as json; a list of dictionaries, one per player that was found, in the order of player_id_list
+    - Raises SmiteRequestError if a chunk keeps failing
+
+    Raises:
+    - TypeError: If player_id_list is None or empty
+
+    Notes:
+    - The list is split into chunks of PLAYER_BATCH_SIZE since the api caps batch size
+    - Private/unknown ids are left out by the api
+    - The names in the results are remembered by player_resolver
+
+    """
+    try:
+        if (player_id_list is None) or (len(player_id_list) == 0):
+            raise TypeError("Expected a non-empty list of player ids.")
+    except TypeError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+
+    data = []
+    chunks = _chunked(player_id_list, PLAYER_BATCH_SIZE)
+    for player_id_chunk, chunk_data in _fan_out(lambda chunk: _get_player_batch_chunk(player_id_list=chunk), chunks, max_workers=max_workers):
+        if isinstance(chunk_data, list):
+            data.extend(chunk_data)
+    player_resolver.learn(data)
+
+    return data
+
+@valid_session_check
+def _get_player_batch_chunk(session_id=None, player_id_list: list=None):
+    """
+    One getplayerbatch request, player_id_list has to be at most PLAYER_BATCH_SIZE long
+    """
+    data = _api_request("getplayerbatch", session_id, ",".join(str(player_id) for player_id in player_id_list))
+
+    return data
+
+#player id using hirez name
+@valid_session_check
+def get_player_id_by_name(session_id=None, player_name: str=None):
+    """
+    - Function returns a list of Hi-Rez playerId values (expected list size = 1) for playerName provided.  
+    - The playerId returned is expected to be used in various other endpoints to represent the player/individual regardless of platform.
+
+    Parameters:
+    - player_name (str): IGN of the player, not sure how to handle special characters
+
+    Returns:
+    - Response as json
+    - Raises SmiteRequestError if the request keeps failing
+
+    Data:
+    - "player_id": 
+        "portal": 
+        "portal_id": 
+        "privacy_flag":
+
+    Raises:
+    - TypeError: If player name is None or an empty string
+
+    Notes:
+    - Not sure what the difference between account_id and player_id is
+
+    """
+    try:
+        if (player_name is None) or (player_name == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+    except TypeError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+
+    data = _api_request("getplayeridbyname", session_id, player_name)
+    
+    return data
+
+#player id using non-hirez unique identifiers
+@valid_session_check
+def get_playerid_by_portal_userid(session_id=None, portal_id:int =None, portalUSER_id: str=None):
+    """
+    - Function returns a list of Hi-Rez playerId values (expected list size = 1) for {portalId}/{portalUserId} combination provided.
+    - The playerId returned is expected to be used in various other endpoints to represent the player/individual regardless of platform.
 
     Parameters:
-    - None needed
+    - portal_id (int): Specifies the language return
+    - (1) - Hirez | (5) - Steam | (9) - PS4 | (10) - XBOX | (22) - Switch | (25) - Discord | (28) - Epic |
+    - PortalUserId- The (usually) 3rd-Party identifier for a Portal. | Examples:  Steam ID, PS4 GamerTag, Xbox GamerTag, Switch GamerTag.
 
     Returns:
-    - Response result as json
-    - Returns nothing if status code fails
+    - Response as json
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - Alt abilities per god with their id
+    - "player_id": 
+        "portal": 
+        "portal_id": 
+        "privacy_flag":
+
+    Raises:
+    - ValueError: If portal id is invald
+    - TypeError: If player name is None or an empty string
 
     Notes:
-    - Not up to date (missing ix chel at least)
-    - Weird naming scheme and non-intuitive alt abilities
-    - Probably not entirely useful, only for like merlin, tia, KA, lulu
 
     """
-    url = general_API_url(method='getgodaltabilities',session_id=session_id)
-    response = requests.get(url)
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
- 
-    data = response.json()
-  
+    try:
+        if portal_id not in (1, 5, 9, 10, 22, 25, 28):
+            raise ValueError("Invalid portal id")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+    try:
+        if (portalUSER_id is None) or (portalUSER_id == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+    except TypeError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+
+    data = _api_request("getplayeridbyportaluserid", session_id, portal_id, portalUSER_id)
+    
     return data
 
-# skin details for a particular god
+#cant get this to work unfort
 @valid_session_check
-def get_god_skins(session_id=None, god_id = None, language_code = 1):
+def _get_playerid_by_gamertag(session_id=None, portal_id:int =None, gamertag_name: str=None):
     """
-    Returns the current season's leaderboard for a god/queue combination.
+    - Function returns a list of Hi-Rez playerId values (expected list size = 1) for {portalId}/{portalUserId} combination provided.
+    - The playerId returned is expected to be used in various other endpoints to represent the player/individual regardless of platform.
 
     Parameters:
-    - god_id (int): Unique identifier for a god (found in get_gods endpoint)
-    - language_code (int): Specifies the language return
-    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
-    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
-    
-
-    Data:
-    - God skins for a particular god
-    - Includes its cardart, rarity, skin name and skin id
-
-    Notes:
-    - Legendary/Diamond does not have card art URLs
+    - portal_id (int): Specifies the language return
+    - (1) - Hirez | (5) - Steam | (9) - PS4 | (10) - XBOX | (22) - Switch | (25) - Discord | (28) - Epic |
+    - PortalUserId- The (usually) 3rd-Party identifier for a Portal. | Examples:  Steam ID, PS4 GamerTag, Xbox GamerTag, Switch GamerTag.
 
     Returns:
-    - Response result as json
-    - Returns nothing if status code fails
+    - Response as json
+    - Raises SmiteRequestError if the request keeps failing
 
+    Data:
+    - "player_id": 
+        "portal": 
+        "portal_id": 
+        "privacy_flag":
 
     Raises:
-    - ValueError: If invalid language code is entered
-    """
+    - ValueError: If portal id is invald
+    - TypeError: If player name is None or an empty string
 
+    Notes:
+    - Couldn't get an answer out of it on PC, player_resolver uses getplayer for other portals instead
+    """
     try:
-        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
-            raise ValueError("Invalid language code")
+        if portal_id not in (1, 5, 9, 10, 22, 25, 28):
+            raise ValueError("Invalid portal id")
     except ValueError as e:
         error = {
             "status" : "error",
@@ -487,168 +2652,308 @@ def get_god_skins(session_id=None, god_id = None, language_code = 1):
         }
         return json.dumps(error)
     
-    base_url = general_API_url(method="getgodskins",session_id=session_id)
-    
-    url = base_url + '/' + str(god_id) + '/' + str(language_code)
+    try:
+        if (gamertag_name is None) or (gamertag_name == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+    except TypeError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
     
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print("Error: Get God Skins request failed.")
-        return
 
-    data = response.json()
+    data = _api_request("getplayeridsbygamertag", session_id, portal_id, gamertag_name)
     
     return data
 
-#items on the recc part of the item store
-@valid_session_check
-def get_god_recommended_items(session_id=None, god_id = None, language_code = 1):
+
+##############################################################################
+############################ Player Resolver #################################
+##############################################################################
+
+class PlayerResolver:
     """
-    Returns the Recommended Items for a particular God. 
+    Resolves player names to Hi-Rez player ids and remembers the answers, so the endpoints that need a player_id
+    (get_match_history, get_queue_stats_batch, ...) don't cost an extra getplayeridbyname every time.
 
     Parameters:
-    - god_id (int): Unique identifier for a god (found in get_gods endpoint)
-    - language_code (int): Specifies the language return
-    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
-    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
-    
+    - ttl (int): Seconds a resolved name is trusted for (names can be changed)
+    - negative_ttl (int): Seconds a name that wasn't found (or is private) is remembered as None
+    - max_size (int): Names kept in memory, the oldest are dropped past this
 
-    Data:
-    - Recommended items with its category, item name, item id, and role (gamemode)
+    Usage:
+    - player_resolver.player_id("name") -> 123456 or None
+    - player_resolver.player_ids(["name1", "name2", ...]) -> {"name1" : 123456, "name2" : None, ...}
+    - player_resolver.profiles(["name1", "name2", ...]) -> getplayerbatch data for the names
 
     Notes:
-    - Includes legacy items for some reason, "role_value_id" probably has something to do with it
+    - portal_id None or 1 (Hi-Rez) looks names up with getplayeridbyname, other portals with getplayer/{portal_id}
+    - Names are case insensitive, the key is (lowercase name, portal)
+    - get_player() and get_player_batch() results are remembered too
+    - Thread safe, in memory only
+    """
 
-    Returns:
-    - Response result as json
-    - Returns nothing if status code fails
+    def __init__(self, ttl=24 * 60 * 60, negative_ttl=10 * 60, max_size=100000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(player_name, portal_id):
+        return (str(player_name).strip().lower(), None if portal_id in (None, 1) else int(portal_id))
+
+    def _cached(self, key):
+        # (True, player_id) on a hit, (False, None) on a miss
+        entry = self._entries.get(key)
+        if entry is None or time.time() >= entry[1]:
+            return False, None
+        return True, entry[0]
+
+    def remember(self, player_name, player_id, portal_id=None):
+        """
+        Stores a name -> player id answer, player_id None/0 marks the name as not found.
+        """
+        player_id = int(player_id) if player_id else None
+        expires_at = time.time() + (self.ttl if player_id is not None else self.negative_ttl)
+        key = self._key(player_name, portal_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_size:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (player_id, expires_at)
+
+    def learn(self, data, player_name=None, portal_id=None):
+        """
+        Remembers the player ids of getplayer/getplayerbatch rows, under player_name and their hz_player_name.
+        """
+        if not isinstance(data, list):
+            return
+        for row in data:
+            if not isinstance(row, dict) or row.get('ret_msg'):
+                continue
+            player_id = row.get('ActivePlayerId') or row.get('Id')
+            if not player_id:
+                continue
+            if player_name and len(data) == 1:
+                self.remember(player_name, player_id, portal_id)
+            if row.get('hz_player_name'):
+                self.remember(row['hz_player_name'], player_id)
+
+    def forget(self, player_name, portal_id=None):
+        with self._lock:
+            self._entries.pop(self._key(player_name, portal_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, player_name, portal_id):
+        # one request, returns the player id or None
+        if self._key(player_name, portal_id)[1] is None:
+            data = get_player_id_by_name(player_name=player_name)
+            field = 'player_id'
+        else:
+            # get_player() remembers the answer itself
+            data = get_player(player_name=player_name, portal_id=portal_id)
+            field = 'ActivePlayerId'
+        if not isinstance(data, list):
+            # bad input, the endpoint returned an error json
+            return None
+        player_id = None
+        for row in data:
+            if isinstance(row, dict) and not row.get('ret_msg') and (row.get(field) or row.get('Id')):
+                player_id = int(row.get(field) or row.get('Id'))
+                break
+        self.remember(player_name, player_id, portal_id)
+        return player_id
+
+    def player_id(self, player_name, portal_id=None):
+        """
+        Returns the Hi-Rez player id for player_name, or None if it wasn't found (or the profile is private).
+
+        Parameters:
+        - player_name (str): IGN of the player, or the gamertag for portal_id
+        - portal_id (int): (1) - Hirez | (5) - Steam | (9) - PS4 | (10) - XBOX | (22) - Switch | (25) - Discord | (28) - Epic |
+
+        Raises:
+        - TypeError: If player name is None or an empty string
+        - ValueError: If portal id is invalid
+        """
+        self._check(player_name, portal_id)
+        hit, player_id = self._cached(self._key(player_name, portal_id))
+        if hit:
+            return player_id
+        return self._lookup(player_name, portal_id)
+
+    def player_ids(self, player_names, portal_id=None, max_workers: int=8):
+        """
+        Resolves many names at once, only the ones that aren't remembered are requested (max_workers at a time).
+
+        Returns:
+        - Dictionary of name -> player id (None if not found), in the order of player_names
+        """
+        player_names = list(player_names)
+        # answers are kept here, not read back from the cache (ttl=0 or eviction would turn them into None)
+        resolved = {}
+        missing = {}
+        for player_name in player_names:
+            self._check(player_name, portal_id)
+            key = self._key(player_name, portal_id)
+            if key in resolved or key in missing:
+                continue
+            hit, player_id = self._cached(key)
+            if hit:
+                resolved[key] = player_id
+            else:
+                missing[key] = player_name
+        for player_name, player_id in _fan_out(lambda name: self._lookup(name, portal_id), missing.values(), max_workers=max_workers):
+            resolved[self._key(player_name, portal_id)] = player_id
+        return {player_name : resolved[self._key(player_name, portal_id)] for player_name in player_names}
+
+    def profiles(self, player_names, portal_id=None, max_workers: int=8, as_records: bool=False):
+        """
+        Returns getplayer data for many names: names are resolved (cached ones for free) and the profiles come from
+        getplayerbatch, 20 players per request instead of one getplayer each.
+
+        Notes:
+        - Names that weren't found are left out
+        """
+        player_ids = []
+        for player_id in self.player_ids(player_names, portal_id, max_workers=max_workers).values():
+            if player_id is not None and player_id not in player_ids:
+                player_ids.append(player_id)
+        if not player_ids:
+            return []
+        return get_player_batch(player_id_list=player_ids, max_workers=max_workers, as_records=as_records)
+
+    @staticmethod
+    def _check(player_name, portal_id):
+        if (player_name is None) or (str(player_name).strip() == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+        if (portal_id is not None) and (portal_id not in PORTAL_IDS):
+            raise ValueError("Invalid portal id")
 
 
-    Raises:
-    - ValueError: If invalid language code is entered
+# shared by get_player/get_player_batch and anything that needs a player id from a name
+player_resolver = PlayerResolver()
+
+
+##############################################################################
+########################## APIs - PlayerId Info ##############################
+##############################################################################
+
+#what are friends
+@valid_session_check
+def get_friends(session_id=None, player_name=None):
     """
+    Returns the Smite User names of each of the player's friends.  [PC only]
+
+
+    Parameters:
+    - player_name (str): IGN of the player, not sure how to handle special characters
+
+    Returns:
+    - Response as json; a list of dictionaries
+    - Raises SmiteRequestError if the request keeps failing
+
+    Data:
+    - "friend_flags":"1" - Currently Friends, "2" - Outgoing, "32" - Blocked
+    - "portal_id" : "1" - Probably Standalone Client, "5" - Steam, "9" - ???
+    - "player_id" - unique per player
 
+    Notes:
+    - Not sure what the difference between account_id and player_id is
+
+    """
+    
     try:
-        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
-            raise ValueError("Invalid language code")
-    except ValueError as e:
+        if (player_name is None) or (player_name == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+    except TypeError as e:
         error = {
             "status" : "error",
             "message" : str(e)
         }
         return json.dumps(error)
-    
-    base_url = general_API_url(method="getgodrecommendeditems",session_id=session_id)
-    
-    url = base_url + '/' + str(god_id) + '/' + str(language_code)
-    
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Get God Recc Items request failed.")
-        return
 
-    data = response.json()
+    data = _api_request("getfriends", session_id, player_name)
     
     return data
 
-#stats and descr of all store items/revamped items/retired items
+#see if someone is a 1 trick
 @valid_session_check
-def get_items(session_id= None, language_code = 1):
+def get_god_ranks(session_id=None, player_name=None):
     """
-    Returns all Items and their various attributes.
+    Returns the Rank and Worshippers value for each God a player has played.
+
 
     Parameters:
-    - language_code (int): Specifies the language return
-    - (1) - English |	(2) - German | (3) - French | (5) - Chinese | (7) - Spanish | (9) - Spanish (Latin America) | 
-    - (10) - Portuguese | (11) - Russian | (12) - Polish | (13) - Turkish |
+    - player_name (str): IGN of the player, not sure how to handle special characters
+
+    Returns:
+    - Response as json; a list of dictionaries
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - Returns information of all items in the game, stats, icon urls and descriptions
-    - Has an "Active_Flag" to show if it is currently enabled in the game
+    - "Assists": 
+        "Deaths":
+        "Kills":
+        "Losses":
+        "MinionKills": 
+        "Rank": 
+        "Wins":
+        "Worshippers": 
+        "god": 
+        "god_id": 
+        "player_id":
 
     Notes:
-    - Some icon url's are screwed up, i believe some can be fixed, but it will need to be done manually
-
-    Returns:
-    - Response result as json
-    - Returns nothing if status code fails
-
+    - Not sure what the difference between account_id and player_id is
 
-    Raises:
-    - ValueError: If invalid language code is entered
     """
     
     try:
-        if language_code not in (1, 2, 3, 5, 7, 9, 10, 11, 12, 13):
-            raise ValueError("Invalid language code")
-    except ValueError as e:
+        if (player_name is None) or (player_name == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+    except TypeError as e:
         error = {
             "status" : "error",
             "message" : str(e)
         }
         return json.dumps(error)
-    
-    base_url = general_API_url(method="getitems",session_id=session_id)
-    
-    url = base_url + '/' + str(language_code)
-    
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
 
-    data = response.json()
+    data = _api_request("getgodranks", session_id, player_name)
     
     return data
 
-##############################################################################
-#################### APIs - Players & PlayerIds ##############################
-##############################################################################
-
-# the most useful endpoint
+#could probably use this in a discord bot
 @valid_session_check
-def get_player(session_id=None, player_name: str=None, portal_id: int=None):
+def get_player_acievements(session_id=None, player_id=None):
     """
-    Returns league and other high level data for a particular player.
+    Returns select achievement totals (Double kills, Tower Kills, First Bloods, etc) for the specified playerId.
 
     Parameters:
-    - player_name (str): IGN of the player, not sure how to handle special characters
-    - portal_id (int): Specifies the language return
-    - (1) - Hirez | (5) - Steam | (9) - PS4 | (10) - XBOX | (22) - Switch | (25) - Discord | (28) - Epic |
+    - player_name (str): MUST USE PLAYER ID
 
     Returns:
     - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - Various accurate stats on ranked modes, wins/losses, games played
-    - Account merge data of players, creation date, last log in etc.
-    - SHOWS ACTUAL TOTAL NUMBER OF HOURS SOMEONE HAS PLAYED
-
-    Raises:
-    - ValueError: If portal id is invald
-    - TypeError: If player name is None or an empty string
+    - All achievements shown on the accolades screen in smite
 
     Notes:
-    - Not sure what the difference between account_id and player_id is
+    - Does not show total match types played
 
     """
-    if not (portal_id is None):
-        try:
-            if portal_id not in (1, 5, 9, 10, 22, 25, 28):
-                raise ValueError("Invalid portal id")
-        except ValueError as e:
-            error = {
-                "status" : "error",
-                "message" : str(e)
-            }
-            return json.dumps(error)
     
     try:
-        if (player_name is None) or (player_name == ""):
+        if (player_id is None) or (player_id == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -656,44 +2961,43 @@ def get_player(session_id=None, player_name: str=None, portal_id: int=None):
             "message" : str(e)
         }
         return json.dumps(error)
-    
-
-    base_url = general_API_url(method="getplayer",session_id=session_id)
-    
-    url = base_url + '/' + str(player_name)
-
-    if not (portal_id is None):
-        url += '/' + str(portal_id)
-    
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
 
-    data = response.json()
+    data = _api_request("getplayerachievements", session_id, player_id)
     
     return data
 
-#doesnt work for smite api, so i took out the decorator
-def _get_player_batch(session_id=None, player_name: str=None, portal_id: int=1):
+#are the friends online ?
+@cached_endpoint(30)
+@valid_session_check
+def get_player_status(session_id=None, player_id=None):
     """
-    doesn't work :(
+    Returns player status
+
+
+    Parameters:
+    - player_name (str): MUST USE PLAYER ID
+
+    Returns:
+    - Response as json; a list of dictionaries
+    - Raises SmiteRequestError if the request keeps failing
+
+    Data:
+    - 0 - Offline
+        1 - In Lobby  (basically anywhere except god selection or in game)
+        2 - god Selection (player has accepted match and is selecting god before start of game)
+      	3 - In Game (match has started)
+      	4 - Online (player is logged in, but may be blocking broadcast of player state)
+	    5 - Unknown (player not found)
+
+
+    Notes:
+    - Everything is empty or '0' when player is offline
+
     """
-    player_name="wow"
-    player_name_list = ["1111111", "22222222", "33333333"]
-    try:
-        if portal_id not in (1, 5, 9, 10, 22, 25, 28):
-            raise ValueError("Invalid portal id")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
     
     try:
-        if (player_name is None) or (player_name == ""):
+        if (player_id is None) or (player_id == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -701,55 +3005,41 @@ def _get_player_batch(session_id=None, player_name: str=None, portal_id: int=1):
             "message" : str(e)
         }
         return json.dumps(error)
-    
-
-    base_url = general_API_url(method="getplayerbatch",session_id=session_id)
-    
-    url = base_url + '/' #+ str(player_name)
-    for index, player in enumerate(player_name_list):
-        url += player
-        if index < (len(player_name_list) - 1):
-            url += ","
-    print (url)
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
 
-    data = response.json()
+    data = _api_request("getplayerstatus", session_id, player_id)
     
     return data
 
-#player id using hirez name
+# Games in your recents
 @valid_session_check
-def get_player_id_by_name(session_id=None, player_name: str=None):
+def get_match_history(session_id=None, player_id=None):
     """
-    - Function returns a list of Hi-Rez playerId values (expected list size = 1) for playerName provided.  
-    - The playerId returned is expected to be used in various other endpoints to represent the player/individual regardless of platform.
+    Gets recent matches and high level match statistics for a particular player
+
 
     Parameters:
-    - player_name (str): IGN of the player, not sure how to handle special characters
+    - player_id (str): MUST USE PLAYER ID
 
     Returns:
-    - Response as json
-    - Returns nothing if status code fails
+    - Response as json; a list of dictionaries
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - "player_id": 
-        "portal": 
-        "portal_id": 
-        "privacy_flag":
+    - A little more than basic data about player's recent matches
+    - Player's items, gold, w/l, dmg, mit, etc.
+    - Includes gamemode, bans, tix remaining
 
-    Raises:
-    - TypeError: If player name is None or an empty string
 
     Notes:
-    - Not sure what the difference between account_id and player_id is
+    - "first_ban_side" is empty when the first ban is skipped (cringe)
+    - INCLUDES MOTD!!!!!
+    
 
     """
+    
     try:
-        if (player_name is None) or (player_name == ""):
+        if (player_id is None) or (player_id == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -757,64 +3047,52 @@ def get_player_id_by_name(session_id=None, player_name: str=None):
             "message" : str(e)
         }
         return json.dumps(error)
-    
-
-    base_url = general_API_url(method="getplayeridbyname",session_id=session_id)
-    
-    url = base_url + '/' + str(player_name)
-
-    
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
 
-    data = response.json()
+    data = _api_request("getmatchhistory", session_id, player_id)
     
     return data
 
-#player id using non-hirez unique identifiers
+#one of my new favorite endpoints
+@record_option(QueueStat)
 @valid_session_check
-def get_playerid_by_portal_userid(session_id=None, portal_id:int =None, portalUSER_id: str=None):
+def get_queue_stats(session_id= None, player_id = None, queue = None):
     """
-    - Function returns a list of Hi-Rez playerId values (expected list size = 1) for {portalId}/{portalUserId} combination provided.
-    - The playerId returned is expected to be used in various other endpoints to represent the player/individual regardless of platform.
+    Returns match summary statistics for a (player, queue) combination grouped by gods played.
 
-    Parameters:
-    - portal_id (int): Specifies the language return
-    - (1) - Hirez | (5) - Steam | (9) - PS4 | (10) - XBOX | (22) - Switch | (25) - Discord | (28) - Epic |
-    - PortalUserId- The (usually) 3rd-Party identifier for a Portal. | Examples:  Steam ID, PS4 GamerTag, Xbox GamerTag, Switch GamerTag.
 
-    Returns:
-    - Response as json
-    - Returns nothing if status code fails
+    Parameters:
+    - player_id (str): MUST USE PLAYER ID
+    - queue (int): Specifies the gamemode 
+    - as_records (bool): Return QueueStat records instead of dictionaries
+    
 
     Data:
-    - "player_id": 
-        "portal": 
-        "portal_id": 
-        "privacy_flag":
-
-    Raises:
-    - ValueError: If portal id is invald
-    - TypeError: If player name is None or an empty string
+    - Returns god data for specific game mode; time played, last played, kda etc.
 
     Notes:
+    - VERY USEFUL AND COOL
 
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+
+    Raises:
+    - ValueError: If invalid queue code is entered
     """
-    try:
-        if portal_id not in (1, 5, 9, 10, 22, 25, 28):
-            raise ValueError("Invalid portal id")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
+    # try:
+    #     if queue not in (440, 450, 451, 468):
+    #         raise ValueError("Invalid Queue")
+    # except ValueError as e:
+    #     error = {
+    #         "status" : "error",
+    #         "message" : str(e)
+    #     }
+    #     return json.dumps(error)
     
     try:
-        if (portalUSER_id is None) or (portalUSER_id == ""):
+        if (player_id is None) or (player_id == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -822,65 +3100,90 @@ def get_playerid_by_portal_userid(session_id=None, portal_id:int =None, portalUS
             "message" : str(e)
         }
         return json.dumps(error)
-    
 
-    base_url = general_API_url(method="getplayeridbyportaluserid",session_id=session_id)
+    data = _api_request("getqueuestats", session_id, player_id, queue)
     
-    url = base_url + '/' + str(portal_id)
+    return data
 
-    
-    url += '/' + str(portalUSER_id)
-    
-    response = requests.get(url)
+#one of my new favorite endpoints as a BATCH
+@record_option(QueueStat)
+@valid_session_check
+def get_queue_stats_batch(session_id=None, player_id = None, queue_list: list = None):
+    """
+    Returns BATCH match summary statistics for a (player, queue) combination grouped by gods played.
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
 
-    data = response.json()
+    Parameters:
+    - player_id (str): MUST USE PLAYER ID
+    - queue (int): Specifies the gamemode 
+    - as_records (bool): Return QueueStat records instead of dictionaries
     
-    return data
 
-#cant get this to work unfort
-def _get_playerid_by_gamertag(session_id=None, portal_id:int =None, gamertag_name: str=None):
-    """
-    - Function returns a list of Hi-Rez playerId values (expected list size = 1) for {portalId}/{portalUserId} combination provided.
-    - The playerId returned is expected to be used in various other endpoints to represent the player/individual regardless of platform.
+    Data:
+    - Returns god data for specific game mode; time played, last played, kda etc.
 
-    Parameters:
-    - portal_id (int): Specifies the language return
-    - (1) - Hirez | (5) - Steam | (9) - PS4 | (10) - XBOX | (22) - Switch | (25) - Discord | (28) - Epic |
-    - PortalUserId- The (usually) 3rd-Party identifier for a Portal. | Examples:  Steam ID, PS4 GamerTag, Xbox GamerTag, Switch GamerTag.
+    Notes:
+    - VERY USEFUL AND COOL
 
     Returns:
-    - Response as json
-    - Returns nothing if status code fails
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
 
-    Data:
-    - "player_id": 
-        "portal": 
-        "portal_id": 
-        "privacy_flag":
 
     Raises:
-    - ValueError: If portal id is invald
-    - TypeError: If player name is None or an empty string
-
-    Notes:
-    - Can't get it to work, took out validation decorator
+    - ValueError: If invalid queue code is entered
     """
+    # try:
+    #     if queue not in (440, 450, 451, 468):
+    #         raise ValueError("Invalid Queue")
+    # except ValueError as e:
+    #     error = {
+    #         "status" : "error",
+    #         "message" : str(e)
+    #     }
+    #     return json.dumps(error)
+    
     try:
-        if portal_id not in (1, 5, 9, 10, 22, 25, 28):
-            raise ValueError("Invalid portal id")
-    except ValueError as e:
+        if (player_id is None) or (player_id == ""):
+            raise TypeError("Expected a non-empty string for the player name.")
+    except TypeError as e:
         error = {
             "status" : "error",
             "message" : str(e)
         }
         return json.dumps(error)
+
+    data = _api_request("getqueuestatsbatch", session_id, player_id, ",".join(str(queue) for queue in queue_list))
+    
+    return data
+
+#for those pesky console players
+@valid_session_check
+def search_player(session_id=None, player_name=None):
+    """
+    Returns player_id values for all names and/or gamer_tags containing the “searchPlayer” string. 
+
+
+    Parameters:
+    - player_name (str): gamertag
     
+
+    Data:
+    - Returns god data for specific game mode; time played, last played, kda etc.
+
+    Notes:
+    - VERY USEFUL AND COOL
+
+    Returns:
+    - Response result as json
+    - Raises SmiteRequestError if the request keeps failing
+
+
+    Raises:
+    - ValueError: If invalid queue code is entered
+    """
     try:
-        if (gamertag_name is None) or (gamertag_name == ""):
+        if (player_name is None) or (player_name == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -888,56 +3191,71 @@ def _get_playerid_by_gamertag(session_id=None, portal_id:int =None, gamertag_nam
             "message" : str(e)
         }
         return json.dumps(error)
-    
 
-    base_url = general_API_url(method="getplayeridsbygamertag",session_id=session_id)
+    data = _api_request("searchplayers", session_id, player_name)
     
-    url = base_url + '/' + str(portal_id)
+    return data
 
-    
-    url += '/' + str(gamertag_name)
-    
-    response = requests.get(url)
+##############################################################################
+########################## APIs - Match Info #################################
+##############################################################################
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+@valid_session_check
+def _get_demo_details(session_id=None,match_id=None):
+    """
+    Gives some brief detail about a game; most likely used for spectator
 
-    data = response.json()
-    
-    return data
+    Parameters:
+    - match_id (str): Can be inputted as an int
 
+    Returns:
+    - Response result as json; a list containing 1 dictionary
+    - Raises SmiteRequestError if the request keeps failing
 
-##############################################################################
-########################## APIs - PlayerId Info ##############################
-##############################################################################
+    Data:
+    - Provides ban data, a 'queue', match duration, kills, and total gold for teams
+
+    Notes:
+    - According to the API, "Rarely used in lieu of getmatchdetails()"
+
+    """
+    # match_id = 1326174762 
+    if not match_id:
+        log.warning("get_demo_details requires a match ID.")
+        return 
+    data = _api_request("getdemodetails", session_id, match_id)
+    
+    return data
 
-#what are friends
+@record_option(MatchPlayer)
+@cached_endpoint(CACHE_FOREVER)
 @valid_session_check
-def get_friends(session_id=None, player_name=None):
+def get_match_details(session_id=None, match_id=None):
     """
-    Returns the Smite User names of each of the player's friends.  [PC only]
-
+    Returns the statistics for a particular completed match.
 
     Parameters:
-    - player_name (str): IGN of the player, not sure how to handle special characters
+    - match_id (str): ID of the match
+    - as_records (bool): Return MatchPlayer records (slots dataclasses) instead of dictionaries
 
     Returns:
     - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - "friend_flags":"1" - Currently Friends, "2" - Outgoing, "32" - Blocked
-    - "portal_id" : "1" - Probably Standalone Client, "5" - Steam, "9" - ???
-    - "player_id" - unique per player
+    - Like a singular match history result, but for all players in lobby
+    - Has multikill stat and time dead stat
+
 
     Notes:
-    - Not sure what the difference between account_id and player_id is
+    - "first_ban_side" is empty when the first ban is skipped (cringe)
+    - INCLUDES MOTD!!!!!
+    
 
     """
     
     try:
-        if (player_name is None) or (player_name == ""):
+        if (match_id is None) or (match_id == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -947,55 +3265,45 @@ def get_friends(session_id=None, player_name=None):
         return json.dumps(error)
 
 
-    base_url = general_API_url(method="getfriends",session_id=session_id)
-    
-    url = base_url + '/' + str(player_name)
-    
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
-
-    data = response.json()
+    data = _api_request("getmatchdetails", session_id, match_id)
     
     return data
 
-#see if someone is a 1 trick
-@valid_session_check
-def get_god_ranks(session_id=None, player_name=None):
-    """
-    Returns the Rank and Worshippers value for each God a player has played.
+# HiRez caps getmatchdetailsbatch at 10 match ids per request
+MATCH_BATCH_SIZE = 10
 
+@record_option(MatchPlayer)
+def get_match_details_BATCH(session_id=None, match_id_list: list=None, max_workers: int=4):
+    """
+    Returns the statistics for a list of completed matches.
 
     Parameters:
-    - player_name (str): IGN of the player, not sure how to handle special characters
+    - match_id_list (list): IDs of the matches, any length (or any iterable)
+    - max_workers (int): Number of batch requests sent at the same time
+    - as_records (bool): Return MatchPlayer records (slots dataclasses) instead of dictionaries
 
     Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    - Response as json; a list of dictionaries (players of every match, in the order of match_id_list)
+    - Raises SmiteRequestError if a chunk keeps failing
 
     Data:
-    - "Assists": 
-        "Deaths":
-        "Kills":
-        "Losses":
-        "MinionKills": 
-        "Rank": 
-        "Wins":
-        "Worshippers": 
-        "god": 
-        "god_id": 
-        "player_id":
+    - Like a singular match history result, but for all players in lobby
+    - Has multikill stat and time dead stat
+
 
     Notes:
-    - Not sure what the difference between account_id and player_id is
+    - "first_ban_side" is empty when the first ban is skipped (cringe)
+    - INCLUDES MOTD!!!!!
+    - The list is split into chunks of MATCH_BATCH_SIZE since the api caps batch size
+    - Use iter_match_details_BATCH() to stream the chunks instead of waiting for all of them
+    - Use stream_match_details_BATCH() to get the players one by one with bounded memory
+    
 
     """
     
     try:
-        if (player_name is None) or (player_name == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
+        if (match_id_list is None) or (match_id_list == []):
+            raise TypeError("Expected a non-empty list of strings for the match id.")
     except TypeError as e:
         error = {
             "status" : "error",
@@ -1003,97 +3311,114 @@ def get_god_ranks(session_id=None, player_name=None):
         }
         return json.dumps(error)
 
-
-    base_url = general_API_url(method="getgodranks",session_id=session_id)
-    
-    url = base_url + '/' + str(player_name)
-    
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
-
-    data = response.json()
+    data = []
+    for match_id_chunk, chunk_data in iter_match_details_BATCH(match_id_list, max_workers=max_workers):
+        if isinstance(chunk_data, list):
+            data.extend(chunk_data)
     
     return data
 
-#could probably use this in a discord bot
-@valid_session_check
-def get_player_acievements(session_id=None, player_id=None):
+def iter_match_details_BATCH(match_ids, chunk_size: int=MATCH_BATCH_SIZE, max_workers: int=4, ordered: bool=True, as_records: bool=False):
     """
-    Returns select achievement totals (Double kills, Tower Kills, First Bloods, etc) for the specified playerId.
+    Streams getmatchdetailsbatch results for an arbitrarily long list/iterator of match ids.
 
     Parameters:
-    - player_name (str): MUST USE PLAYER ID
-
-    Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    - match_ids (iterable): IDs of the matches, consumed lazily so it can be a generator
+    - chunk_size (int): Match ids per request, capped at MATCH_BATCH_SIZE
+    - max_workers (int): Number of batch requests sent at the same time
+    - ordered (bool): True yields chunks in input order, False yields them as soon as they finish
+    - as_records (bool): Yield MatchPlayer records instead of dictionaries
 
-    Data:
-    - All achievements shown on the accolades screen in smite
+    Yields:
+    - (match_id_chunk, data) tuples; data is the json response for that chunk
 
-    Notes:
-    - Does not show total match types played
+    Raises:
+    - SmiteRequestError: If a chunk keeps failing (raised when that chunk would have been yielded)
 
     """
-    
-    try:
-        if (player_id is None) or (player_id == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
-    except TypeError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-
-
-    base_url = general_API_url(method="getplayerachievements",session_id=session_id)
-    
-    url = base_url + '/' + str(player_id)
-    
-    response = requests.get(url)
+    chunk_size = max(1, min(chunk_size, MATCH_BATCH_SIZE))
+    chunks = _chunked(match_ids, chunk_size)
+    for match_id_chunk, data in _fan_out(_cached_match_details_chunk, chunks, max_workers=max_workers, ordered=ordered):
+        if as_records and isinstance(data, list):
+            data = MatchPlayer.from_rows(data)
+        yield match_id_chunk, data
+
+def _cached_match_details_chunk(match_id_list):
+    # completed matches are cached one by one (same entries as get_match_details), so only the missing ones get requested
+    rows_by_match, missing = _cached_match_rows(match_id_list)
+    data = _get_match_details_chunk(match_id_list=missing) if missing else []
+    return _merge_match_rows(match_id_list, rows_by_match, data)
+
+def _match_details_key(match_id):
+    return _cache_key('get_match_details', {'match_id': str(match_id)})
+
+def _cached_match_rows(match_id_list):
+    # returns ({match id: cached rows}, match ids that still have to be requested), shared with AsyncSmiteClient
+    rows_by_match = {}
+    missing = []
+    for match_id in match_id_list:
+        cached = _cache_get('get_match_details', _match_details_key(match_id), CACHE_FOREVER)
+        if cached is None:
+            missing.append(match_id)
+        else:
+            rows_by_match[str(match_id)] = cached
+    return rows_by_match, missing
+
+def _merge_match_rows(match_id_list, rows_by_match, data):
+    # caches the rows of a getmatchdetailsbatch response per match, returns every row in match_id_list order
+    if not isinstance(data, list):
+        if not rows_by_match:
+            return data
+    else:
+        fetched = {}
+        for row in data:
+            fetched.setdefault(str(row.get('Match')), []).append(row)
+        for match_id, rows in fetched.items():
+            response_cache.set(_match_details_key(match_id), rows, CACHE_FOREVER)
+            rows_by_match[match_id] = rows
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+    return [row for match_id in match_id_list for row in rows_by_match.get(str(match_id), [])]
 
-    data = response.json()
+@valid_session_check
+def _get_match_details_chunk(session_id=None, match_id_list: list=None):
+    """
+    One getmatchdetailsbatch request, match_id_list has to be at most MATCH_BATCH_SIZE long
+    """
+    data = _api_request("getmatchdetailsbatch", session_id, ",".join(str(match_id) for match_id in match_id_list))
     
     return data
 
-#are the friends online ?
+#a lil confusing, but v good to track all matches played ever
+####come back to this to buffer up
 @valid_session_check
-def get_player_status(session_id=None, player_id=None):
+def get_matchids_by_queue(session_id=None,queue =None, date:str = None, hour:str = None):
     """
-    Returns player status
-
+    Lists all Match IDs for a particular Match Queue
 
     Parameters:
-    - player_name (str): MUST USE PLAYER ID
+    - queue (int/str): ID of the match
+    - date (str): in the format “20171231” (for Dec 31, 2017, as an example)
+    - hour (str): in the format of "h,mm" ; where h=hour/mm=minute and mm is optional
+
 
     Returns:
     - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - 0 - Offline
-        1 - In Lobby  (basically anywhere except god selection or in game)
-        2 - god Selection (player has accepted match and is selecting god before start of game)
-      	3 - In Game (match has started)
-      	4 - Online (player is logged in, but may be blocking broadcast of player state)
-	    5 - Unknown (player not found)
+    - Like a singular match history result, but for all players in lobby
+    - Has multikill stat and time dead stat
 
 
     Notes:
-    - Everything is empty or '0' when player is offline
+    - Server side is 4 hours ahead of EST
+    - Hour can be split in 10min intervals, for hour 3 to 3:09, you would specify {hour} as “3,00”
+    - MatchIdHarvester walks a whole date range window by window with checkpoints
+    
 
     """
-    
     try:
-        if (player_id is None) or (player_id == ""):
+        if (queue is None) or (queue == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -1102,39 +3427,26 @@ def get_player_status(session_id=None, player_id=None):
         }
         return json.dumps(error)
 
-
-    base_url = general_API_url(method="getplayerstatus",session_id=session_id)
-    
-    url = base_url + '/' + str(player_id)
-    
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
-
-    data = response.json()
+    data = _api_request("getmatchidsbyqueue", session_id, queue, date, hour)
     
     return data
 
-# Games in your recents
+#the only endpoint to give live match details
 @valid_session_check
-def get_match_history(session_id=None, player_id=None):
+def get_match_player_details(session_id=None, match_id=None):
     """
-    Gets recent matches and high level match statistics for a particular player
-
+    Returns player information for a live match.
 
     Parameters:
-    - player_id (str): MUST USE PLAYER ID
+    - match_id (str): ID of the match
 
     Returns:
     - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - A little more than basic data about player's recent matches
-    - Player's items, gold, w/l, dmg, mit, etc.
-    - Includes gamemode, bans, tix remaining
+    - Like a singular match history result, but for all players in lobby
+    - Has multikill stat and time dead stat
 
 
     Notes:
@@ -1145,7 +3457,7 @@ def get_match_history(session_id=None, player_id=None):
     """
     
     try:
-        if (player_id is None) or (player_id == ""):
+        if (match_id is None) or (match_id == ""):
             raise TypeError("Expected a non-empty string for the player name.")
     except TypeError as e:
         error = {
@@ -1155,29 +3467,47 @@ def get_match_history(session_id=None, player_id=None):
         return json.dumps(error)
 
 
-    base_url = general_API_url(method="getmatchhistory",session_id=session_id)
-    
-    url = base_url + '/' + str(player_id)
+    data = _api_request("getmatchplayerdetails", session_id, match_id)
     
-    response = requests.get(url)
+    return data
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+#This one seems like a very useless endpoint
+@valid_session_check
+def get_top_matches(session_id=None):
+    """
+    Lists the 50 most watched / most recent recorded matches.
 
-    data = response.json()
     
+
+    Parameters:
+    - None needed
+
+    Returns:
+    - Response result as json; a list of dictionaries.
+    - Raises SmiteRequestError if the request keeps failing
+
+    Notes:
+    - Similar to get_hirez_server_status() but only specifies patch
+
+    """
+ 
+
+    data = _api_request("gettopmatches", session_id)
+  
     return data
 
-#one of my new favorite endpoints
+##############################################################################
+################### APIs - Leagues, Seasons & Rounds #########################
+##############################################################################
+
 @valid_session_check
-def get_queue_stats(session_id= None, player_id = None, queue = None):
+def get_league_seasons(session_id=None, queue:int =None):
     """
-    Returns match summary statistics for a (player, queue) combination grouped by gods played.
+    Provides a list of seasons and rounds (including the single active season) for a match queue.
 
 
     Parameters:
-    - player_id (str): MUST USE PLAYER ID
+    
     - queue (int): Specifies the gamemode 
     
 
@@ -1189,640 +3519,1551 @@ def get_queue_stats(session_id= None, player_id = None, queue = None):
 
     Returns:
     - Response result as json
-    - Returns nothing if status code fails
+    - Raises SmiteRequestError if the request keeps failing
 
 
     Raises:
     - ValueError: If invalid queue code is entered
     """
+    try:
+        if queue not in (440, 450, 451):
+            raise ValueError("Invalid Queue")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
     # try:
-    #     if queue not in (440, 450, 451, 468):
-    #         raise ValueError("Invalid Queue")
-    # except ValueError as e:
+    #     if (player_id is None) or (player_id == ""):
+    #         raise TypeError("Expected a non-empty string for the player name.")
+    # except TypeError as e:
     #     error = {
     #         "status" : "error",
     #         "message" : str(e)
     #     }
     #     return json.dumps(error)
+
+    data = _api_request("getleagueseasons", session_id, queue)
+    
+    return data
+
+@valid_session_check
+def get_league_leaderboard(session_id= None, queue=None, tier: int=None, split=None):
+    """
+    Returns the top players for a particular league (as indicated by the queue/tier/split parameters). 
+
+    Parameters:
+    - queue (int/str): ID of the match
+    - tier (int): Bronze V - I ==> (1 - 5) | Silver V - I ==> (6 - 10) | Gold V - I ==> (11 - 15) | Plat V - I ==> (16 - 20) | Dia V - I ==> (21 - 25) | Masters/GM ==> (26/27)
+    - split (int): The ranked season's split
+
+
+    Returns:
+    - Response as json; a list of dictionaries
+    - Raises SmiteRequestError if the request keeps failing
+
+    Data:
+    - Wins/Loss/Leaves of split
+    - For non-private profiles: IGN, current joust/conq mmr
+
+
+    Notes:
+    - Doesn't save previous mmr pre split, only uses current one
+    - Pretty useless endpoint since private profiles makes things hidden
     
+
+    """
     try:
-        if (player_id is None) or (player_id == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
-    except TypeError as e:
+        if queue not in (440, 450, 451):
+            raise ValueError("Invalid Queue")
+    except ValueError as e:
         error = {
             "status" : "error",
             "message" : str(e)
         }
         return json.dumps(error)
-
-    base_url = general_API_url(method="getqueuestats",session_id=session_id)
     
-    url = base_url + '/' + str(player_id) + '/' + str(queue)
     
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print("Error: Get God Leaderboard Request failed.")
-        return
+    try:
+        if (tier < 1) or (tier > 27):
+            raise ValueError("Tier must be [1-27].")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
+    try:
+        if split not in (1, 2, 3, 4):
+            raise ValueError("Invalid Queue")
+    except ValueError as e:
+        error = {
+            "status" : "error",
+            "message" : str(e)
+        }
+        return json.dumps(error)
+    
 
-    data = response.json()
+    data = _api_request("getleagueleaderboard", session_id, queue, tier, split)
     
     return data
 
-#one of my new favorite endpoints as a BATCH
+
 @valid_session_check
-def get_queue_stats_batch(session_id=None, player_id = None, queue_list: list = None):
+def get_esports(session_id=None):
     """
-    Returns BATCH match summary statistics for a (player, queue) combination grouped by gods played.
-
+    Gives esport data for this season and previous seasons (not all)
 
     Parameters:
-    - player_id (str): MUST USE PLAYER ID
-    - queue (int): Specifies the gamemode 
-    
+    - None needed
+
+    Returns:
+    - Response as json; a list of dictionaries
+    - Raises SmiteRequestError if the request keeps failing
 
     Data:
-    - Returns god data for specific game mode; time played, last played, kda etc.
+    - Seems horribly outdated; Team names with team id's no where stated
+    - Team id '1017' seems to be used as a possible "forfeit" or seed skip
 
     Notes:
-    - VERY USEFUL AND COOL
-
-    Returns:
-    - Response result as json
-    - Returns nothing if status code fails
-
+    - According to the API, " An important return value is “match_status” which represents a match being scheduled (1), in-progress (2), or complete (3)"
+    - This is untrue and should not be used, ['match_status'] contains "not-started" and "ended" values
 
-    Raises:
-    - ValueError: If invalid queue code is entered
     """
-    # try:
-    #     if queue not in (440, 450, 451, 468):
-    #         raise ValueError("Invalid Queue")
-    # except ValueError as e:
-    #     error = {
-    #         "status" : "error",
-    #         "message" : str(e)
-    #     }
-    #     return json.dumps(error)
+    data = _api_request("getesportsproleaguedetails", session_id)
     
-    try:
-        if (player_id is None) or (player_id == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
-    except TypeError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
+    return data
 
-    base_url = general_API_url(method="getqueuestatsbatch",session_id=session_id)
-    
-    url = base_url + '/' + str(player_id) + '/'
+@valid_session_check
+def get_motd(session_id=None):
+    """
+    Returns information about the 20 most recent Match-of-the-Days.
 
-    # url = base_url + '/' #+ str(player_name)
-    for index, queue in enumerate(queue_list):
-        url += queue
-        if index < (len(queue_list) - 1):
-            url += ","
-    
     
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Get God Leaderboard Request failed.")
-        return
+    Parameters:
+    - None needed
 
-    data = response.json()
-    
-    return data
+    Returns:
+    - Response result as json; a list of dictionaries.
+    - Raises SmiteRequestError if the request keeps failing
+
+    Notes:
+    - motd pog
 
-#for those pesky console players
-@valid_session_check
-def search_player(session_id=None, player_name=None):
     """
-    Returns player_id values for all names and/or gamer_tags containing the “searchPlayer” string. 
+ 
 
+    data = _api_request("getmotd", session_id)
+  
+    return data
 
-    Parameters:
-    - player_name (str): gamertag
-    
 
-    Data:
-    - Returns god data for specific game mode; time played, last played, kda etc.
+##############################################################################
+############################ Static Data #####################################
+##############################################################################
 
-    Notes:
-    - VERY USEFUL AND COOL
+# fields that line the same record up across languages, per bulk dataset
+LOCALIZED_KEYS = {
+    'gods' : ('id',),
+    'items' : ('ItemId',),
+    'god_skins' : ('god_id', 'skin_id1'),
+}
+
+
+# lists a split dict's keys in their original order, in the shared part and in the localized part of languages with other keys
+_KEYS_FIELD = '$keys'
+
+
+def _split_localized(values):
+    # values is {language: value}, returns (shared part, {language: localized part} or None if nothing differs)
+    first = next(iter(values.values()))
+    if all(value == first for value in values.values()):
+        return first, None
+    if all(isinstance(value, dict) for value in values.values()):
+        shared = {}
+        localized = {language : {} for language in values}
+        all_keys = list(dict.fromkeys(key for value in values.values() for key in value))
+        for key in all_keys:
+            present = {language : value[key] for language, value in values.items() if key in value}
+            if len(present) < len(values):
+                # only some languages have this key, it's kept as is in those
+                for language, part in present.items():
+                    localized[language][key] = part
+                continue
+            shared_part, localized_parts = _split_localized(present)
+            if localized_parts is None:
+                shared[key] = shared_part
+                continue
+            if shared_part is not None:
+                # even an empty shared dict, so its localized parts get merged (and reordered) into a dict
+                shared[key] = shared_part
+            for language, part in localized_parts.items():
+                localized[language][key] = part
+        # merging puts the shared keys first, the original key order is recorded when that would change it:
+        # once in the shared part, and per language only for the languages that differ from it
+        orders = {language : list(value) for language, value in values.items()}
+        common = next(iter(orders.values()))
+        if any(list(shared) + [key for key in localized[language] if key not in shared] != order for language, order in orders.items()):
+            shared[_KEYS_FIELD] = common
+        for language, order in orders.items():
+            if order != common:
+                localized[language][_KEYS_FIELD] = order
+        return shared, localized
+    return None, dict(values)
+
+
+def _merge_localized(shared, part):
+    if part is None:
+        # nothing differs between languages (a differing scalar always has a None shared part)
+        return shared
+    if isinstance(shared, dict) and isinstance(part, dict):
+        merged = dict(shared)
+        for key, value in part.items():
+            if key != _KEYS_FIELD:
+                merged[key] = _merge_localized(shared[key], value) if key in shared else value
+        order = part.get(_KEYS_FIELD, shared.get(_KEYS_FIELD))
+        if order is not None:
+            merged = {key : merged[key] for key in order}
+        return merged
+    return part
+
+
+def compact_localized(data_by_language, key_fields):
+    """
+    Deduplicates the same payload fetched in several languages. Anything equal in every language
+    (ids, numbers, urls...) is stored once, only the parts that differ (names, descriptions) are kept per language.
+
+    Parameters:
+    - data_by_language (dict): {language_code: list of records}, ex. {1: get_gods(language_code=1), 2: ...}
+    - key_fields (tuple): Fields identifying a record across languages, see LOCALIZED_KEYS
 
     Returns:
-    - Response result as json
-    - Returns nothing if status code fails
+    - {"keys": record ids in order, "shared": {record id: shared fields}, "localized": {language: {record id: differing fields}},
+      "language_keys": {language: record ids that language has, in its order}}
+    """
+    records = {}
+    language_keys = {}
+    for language, rows in data_by_language.items():
+        for record in rows:
+            record_id = ':'.join(str(record.get(field)) for field in key_fields)
+            records.setdefault(record_id, {})[str(language)] = record
+            language_keys.setdefault(str(language), []).append(record_id)
+
+    languages = [str(language) for language in data_by_language]
+    compact = {"keys" : list(records), "shared" : {}, "localized" : {language : {} for language in languages},
+               "language_keys" : {language : language_keys.get(language, []) for language in languages}}
+    for record_id, by_language in records.items():
+        # only compared between the languages that have the record
+        shared, localized = _split_localized(by_language)
+        compact["shared"][record_id] = shared
+        for language, part in (localized or {}).items():
+            compact["localized"][language][record_id] = part
+    return compact
+
+
+def expand_localized(compact, language_code):
+    """
+    Rebuilds the full records of one language from compact_localized() output.
+    """
+    localized = compact["localized"].get(str(language_code), {})
+    # snapshots from before language_keys have every record in every language
+    record_ids = compact.get("language_keys", {}).get(str(language_code), compact["keys"])
+    return [_merge_localized(compact["shared"][record_id], localized.get(record_id)) for record_id in record_ids]
 
 
-    Raises:
-    - ValueError: If invalid queue code is entered
+class StaticDataManager:
     """
-    try:
-        if (player_name is None) or (player_name == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
-    except TypeError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
+    Serves the big patch-only payloads (gods, items, alt abilities, recommended items) from local snapshots
+    kept per patch version and language, and only downloads them again when get_patch_info() reports a new version.
 
-    base_url = general_API_url(method="searchplayers",session_id=session_id)
-    
-    url = base_url + '/' + str(player_name) 
-    
-    response = requests.get(url)
+    Parameters:
+    - root (str): Folder the snapshots are stored in, as {root}/{version}/{name}_{language}.json
+    - poll_interval (int): Seconds between get_patch_info() checks
 
-    if response.status_code != 200:
-        print("Error: searchplayers Request failed.")
-        return
+    Usage:
+    - static_data.gods(language_code=1)  # only hits the api the first time each patch
+
+    Notes:
+    - A cold start costs one getpatchinfo request instead of the multi-megabyte gods payload
+    - If the patch check fails, the newest snapshot on disk keeps being served
+    - fetch_all_languages()/fetch_god_skins_all_languages() download every language at once into one
+      deduplicated {name}_all.json snapshot, which the single-language lookups also read from
+    """
+
+    def __init__(self, root='static_data', poll_interval=60 * 60):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.version = None
+        self._last_check = 0
+        self._snapshots = {}
+        self._compact = {}
+        self._lock = threading.RLock()
+
+    def _latest_snapshot_version(self):
+        if not os.path.isdir(self.root):
+            return None
+        versions = [entry for entry in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, entry))]
+        if not versions:
+            return None
+        return max(versions, key=lambda entry: os.path.getmtime(os.path.join(self.root, entry)))
+
+    def check_patch(self, force=False):
+        """
+        Polls get_patch_info() (at most every poll_interval seconds unless force=True).
+
+        Returns:
+        - The current patch version
+        """
+        with self._lock:
+            if not force and self.version is not None and time.time() - self._last_check < self.poll_interval:
+                return self.version
+            self._last_check = time.time()
+            try:
+                version = _patch_version(get_patch_info())
+            except (SmiteAPIError, requests.RequestException):
+                version = None
+            if version is None:
+                version = self.version or self._latest_snapshot_version()
+            if version != self.version:
+                # snapshots of older patches stay on disk but aren't served anymore
+                self._snapshots = {}
+                self._compact = {}
+                self.version = version
+            return self.version
+
+    def _path(self, version, name, language_code):
+        return os.path.join(self.root, str(version), f'{name}_{language_code}.json')
+
+    def _get(self, name, language_code, fetch):
+        version = self.check_patch()
+        key = (name, language_code)
+        data = self._snapshots.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            data = self._snapshots.get(key)
+            if data is not None:
+                return data
+            path = self._path(version, name, language_code) if version is not None else None
+            if path is not None and os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json_load(f)
+            else:
+                data = self._from_compact(name, language_code, version)
+            if data is None:
+                data = fetch()
+                if not isinstance(data, (list, dict)):
+                    # validation error json string, don't snapshot it
+                    return data
+                if path is not None:
+                    self._save(path, data)
+            self._snapshots[key] = data
+            return data
+
+    def _load_compact(self, dataset, version):
+        compact = self._compact.get(dataset)
+        if compact is None and version is not None:
+            path = self._path(version, dataset, 'all')
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    compact = json_load(f)
+                self._compact[dataset] = compact
+        return compact
+
+    def _from_compact(self, name, language_code, version):
+        dataset, god_id = name, None
+        if name.startswith('god_skins_'):
+            dataset, god_id = 'god_skins', name[len('god_skins_'):]
+        compact = self._load_compact(dataset, version)
+        if compact is None or str(language_code) not in compact["localized"]:
+            return None
+        records = expand_localized(compact, language_code)
+        if god_id is not None:
+            records = [record for record in records if str(record.get('god_id')) == god_id]
+            # a god that isn't in the snapshot (ex. released after it was taken) is fetched, not cached as no skins
+            if not records:
+                return None
+        return records
+
+    def _store_compact(self, dataset, data_by_language):
+        compact = compact_localized(data_by_language, LOCALIZED_KEYS[dataset])
+        with self._lock:
+            if self.version is not None:
+                self._save(self._path(self.version, dataset, 'all'), compact)
+            self._compact[dataset] = compact
+            # single-language copies from before are superseded by the compact one
+            self._snapshots = {key : value for key, value in self._snapshots.items() if not key[0].startswith(dataset)}
+        return compact
+
+    def fetch_all_languages(self, names=('gods', 'items'), languages=LANGUAGE_CODES, max_workers: int=4):
+        """
+        Downloads every (endpoint, language) combination concurrently and stores each endpoint as one compact snapshot.
+
+        Parameters:
+        - names (tuple): Any of 'gods', 'items'
+        - languages (tuple): Language codes, all 10 by default
+        - max_workers (int): Number of requests sent at the same time
+
+        Returns:
+        - {name: compact_localized() output}
+        """
+        self.check_patch()
+        fetchers = {'gods' : get_gods, 'items' : get_items}
+        jobs = [(name, language) for name in names for language in languages]
+        fetch = lambda job: fetchers[job[0]](language_code=job[1])
+        results = {name : {} for name in names}
+        for (name, language), data in _fan_out(fetch, jobs, max_workers=max_workers):
+            if isinstance(data, list):
+                results[name][language] = data
+        return {name : self._store_compact(name, by_language) for name, by_language in results.items() if by_language}
+
+    def fetch_god_skins_all_languages(self, god_ids=None, languages=LANGUAGE_CODES, max_workers: int=4):
+        """
+        Downloads the skins of every (god, language) combination concurrently into one compact 'god_skins' snapshot.
+
+        Parameters:
+        - god_ids (list): Gods to fetch, every god in god_index by default
+        - languages (tuple): Language codes, all 10 by default
+        - max_workers (int): Number of requests sent at the same time
+
+        Returns:
+        - compact_localized() output
+
+        Raises:
+        - SmiteAPIError: Without god_ids when the god list can't be loaded
+        """
+        self.check_patch()
+        if god_ids is None:
+            god_ids = _all_god_ids()
+        jobs = [(god_id, language) for god_id in god_ids for language in languages]
+        fetch = lambda job: get_god_skins(god_id=job[0], language_code=job[1])
+        by_language = {}
+        for (god_id, language), data in _fan_out(fetch, jobs, max_workers=max_workers):
+            if isinstance(data, list):
+                by_language.setdefault(language, []).extend(data)
+        return self._store_compact('god_skins', by_language)
+
+    @staticmethod
+    def _save(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write then rename so a crash never leaves half a snapshot behind
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json_dump(data, f)
+        os.replace(path + '.tmp', path)
+
+    def gods(self, language_code=1):
+        return self._get('gods', language_code, lambda: get_gods(language_code=language_code))
+
+    def items(self, language_code=1):
+        return self._get('items', language_code, lambda: get_items(language_code=language_code))
+
+    def god_alt_abilities(self):
+        return self._get('god_alt_abilities', 1, lambda: get_god_alt_abilities())
+
+    def god_recommended_items(self, god_id, language_code=1):
+        return self._get(f'god_recommended_items_{god_id}', language_code,
+                         lambda: get_god_recommended_items(god_id=god_id, language_code=language_code))
+
+    def god_skins(self, god_id, language_code=1):
+        return self._get(f'god_skins_{god_id}', language_code, lambda: get_god_skins(god_id=god_id, language_code=language_code))
+
+
+# shared snapshots, GodIndex rebuilds from here
+static_data = StaticDataManager()
 
-    data = response.json()
-    
-    return data
 
 ##############################################################################
-########################## APIs - Match Info #################################
+############################ Match Harvesting ################################
 ##############################################################################
 
-@valid_session_check
-def _get_demo_details(session_id=None,match_id=None):
+class MatchIdHarvester:
     """
-    Gives some brief detail about a game; most likely used for spectator
+    Walks a queue across a date range in 10 minute windows (getmatchidsbyqueue) and hands out every
+    completed match id once. Progress is checkpointed so a restart skips windows that were already harvested.
 
     Parameters:
-    - match_id (str): Can be inputted as an int
-
-    Returns:
-    - Response result as json; a list containing 1 dictionary
-    - Returns nothing if status code fails
+    - queue (int): Queue to harvest, ex. 451 for Ranked Conquest
+    - checkpoint_file (str): Append-only file of finished windows and their match ids, 'harvest_{queue}.jsonl' by default
+    - settle_minutes (int): A window is only checkpointed once it ended this long ago, so late matches still show up
 
-    Data:
-    - Provides ban data, a 'queue', match duration, kills, and total gold for teams
+    Usage:
+    - harvester = MatchIdHarvester(451)
+      harvester.run('20231115', details_sink=my_db.insert_rows)
 
     Notes:
-    - According to the API, "Rarely used in lieu of getmatchdetails()"
-
+    - Dates/hours are server time (UTC, 4 hours ahead of EST)
+    - Matches with Active_Flag 'y' are still being played; they are skipped and their window is polled again later
     """
-    # match_id = 1326174762 
-    if not match_id:
-        print("Requires a match ID")
-        return 
-    base_url = general_API_url(method="getdemodetails",session_id=session_id)
-    url = base_url + '/' + str(match_id)
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+    def __init__(self, queue, checkpoint_file=None, settle_minutes=30):
+        self.queue = queue
+        self.checkpoint_file = checkpoint_file or f'harvest_{queue}.jsonl'
+        self.settle_seconds = settle_minutes * 60
+        self.done_windows = set()
+        self.seen_match_ids = set()
+        self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_file):
+            return
+        with open(self.checkpoint_file, 'r') as f:
+            for line in f:
+                try:
+                    entry = json_loads(line)
+                except ValueError:
+                    # half written last line from a crash, that window just gets harvested again
+                    continue
+                self.done_windows.add((entry['date'], entry['hour']))
+                self.seen_match_ids.update(entry['matches'])
+
+    def _checkpoint(self, date, hour, match_ids):
+        with open(self.checkpoint_file, 'a') as f:
+            f.write(json_dumps({"date" : date, "hour" : hour, "matches" : match_ids}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.done_windows.add((date, hour))
+
+    @staticmethod
+    def windows(start_date: str, end_date: str=None):
+        """
+        Yields (date, hour, window_end) for every 10 minute window from start_date to end_date (inclusive) that has started.
+
+        Parameters:
+        - start_date (str): ex. "20231115"
+        - end_date (str): ex. "20231116", defaults to today
+        """
+        start = int(calendar.timegm(time.strptime(start_date, '%Y%m%d')))
+        if end_date is None:
+            end = time.time()
+        else:
+            end = min(time.time(), calendar.timegm(time.strptime(end_date, '%Y%m%d')) + 86400)
+        window_start = start
+        while window_start < end:
+            window = time.gmtime(window_start)
+            yield time.strftime('%Y%m%d', window), f"{window.tm_hour},{window.tm_min:02d}", window_start + 600
+            window_start += 600
+
+    def harvest(self, start_date: str, end_date: str=None):
+        """
+        Yields (date, hour, new_match_ids) for every window that hasn't been checkpointed yet.
+
+        Notes:
+        - A window's ids only count as seen (and the window is checkpointed) when the caller asks for the next one,
+          so whatever the caller does with the ids (fetching details etc) finishes before the window counts as done.
+          If the caller raises or stops iterating, the window's ids are handed out again on the next run
+        - Windows that fail to load (after retries) are skipped and retried on the next run
+        """
+        for date, hour, window_end in self.windows(start_date, end_date):
+            if (date, hour) in self.done_windows:
+                continue
+            try:
+                data = get_matchids_by_queue(queue=self.queue, date=date, hour=hour)
+            except SmiteRequestError:
+                continue
+            if not isinstance(data, list):
+                continue
+
+            new_match_ids = []
+            still_active = False
+            for entry in data:
+                match_id = entry.get('Match')
+                if not match_id or entry.get('ret_msg'):
+                    continue
+                if entry.get('Active_Flag') == 'y':
+                    still_active = True
+                    continue
+                match_id = str(match_id)
+                if match_id not in self.seen_match_ids:
+                    new_match_ids.append(match_id)
+            new_match_ids = list(dict.fromkeys(new_match_ids))
+
+            yield date, hour, new_match_ids
+
+            # the caller came back for the next window, so these were processed
+            self.seen_match_ids.update(new_match_ids)
+            if not still_active and time.time() - window_end >= self.settle_seconds:
+                self._checkpoint(date, hour, new_match_ids)
+
+    def run(self, start_date: str, end_date: str=None, details_sink=None, max_workers: int=4):
+        """
+        Harvests the date range and feeds the new matches into get_match_details_BATCH.
+
+        Parameters:
+        - details_sink (callable): Called with each batch of match player rows (a list of dictionaries)
+        - max_workers (int): Number of batch requests sent at the same time
+
+        Returns:
+        - Number of new match ids harvested
+        """
+        total = 0
+        for date, hour, match_ids in self.harvest(start_date, end_date):
+            total += len(match_ids)
+            if details_sink is None or not match_ids:
+                continue
+            for match_id_chunk, rows in iter_match_details_BATCH(match_ids, max_workers=max_workers):
+                if isinstance(rows, list) and rows:
+                    details_sink(rows)
+        return total
+
+    def follow(self, details_sink=None, poll_interval: int=300, max_workers: int=4):
+        """
+        Keeps up with a live queue forever, re-harvesting from yesterday every poll_interval seconds.
+        Finished windows are skipped so each pass only touches the recent ones.
+        """
+        while True:
+            yesterday = time.strftime('%Y%m%d', time.gmtime(time.time() - 86400))
+            self.run(yesterday, details_sink=details_sink, max_workers=max_workers)
+            time.sleep(poll_interval)
 
-    data = response.json()
-    
-    return data
 
-@valid_session_check
-def get_match_details(session_id=None, match_id=None):
+##############################################################################
+############################ Columnar Export #################################
+##############################################################################
+
+# numpy/pyarrow dtypes for the (attribute, api key, type) tables in the Records section
+_NUMPY_TYPES = {int : 'i8', float : 'f8', str : 'O'}
+
+
+def _record_values(rows, fields):
+    # rows can be api dictionaries or records, either way each row becomes a tuple in field order
+    converters = [(attribute, key, _CONVERTERS[kind]) for attribute, key, kind in fields]
+    for row in rows:
+        if isinstance(row, dict):
+            yield tuple(convert(row.get(key)) for attribute, key, convert in converters)
+        else:
+            yield tuple(getattr(row, attribute) for attribute, key, convert in converters)
+
+
+def match_columns(rows, fields=MATCH_PLAYER_FIELDS):
     """
-    Returns the statistics for a particular completed match.
+    Turns match player rows into columns.
 
     Parameters:
-    - match_id (str): ID of the match
+    - rows (list): getmatchdetails/getmatchdetailsbatch dictionaries or MatchPlayer records
+    - fields (tuple): Schema, MATCH_PLAYER_FIELDS by default
 
     Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    - A dictionary of attribute name -> list of values
+    """
+    values = list(_record_values(rows, fields))
+    return {attribute : [row[index] for row in values] for index, (attribute, key, kind) in enumerate(fields)}
 
-    Data:
-    - Like a singular match history result, but for all players in lobby
-    - Has multikill stat and time dead stat
 
+def match_numpy(rows, fields=MATCH_PLAYER_FIELDS):
+    """
+    Turns match player rows into a numpy structured array with a fixed dtype (int64/float64/object columns).
 
-    Notes:
-    - "first_ban_side" is empty when the first ban is skipped (cringe)
-    - INCLUDES MOTD!!!!!
-    
+    Usage:
+    - players = match_numpy(rows)
+      win_rate = (players['win_status'] == 'Winner')[players['god_id'] == 1737].mean()
 
+    Raises:
+    - ImportError: If numpy isn't installed
     """
-    
-    try:
-        if (match_id is None) or (match_id == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
-    except TypeError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
+    if np is None:
+        raise ImportError("match_numpy requires numpy (pip install numpy)")
+    dtype = np.dtype([(attribute, _NUMPY_TYPES[kind]) for attribute, key, kind in fields])
+    return np.array(list(_record_values(rows, fields)), dtype=dtype)
 
 
-    base_url = general_API_url(method="getmatchdetails",session_id=session_id)
-    
-    url = base_url + '/' + str(match_id)
-    
-    response = requests.get(url)
+def _arrow_schema(fields):
+    arrow_types = {int : pa.int64(), float : pa.float64(), str : pa.string()}
+    return pa.schema([(attribute, arrow_types[kind]) for attribute, key, kind in fields])
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
 
-    data = response.json()
-    
-    return data
+def match_arrow_table(rows, fields=MATCH_PLAYER_FIELDS):
+    """
+    Turns match player rows into a pyarrow Table with a fixed schema.
 
-@valid_session_check
-def get_match_details_BATCH(session_id=None, match_id_list: list=None):
+    Raises:
+    - ImportError: If pyarrow isn't installed
     """
-    Returns the statistics for a particular completed match.
+    if pa is None:
+        raise ImportError("match_arrow_table requires pyarrow (pip install pyarrow)")
+    return pa.Table.from_pydict(match_columns(rows, fields), schema=_arrow_schema(fields))
+
+
+class MatchTableWriter:
+    """
+    Writes batches of match player rows to a Parquet or Feather (Arrow IPC) file as they come in,
+    so a whole day of matches never has to sit in memory.
 
     Parameters:
-    - match_id (str): ID of the match
+    - path (str): Output file
+    - file_format (str): 'parquet' or 'feather'
+    - fields (tuple): Schema, MATCH_PLAYER_FIELDS by default
 
-    Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    Usage:
+    - with MatchTableWriter('conquest_20231115.parquet') as writer:
+          MatchIdHarvester(451).run('20231115', details_sink=writer.write)
 
-    Data:
-    - Like a singular match history result, but for all players in lobby
-    - Has multikill stat and time dead stat
+    Raises:
+    - ImportError: If pyarrow isn't installed
+    - ValueError: If file_format isn't 'parquet' or 'feather'
+    """
 
+    def __init__(self, path, file_format='parquet', fields=MATCH_PLAYER_FIELDS):
+        if pa is None:
+            raise ImportError("MatchTableWriter requires pyarrow (pip install pyarrow)")
+        if file_format not in ('parquet', 'feather'):
+            raise ValueError("file_format can only be 'parquet' or 'feather'")
+        self.path = path
+        self.file_format = file_format
+        self.fields = fields
+        self.schema = _arrow_schema(fields)
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self.schema)
 
-    Notes:
-    - "first_ban_side" is empty when the first ban is skipped (cringe)
-    - INCLUDES MOTD!!!!!
-    
+    def write(self, rows):
+        """
+        Appends a batch of rows (dictionaries or MatchPlayer records); each batch becomes one row group/record batch.
+        """
+        if not rows:
+            return
+        table = match_arrow_table(rows, self.fields)
+        with self._lock:
+            self._writer.write_table(table)
+            self.rows_written += table.num_rows
 
-    """
-    
-    try:
-        if (match_id_list is None) or (match_id_list == []):
-            raise TypeError("Expected a non-empty list of strings for the match id.")
-    except TypeError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
+    def close(self):
+        with self._lock:
+            self._writer.close()
 
+    def __enter__(self):
+        return self
 
-    base_url = general_API_url(method="getmatchdetailsbatch",session_id=session_id)
-    
-    url = base_url + '/' 
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
-    for index, queue in enumerate(match_id_list):
-        url += queue
-        if index < (len(match_id_list) - 1):
-            url += ","
-    print (url)
-    
-    response = requests.get(url)
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+##############################################################################
+############################### Streaming ####################################
+##############################################################################
 
-    data = response.json()
-    
-    return data
+# only the characters that change nesting, so the scanner can jump between them with re
+_JSON_STRUCTURE = re.compile(r'["\[\]{}]')
+_JSON_STRING_END = re.compile(r'["\\]')
+_JSON_SEPARATORS = ' \t\r\n,'
 
-#a lil confusing, but v good to track all matches played ever
-####come back to this to buffer up
-@valid_session_check
-def get_matchids_by_queue(session_id=None,queue =None, date:str = None, hour:str = None):
+def iter_json_array(chunks):
     """
-    Lists all Match IDs for a particular Match Queue
+    Incrementally parses a top-level json array and yields its elements one by one (iterparse style).
 
     Parameters:
-    - queue (int/str): ID of the match
-    - date (str): in the format “20171231” (for Dec 31, 2017, as an example)
-    - hour (str): in the format of "h,mm" ; where h=hour/mm=minute and mm is optional
+    - chunks (iterable): Pieces of the body as bytes or str, ex. response.iter_content()
 
+    Yields:
+    - Each element of the array, decoded as soon as its last byte arrives
 
-    Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    Raises:
+    - ValueError: If the body isn't a json array or is cut off
 
-    Data:
-    - Like a singular match history result, but for all players in lobby
-    - Has multikill stat and time dead stat
+    Notes:
+    - Only the element being parsed is kept in memory, not the whole body
+    - Elements that are already fully buffered are decoded directly, bigger ones are scanned for brackets/quotes until they close
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    index = 0
+    opened = False
+    start = None
+    depth = 0
+    in_string = False
+    finished = False
+
+    def pieces():
+        for chunk in chunks:
+            yield utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield utf8.decode(b'', final=True)
+        yield None
+
+    for chunk in pieces():
+        last = chunk is None
+        if not last:
+            # drop what's already been yielded, the buffer only holds the current element + the new chunk
+            cut = index if start is None else start
+            buffer = buffer[cut:] + chunk
+            index -= cut
+            if start is not None:
+                start = 0
+        while True:
+            if not opened:
+                buffer = buffer.lstrip()
+                if not buffer:
+                    break
+                if buffer[0] != '[':
+                    raise ValueError("Expected a json array, got " + repr(buffer[:40]))
+                buffer = buffer[1:]
+                opened = True
+                continue
+
+            if start is None:
+                while index < len(buffer) and buffer[index] in _JSON_SEPARATORS:
+                    index += 1
+                if index == len(buffer):
+                    buffer = ''
+                    index = 0
+                    break
+                if buffer[index] == ']':
+                    finished = True
+                    break
+                start = index
+                # most elements fit in what's already buffered, so try the fast C decoder first
+                try:
+                    value, end = decoder.raw_decode(buffer, start)
+                except ValueError:
+                    value = _NOTHING
+                # scalars are only trusted once a separator comes after them (numbers can be cut mid-chunk)
+                if value is not _NOTHING and (buffer[start] in '{[' or (end < len(buffer) and buffer[end] in _JSON_SEPARATORS + ']')):
+                    yield value
+                    index = end
+                    start = None
+                    continue
+                if buffer[start] not in '{[':
+                    if last:
+                        raise ValueError("Json array has a broken element: " + repr(buffer[start:start + 40]))
+                    start = None
+                    break
+
+            # inside an object/array, find where it closes
+            while index < len(buffer):
+                if in_string:
+                    match = _JSON_STRING_END.search(buffer, index)
+                    if match is None:
+                        index = len(buffer)
+                        break
+                    if match.group() == '\\':
+                        # skip whatever is escaped, even if it's still in the next chunk
+                        index = match.end() + 1
+                        continue
+                    in_string = False
+                    index = match.end()
+                    continue
+                match = _JSON_STRUCTURE.search(buffer, index)
+                if match is None:
+                    index = len(buffer)
+                    break
+                char = match.group()
+                index = match.end()
+                if char == '"':
+                    in_string = True
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        break
+
+            if start is not None and depth == 0 and index > start and not in_string:
+                yield json_loads(buffer[start:index])
+                start = None
+                continue
+            break
+
+        if finished:
+            return
+
+    raise ValueError("Json array was cut off before its closing bracket.")
+
+
+def _api_stream(method, session_id, *params, chunk_size: int=64 * 1024):
+    """
+    Streaming version of _api_request, yields the elements of the top-level array as they come in.
 
+    Parameters:
+    - method (str): Api endpoint, ex. 'getgods'
+    - session_id (str): Session to start with, replaced if HiRez says it's invalid
+    - params: Url parameters appended after the timestamp
+    - chunk_size (int): Bytes read from the socket at a time
+
+    Raises:
+    - SmiteRequestError: If the request keeps failing before the first element, or the body breaks mid-stream
+    - QuotaExceededError: If the daily limit is hit
 
     Notes:
-    - Server side is 4 hours ahead of EST
-    - Hour can be split in 10min intervals, for hour 3 to 3:09, you would specify {hour} as “3,00”
-    
+    - Retries (and session renewal) only happen until the first element is yielded, after that a failure is raised
+    - Goes through the same rate limiter, session manager and http client as every other endpoint
+    """
+    # the key is picked now, the generator body only runs once iteration starts (outside valid_session_check)
+    credential, session_id = _request_credential(session_id)
+    return _stream_request(credential, method, session_id, params, chunk_size)
+
+
+def _stream_request(credential, method, session_id, params, chunk_size):
+    attempts = _RequestAttempts(method, credential, session_id, streamed=True)
+    for attempt in attempts:
+        if attempt:
+            time.sleep(attempts.delay())
+        if attempts.session_id is None:
+            try:
+                attempts.session_id = attempts.credential.session_manager.get_session_id()
+            except QuotaExceededError as e:
+                attempts.switch_key(e, exhausted=False)
+                continue
+            if attempts.session_id is None:
+                attempts.no_session()
+                continue
+
+        url = attempts.start(params)
+        try:
+            attempts.credential.rate_limiter.acquire()
+            attempts.mark(2)
+            response = http_client.get(url, stream=True)
+            attempts.mark(3)
+        except QuotaExceededError as e:
+            attempts.switch_key(e)
+            continue
+        except requests.RequestException as e:
+            attempts.connection_failed(e)
+            continue
+
+        with response:
+            if response.status_code != 200:
+                attempts.done(response.status_code, None)
+                continue
+
+            elements = iter_json_array(response.iter_content(chunk_size=chunk_size))
+            try:
+                first = next(elements, _NOTHING)
+            except (ValueError, requests.RequestException) as e:
+                attempts.bad_body(f"a body that isn't a json array: {e}")
+                continue
+            # decode time of a stream is only up to the first element, the rest is spent while the caller iterates
+            attempts.mark(4)
+            if first is _NOTHING:
+                attempts.done(200, [])
+                return
+
+            # errors come back as a single element with ret_msg set, same check as the non-streaming path
+            if not attempts.done(200, [first]):
+                continue
+
+            yield first
+            try:
+                yield from elements
+            except (ValueError, requests.RequestException) as e:
+                raise SmiteRequestError(f"{method} stream broke after it started: {e}", method=method, status_code=200, attempts=attempt + 1)
+            return
+
+    attempts.give_up()
 
+
+@valid_session_check
+def stream_gods(session_id=None, language_code=1):
     """
-    try:
-        if (queue is None) or (queue == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
-    except TypeError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
+    Yields every god one at a time straight from the http body, like get_gods() without holding the whole response.
 
-    base_url = general_API_url(method="getmatchidsbyqueue",session_id=session_id)
-    
-    url = base_url + '/' + str(queue) + '/' + str(date) + '/' + str(hour)
-    
-    response = requests.get(url)
+    Parameters:
+    - language_code (int): Specifies the language return, same codes as get_gods()
 
-    if response.status_code != 200:
-        print("Error: get_matchids_by_queue Request failed.")
-        return
+    Yields:
+    - One dictionary per god
 
-    data = response.json()
-    
-    return data
+    Raises:
+    - ValueError: If invalid language code is entered
+    - SmiteRequestError: If the request keeps failing
+
+    Notes:
+    - Not cached, use get_gods()/static_data.gods() when the whole list is needed anyway
+    """
+    if language_code not in LANGUAGE_CODES:
+        raise ValueError("Invalid language code")
+    return _api_stream("getgods", session_id, language_code)
 
-#the only endpoint to give live match details
 @valid_session_check
-def get_match_player_details(session_id=None, match_id=None):
+def stream_items(session_id=None, language_code=1):
     """
-    Returns player information for a live match.
+    Yields every item one at a time straight from the http body, like get_items() without holding the whole response.
 
     Parameters:
-    - match_id (str): ID of the match
+    - language_code (int): Specifies the language return, same codes as get_items()
 
-    Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    Yields:
+    - One dictionary per item
 
-    Data:
-    - Like a singular match history result, but for all players in lobby
-    - Has multikill stat and time dead stat
+    Raises:
+    - ValueError: If invalid language code is entered
+    - SmiteRequestError: If the request keeps failing
+    """
+    if language_code not in LANGUAGE_CODES:
+        raise ValueError("Invalid language code")
+    return _api_stream("getitems", session_id, language_code)
 
+def stream_match_details_BATCH(match_ids, chunk_size: int=MATCH_BATCH_SIZE, as_records: bool=False):
+    """
+    Yields the players of every match one at a time, requests are sent one chunk after the other.
 
-    Notes:
-    - "first_ban_side" is empty when the first ban is skipped (cringe)
-    - INCLUDES MOTD!!!!!
-    
+    Parameters:
+    - match_ids (iterable): IDs of the matches, consumed lazily so it can be a generator
+    - chunk_size (int): Match ids per request, capped at MATCH_BATCH_SIZE
+    - as_records (bool): Yield MatchPlayer records instead of dictionaries
+
+    Yields:
+    - One player row (dictionary or MatchPlayer) at a time, in the order HiRez returns them
+
+    Raises:
+    - SmiteRequestError: If a chunk keeps failing
 
+    Notes:
+    - Memory stays at about one player row no matter how many matches are asked for
+    - Skips the response cache, use iter_match_details_BATCH() for cached/concurrent chunks
     """
-    
-    try:
-        if (match_id is None) or (match_id == ""):
-            raise TypeError("Expected a non-empty string for the player name.")
-    except TypeError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
+    chunk_size = max(1, min(chunk_size, MATCH_BATCH_SIZE))
+    for match_id_chunk in _chunked(match_ids, chunk_size):
+        # no session passed in, so every chunk can go to a different key of the credential_pool
+        for row in _api_stream("getmatchdetailsbatch", None, ','.join(str(match_id) for match_id in match_id_chunk)):
+            yield MatchPlayer.from_dict(row) if as_records else row
 
 
-    base_url = general_API_url(method="getmatchplayerdetails",session_id=session_id)
-    
-    url = base_url + '/' + str(match_id)
-    
-    response = requests.get(url)
+##############################################################################
+############################ Async Client ####################################
+##############################################################################
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+def _error_json(message):
+    error = {
+        "status" : "error",
+        "message" : str(message)
+    }
+    return json.dumps(error)
 
-    data = response.json()
-    
-    return data
 
-#This one seems like a very useless endpoint
-@valid_session_check
-def get_top_matches(session_id=None):
+class AsyncSmiteClient:
     """
-    Lists the 50 most watched / most recent recorded matches.
-
-    
+    asyncio version of the endpoint functions above, for crawlers that need lots of calls in flight
+    without a thread per call. Every method has the same name and arguments as its function (minus session_id).
 
     Parameters:
-    - None needed
+    - base_url (str): Api url to call, defaults to the shared http_client's base_url (so a local fake server works too)
+    - max_concurrency (int): Max number of requests in flight at once, extra calls wait their turn
+    - timeout (float): Total seconds a single request may take
 
-    Returns:
-    - Response result as json; a list of dictionaries.
-    - Returns nothing if status code fails
+    Usage:
+    - async with AsyncSmiteClient(max_concurrency=32) as client:
+          matches = await asyncio.gather(*(client.get_match_details(match_id=m) for m in match_ids))
 
     Notes:
-    - Similar to get_hirez_server_status() but only specifies patch
-
+    - Shares sessions, rate limits and the credential_pool with the sync functions
+    - Requires aiohttp
     """
- 
 
-    url = general_API_url(method='gettopmatches',session_id=session_id)
-    response = requests.get(url)
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
- 
-    data = response.json()
-  
-    return data
+    def __init__(self, base_url=None, max_concurrency=16, timeout=30):
+        if aiohttp is None:
+            raise ImportError("AsyncSmiteClient requires aiohttp (pip install aiohttp)")
+        if base_url is not None and not base_url.endswith('/'):
+            base_url += '/'
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = None
+        self._session = None
+        self._in_flight = {}
+
+    async def __aenter__(self):
+        await self._open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _open(self):
+        if self._session is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _base_url(self):
+        return self.base_url if self.base_url is not None else http_client.base_url
+
+    async def _session_id(self, credential):
+        sessions = credential.session_manager
+        if sessions.is_valid():
+            return sessions.session_id
+        # creating a session is rare, so it just runs the sync version off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, sessions.get_session_id)
+
+    async def _get(self, url, limited=True, limiter=None):
+        # returns (status, json body), the body is None for non-200 responses
+        status, body = await self._get_raw(url, limited, limiter)
+        return status, (json_loads(body) if body is not None else None)
+
+    async def _get_raw(self, url, limited=True, limiter=None):
+        # returns (status, body bytes), the body is None for non-200 responses
+        await self._open()
+        if limited:
+            delay = (limiter or rate_limiter).reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with self._semaphore:
+            async with self._session.get(url) as response:
+                if response.status != 200:
+                    return response.status, None
+                return response.status, await response.read()
+
+    async def _call(self, method, *params):
+        # identical calls already in flight on this client are awaited instead of sent again (see SingleFlight)
+        if not single_flight.enabled:
+            return await self._send(method, *params)
+        key = (method,) + tuple(str(param) for param in params)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(method, *params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._in_flight.pop(key, None))
+        # shielded so one caller getting cancelled doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _send(self, method, *params):
+        # same retry rules (and key scheduling) as _api_request()
+        attempts = _RequestAttempts(method, _pick_credential())
+        for attempt in attempts:
+            if attempt:
+                await asyncio.sleep(attempts.delay())
+            if attempts.session_id is None:
+                try:
+                    attempts.session_id = await self._session_id(attempts.credential)
+                except QuotaExceededError as e:
+                    attempts.switch_key(e, exhausted=False)
+                    continue
+                if attempts.session_id is None:
+                    attempts.no_session()
+                    continue
+
+            url = attempts.start(params, base_url=self._base_url())
+            # rate limiter wait happens inside _get_raw, so it's counted as network here
+            attempts.mark(2)
+            try:
+                status, body = await self._get_raw(url, limiter=attempts.credential.rate_limiter)
+                attempts.mark(3)
+            except QuotaExceededError as e:
+                attempts.switch_key(e)
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                attempts.connection_failed(e)
+                continue
+
+            data = None
+            if body is not None:
+                try:
+                    data = json_loads(body)
+                except ValueError:
+                    attempts.bad_body("a body that isn't json.", size=len(body))
+                    continue
+            attempts.mark(4)
+
+            if attempts.done(status, data, len(body) if body is not None else None):
+                return data
+
+        attempts.give_up()
+
+    # Connectivity, Development, & System Status
+
+    async def api_ping(self, platform=0):
+        if platform not in (0, 1, 2):
+            return _error_json("Platform input can only be 0 (PC), 1 (XBOX), or 2 (PS4)")
+        url_list = [self._base_url(), base_api_url_XBOX, base_api_url_PS4]
+        status, data = await self._get(f'{url_list[platform]}pingJson', limited=False)
+        if status != 200:
+            http_log.error("ping failed with status %s.", status)
+            return
+        return data
 
-##############################################################################
-################### APIs - Leagues, Seasons & Rounds #########################
-##############################################################################
+    async def MyData(self):
+        return await self._call("getdataused")
 
-@valid_session_check
-def get_league_seasons(session_id=None, queue:int =None):
-    """
-    Provides a list of seasons and rounds (including the single active season) for a match queue.
+    async def get_hirez_server_status(self):
+        return await self._call("gethirezserverstatus")
 
+    async def get_patch_info(self):
+        data = await self._call("getpatchinfo")
+        # same as get_patch_info(), lets the response cache know when patch-scoped data goes stale
+        response_cache.set_patch_version(_patch_version(data))
+        return data
 
-    Parameters:
-    
-    - queue (int): Specifies the gamemode 
-    
+    # Gods/Champions & Items
 
-    Data:
-    - Returns god data for specific game mode; time played, last played, kda etc.
+    async def get_gods(self, language_code=1):
+        if language_code not in LANGUAGE_CODES:
+            return _error_json("Invalid language code")
+        return await self._call("getgods", language_code)
 
-    Notes:
-    - VERY USEFUL AND COOL
+    async def get_god_leaderboard(self, god_id=None, queue=451):
+        if queue not in RANKED_QUEUES:
+            return _error_json("Invalid Queue")
+        return await self._call("getgodleaderboard", god_id, queue)
 
-    Returns:
-    - Response result as json
-    - Returns nothing if status code fails
+    async def get_god_alt_abilities(self):
+        return await self._call("getgodaltabilities")
 
+    async def get_god_skins(self, god_id=None, language_code=1):
+        if language_code not in LANGUAGE_CODES:
+            return _error_json("Invalid language code")
+        return await self._call("getgodskins", god_id, language_code)
 
-    Raises:
-    - ValueError: If invalid queue code is entered
-    """
-    try:
-        if queue not in (440, 450, 451):
-            raise ValueError("Invalid Queue")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-    
-    # try:
-    #     if (player_id is None) or (player_id == ""):
-    #         raise TypeError("Expected a non-empty string for the player name.")
-    # except TypeError as e:
-    #     error = {
-    #         "status" : "error",
-    #         "message" : str(e)
-    #     }
-    #     return json.dumps(error)
+    async def get_god_recommended_items(self, god_id=None, language_code=1):
+        if language_code not in LANGUAGE_CODES:
+            return _error_json("Invalid language code")
+        return await self._call("getgodrecommendeditems", god_id, language_code)
 
-    base_url = general_API_url(method="getleagueseasons",session_id=session_id)
-    
-    url = base_url + '/' + str(queue)
-    
-    response = requests.get(url)
+    async def get_items(self, language_code=1):
+        if language_code not in LANGUAGE_CODES:
+            return _error_json("Invalid language code")
+        return await self._call("getitems", language_code)
 
-    if response.status_code != 200:
-        print("Error: Get God Leaderboard Request failed.")
-        return
+    # Players & PlayerIds
 
-    data = response.json()
-    
-    return data
+    async def get_player(self, player_name: str=None, portal_id: int=None):
+        if (portal_id is not None) and (portal_id not in PORTAL_IDS):
+            return _error_json("Invalid portal id")
+        if (player_name is None) or (player_name == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        if portal_id is None:
+            return await self._call("getplayer", player_name)
+        return await self._call("getplayer", player_name, portal_id)
+
+    async def get_player_batch(self, player_id_list: list=None):
+        if (player_id_list is None) or (len(player_id_list) == 0):
+            return _error_json("Expected a non-empty list of player ids.")
+        chunks = _chunked(player_id_list, PLAYER_BATCH_SIZE)
+        results = await asyncio.gather(*(self._call("getplayerbatch", ",".join(str(player_id) for player_id in chunk)) for chunk in chunks))
+        data = []
+        for chunk_data in results:
+            if isinstance(chunk_data, list):
+                data.extend(chunk_data)
+        player_resolver.learn(data)
+        return data
 
-@valid_session_check
-def get_league_leaderboard(session_id= None, queue=None, tier: int=None, split=None):
-    """
-    Returns the top players for a particular league (as indicated by the queue/tier/split parameters). 
+    async def get_player_id_by_name(self, player_name: str=None):
+        if (player_name is None) or (player_name == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getplayeridbyname", player_name)
 
-    Parameters:
-    - queue (int/str): ID of the match
-    - tier (int): Bronze V - I ==> (1 - 5) | Silver V - I ==> (6 - 10) | Gold V - I ==> (11 - 15) | Plat V - I ==> (16 - 20) | Dia V - I ==> (21 - 25) | Masters/GM ==> (26/27)
-    - split (int): The ranked season's split
+    async def get_playerid_by_portal_userid(self, portal_id: int=None, portalUSER_id: str=None):
+        if portal_id not in PORTAL_IDS:
+            return _error_json("Invalid portal id")
+        if (portalUSER_id is None) or (portalUSER_id == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getplayeridbyportaluserid", portal_id, portalUSER_id)
 
+    # PlayerId Info
 
-    Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    async def get_friends(self, player_name=None):
+        if (player_name is None) or (player_name == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getfriends", player_name)
 
-    Data:
-    - Wins/Loss/Leaves of split
-    - For non-private profiles: IGN, current joust/conq mmr
+    async def get_god_ranks(self, player_name=None):
+        if (player_name is None) or (player_name == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getgodranks", player_name)
 
+    async def get_player_acievements(self, player_id=None):
+        if (player_id is None) or (player_id == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getplayerachievements", player_id)
 
-    Notes:
-    - Doesn't save previous mmr pre split, only uses current one
-    - Pretty useless endpoint since private profiles makes things hidden
-    
+    async def get_player_status(self, player_id=None):
+        if (player_id is None) or (player_id == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getplayerstatus", player_id)
 
-    """
-    try:
-        if queue not in (440, 450, 451):
-            raise ValueError("Invalid Queue")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-    
-    
-    try:
-        if (tier < 1) or (tier > 27):
-            raise ValueError("Tier must be [1-27].")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-    
-    try:
-        if split not in (1, 2, 3, 4):
-            raise ValueError("Invalid Queue")
-    except ValueError as e:
-        error = {
-            "status" : "error",
-            "message" : str(e)
-        }
-        return json.dumps(error)
-    
+    async def get_match_history(self, player_id=None):
+        if (player_id is None) or (player_id == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getmatchhistory", player_id)
 
-    base_url = general_API_url(method="getleagueleaderboard",session_id=session_id)
-    
-    url = base_url + '/' + str(queue) + '/' + str(tier) + '/' + str(split)
-    
-    response = requests.get(url)
+    async def get_queue_stats(self, player_id=None, queue=None):
+        if (player_id is None) or (player_id == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getqueuestats", player_id, queue)
 
-    if response.status_code != 200:
-        print("Error: getleagueleaderboard Request failed.")
-        return
+    async def get_queue_stats_batch(self, player_id=None, queue_list: list=None):
+        if (player_id is None) or (player_id == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("getqueuestatsbatch", player_id, ",".join(str(queue) for queue in queue_list))
 
-    data = response.json()
-    
-    return data
+    async def search_player(self, player_name=None):
+        if (player_name is None) or (player_name == ""):
+            return _error_json("Expected a non-empty string for the player name.")
+        return await self._call("searchplayers", player_name)
 
+    # Match Info
 
-@valid_session_check
-def get_esports(session_id=None):
-    """
-    Gives esport data for this season and previous seasons (not all)
+    async def get_match_details(self, match_id=None):
+        if (match_id is None) or (match_id == ""):
+            return _error_json("Expected a non-empty string for the match id.")
+        # same cache entry as get_match_details(), completed matches never change
+        key = _match_details_key(match_id)
+        data = _cache_get('get_match_details', key, CACHE_FOREVER)
+        if data is not None:
+            return data
+        data = await self._call("getmatchdetails", match_id)
+        response_cache.set(key, data, CACHE_FOREVER)
+        return data
 
-    Parameters:
-    - None needed
+    async def get_match_details_BATCH(self, match_id_list: list=None):
+        if (match_id_list is None) or (match_id_list == []):
+            return _error_json("Expected a non-empty list of strings for the match id.")
+        # split the same way the sync version does, the semaphore keeps the chunks bounded
+        chunks = _chunked(match_id_list, MATCH_BATCH_SIZE)
+        results = await asyncio.gather(*(self._match_details_chunk(chunk) for chunk in chunks))
+        data = []
+        for chunk_data in results:
+            if isinstance(chunk_data, list):
+                data.extend(chunk_data)
+        return data
 
-    Returns:
-    - Response as json; a list of dictionaries
-    - Returns nothing if status code fails
+    async def _match_details_chunk(self, match_id_list):
+        # like _cached_match_details_chunk(), only the matches missing from response_cache are requested
+        rows_by_match, missing = _cached_match_rows(match_id_list)
+        data = []
+        if missing:
+            data = await self._call("getmatchdetailsbatch", ",".join(str(match_id) for match_id in missing))
+        return _merge_match_rows(match_id_list, rows_by_match, data)
 
-    Data:
-    - Seems horribly outdated; Team names with team id's no where stated
-    - Team id '1017' seems to be used as a possible "forfeit" or seed skip
+    async def get_matchids_by_queue(self, queue=None, date: str=None, hour: str=None):
+        if (queue is None) or (queue == ""):
+            return _error_json("Expected a non-empty string for the queue.")
+        return await self._call("getmatchidsbyqueue", queue, date, hour)
 
-    Notes:
-    - According to the API, " An important return value is “match_status” which represents a match being scheduled (1), in-progress (2), or complete (3)"
-    - This is untrue and should not be used, ['match_status'] contains "not-started" and "ended" values
+    async def get_match_player_details(self, match_id=None):
+        if (match_id is None) or (match_id == ""):
+            return _error_json("Expected a non-empty string for the match id.")
+        return await self._call("getmatchplayerdetails", match_id)
 
-    """
-    url = general_API_url(method="getesportsproleaguedetails",session_id=session_id)
-    
-    response = requests.get(url)
+    async def get_top_matches(self):
+        return await self._call("gettopmatches")
 
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
+    # Leagues, Seasons & Rounds
 
-    data = response.json()
-    
-    return data
+    async def get_league_seasons(self, queue: int=None):
+        if queue not in RANKED_QUEUES:
+            return _error_json("Invalid Queue")
+        return await self._call("getleagueseasons", queue)
 
-@valid_session_check
-def get_motd(session_id=None):
-    """
-    Returns information about the 20 most recent Match-of-the-Days.
+    async def get_league_leaderboard(self, queue=None, tier: int=None, split=None):
+        if queue not in RANKED_QUEUES:
+            return _error_json("Invalid Queue")
+        if (tier is None) or (tier < 1) or (tier > 27):
+            return _error_json("Tier must be [1-27].")
+        if split not in (1, 2, 3, 4):
+            return _error_json("Invalid Queue")
+        return await self._call("getleagueleaderboard", queue, tier, split)
 
-    
+    async def get_esports(self):
+        return await self._call("getesportsproleaguedetails")
 
-    Parameters:
-    - None needed
+    async def get_motd(self):
+        return await self._call("getmotd")
 
-    Returns:
-    - Response result as json; a list of dictionaries.
-    - Returns nothing if status code fails
 
-    Notes:
-    - motd pog
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _numbers(text):
+    # "14/13/12/11/10s" -> (14.0, 13.0, 12.0, 11.0, 10.0)
+    return tuple(float(num) for num in _NUMBER.findall(str(text or "")))
+
 
+def _parse_ability(ability):
+    description = ((ability or {}).get('Description') or {}).get('itemDescription') or {}
+    damage = ""
+    for rank_item in description.get('rankitems') or []:
+        if 'damage' in str(rank_item.get('description', '')).lower():
+            damage = str(rank_item.get('value', ''))
+            break
+    cooldown = str(description.get('cooldown') or "")
+    cost = str(description.get('cost') or "")
+    return {
+        "Name" : (ability or {}).get('Summary', ""),
+        "Cooldown" : cooldown,
+        "Cost" : cost,
+        "Damage" : damage,
+        "cooldown_values" : _numbers(cooldown),
+        "cost_values" : _numbers(cost),
+        # only the per-rank part, not the "(+60% of your Magical Power)" scaling
+        "damage_values" : _numbers(damage.split('(')[0]),
+    }
+
+
+class GodIndex:
     """
- 
+    Parsed-once index of every god from get_gods, with the numbers of all five abilities pulled out ahead of time
+    (cooldown/cost/damage per rank). Lookups by god name (any case) or god id are dictionary hits.
 
-    url = general_API_url(method='getmotd',session_id=session_id)
-    response = requests.get(url)
-    if response.status_code != 200:
-        print("Error: Request failed.")
-        return
- 
-    data = response.json()
-  
-    return data
+    Parameters:
+    - path (str): Json file the index is saved to/loaded from
+    - auto_refresh (bool): Check get_patch_info() every check_interval seconds and rebuild from the new gods snapshot on a new patch
+    - check_interval (int): Seconds between patch checks
+
+    Notes:
+    - Falls back to the old 'gods_data_modified_NEW1.json' file (ability 1 cooldowns only) if the index file doesn't exist
+    - With neither file (clean install) the first lookup builds the index from static_data.gods() and saves it
+    - The auto refresh runs on a background thread, lookups never wait for the api; call refresh_if_stale() to do it in place
+    - A saved index counts as checked when it's loaded, so the first check is check_interval after startup
+    - If the patch check fails (no connection, quota, no keys, ...) the current data keeps being used
+    """
+
+    def __init__(self, path='GOD_INDEX.json', auto_refresh=False, check_interval=60 * 60):
+        self.path = path
+        self.auto_refresh = auto_refresh
+        self.check_interval = check_interval
+        self.version = None
+        self._by_name = {}
+        self._by_id = {}
+        self._gods = []
+        self._loaded = False
+        self._last_check = 0
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def build(self, godData, version=None):
+        """
+        Indexes a get_gods response.
+        """
+        gods = []
+        for Gods in godData:
+            name = str(Gods.get('Name', ''))
+            if not (name and name[0].isalpha() and 'A' <= name[0].upper() <= 'Z'):
+                continue
+            abilities = [_parse_ability(Gods.get(f'Ability_{number}')) for number in range(1, 6)]
+            gods.append({"Name" : name, "GodID" : Gods.get('id'), "Cooldown" : abilities[0]["Cooldown"], "Abilities" : abilities})
+        self._set(gods, version)
+
+    def _set(self, gods, version):
+        with self._lock:
+            self._gods = gods
+            self._by_name = {god["Name"].lower() : god for god in gods}
+            self._by_id = {str(god["GodID"]) : god for god in gods}
+            self.version = version
+            self._loaded = True
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json_dump({"version" : self.version, "gods" : self._gods}, f, indent=2)
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json_load(f)
+                for god in data["gods"]:
+                    for ability in god["Abilities"]:
+                        for key in ("cooldown_values", "cost_values", "damage_values"):
+                            ability[key] = tuple(ability[key])
+                self._set(data["gods"], data.get("version"))
+                if self.version is not None:
+                    self._last_check = time.time()
+            elif os.path.exists('gods_data_modified_NEW1.json'):
+                with open('gods_data_modified_NEW1.json', 'r', encoding='utf-8') as f:
+                    data = json_load(f)
+                gods = []
+                for item in data:
+                    ability = {"Name" : "", "Cooldown" : item['Cooldown'], "Cost" : "", "Damage" : "",
+                               "cooldown_values" : _numbers(item['Cooldown']), "cost_values" : (), "damage_values" : ()}
+                    gods.append({"Name" : item["Name"], "GodID" : item["GodID"], "Cooldown" : item['Cooldown'], "Abilities" : [ability]})
+                self._set(gods, None)
+            else:
+                self._build_first()
+
+    def _build_first(self):
+        # nothing saved yet, only new patches are left to auto_refresh/refresh_if_stale()
+        try:
+            godData = static_data.gods()
+        except (SmiteAPIError, requests.RequestException):
+            static_log.warning("Could not build the god index, lookups find nothing until refresh_if_stale() works.", exc_info=True)
+            godData = None
+        if not isinstance(godData, list) or not godData:
+            self._loaded = True
+            return
+        self.build(godData, static_data.version)
+        self.save()
+        self._last_check = time.time()
+
+    def refresh_if_stale(self, force=False):
+        """
+        Rebuilds the index from the gods snapshot (static_data) if get_patch_info() reports a different version than the index was built on.
+
+        Returns:
+        - True if the index was rebuilt
+        """
+        with self._lock:
+            self._last_check = time.time()
+            version = static_data.check_patch(force=True)
+            if not force and version is not None and version == self.version:
+                return False
+            try:
+                godData = static_data.gods()
+            except (SmiteAPIError, requests.RequestException):
+                return False
+            if not isinstance(godData, list):
+                return False
+            self.build(godData, version)
+            self.save()
+            return True
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh_if_stale()
+        except Exception:
+            static_log.warning("God index refresh failed, keeping the current data.", exc_info=True)
+
+    def _ready(self):
+        if not self._loaded:
+            self._load()
+        if self.auto_refresh and time.time() - self._last_check >= self.check_interval:
+            with self._refresh_lock:
+                if time.time() - self._last_check < self.check_interval:
+                    return
+                self._last_check = time.time()
+            threading.Thread(target=self._refresh_quietly, name='GodIndexRefresh', daemon=True).start()
+
+    def lookup(self, god):
+        """
+        Returns the entry for a god name (any case) or god id, None if it isn't known.
+
+        Data:
+        - "Name", "GodID", "Cooldown" (ability 1), "Abilities": 5 dictionaries (ability 5 is the passive) with
+          "Name", "Cooldown", "Cost", "Damage" text and "cooldown_values", "cost_values", "damage_values" per rank
+        """
+        self._ready()
+        key = str(god).strip()
+        entry = self._by_id.get(key)
+        if entry is None:
+            entry = self._by_name.get(key.lower())
+        return entry
+
+    def gods(self):
+        self._ready()
+        return list(self._gods)
+
+    def ids(self):
+        return [int(god["GodID"]) for god in self.gods()]
+
+
+# shared index used by GodID/Cooldowns
+god_index = GodIndex()
 
 
 def extractGodData(godData):
-    with open('gods_data_modified_NEW1.json', 'w') as f:
+    with open('gods_data_modified_NEW1.json', 'w', encoding='utf-8') as f:
     # Write the gods data to the file
         firstAbilityCD_list = []
         for Gods in godData:
@@ -1833,133 +5074,160 @@ def extractGodData(godData):
             #json.dump(item['Name'], f, indent=2)
             #json.dump(item['Ability_1']['Description']['itemDescription']['cooldown'], f, indent=2)
             #f.write("\n")
-        json.dump(firstAbilityCD_list, f, indent=2)
-        print("Dumped")
-        return
+        json_dump(firstAbilityCD_list, f, indent=2)
+    # same data, parsed once with every ability's numbers
+    god_index.build(godData, response_cache.patch_version)
+    god_index.save()
+    static_log.info("Dumped %d gods.", len(godData))
+    return
   
 def GodID ():
-    with open('gods_data_modified_NEW1.json', 'r') as GodFile:
-        godids_list = []
-        data = json.load(GodFile)
-        for item in data:
-        
-            godids=int(item["GodID"])
-            godids_list.append(godids)
-        print(godids_list)
-        print(godids_list[0])
+    godids_list = god_index.ids()
+    static_log.debug("God ids: %s", godids_list)
     return godids_list
 
 def Cooldowns(godname=None):
-        # Load the JSON file
-    with open('gods_data_modified_NEW1.json', 'r') as Godfile:
-        data = json.load(Godfile)
-
+    """
+    Returns a sentence with godname's first ability cooldown.
+    Without a godname, returns every god's first ability cooldown numbers (empty list when the cooldown has no number).
+    """
     if godname is None:
-        # Iterate through the dictionaries
-        for item in data:
-            cooldown = item['Cooldown']
-            
-            # Use a regular expression to match the numbers
-            match = re.findall(r'\d+\.\d+', cooldown) # <--------- Need to figure out what this does again
-            
-            if match:
-                # Extract the matched numbers
-                cooldown_numbers = [float(num) for num in match]
-                
-                # Remove the 's' suffix
-                #cooldown_numbers = [num[0] for num in cooldown_numbers]
-                
-                # Print the extracted numbers
-                print(cooldown_numbers)
-            else:
-                print("No number found in Cooldown")
-    else:
-        for item in data:
-            print (f'{str(item["Name"]).lower()} is the name from file. \t{str(godname).lower()} is the name from our input\n' )
-            if (str(item["Name"])).lower() == str(godname).lower():
-                cooldown = item['Cooldown']
-                print (cooldown)
-                match = re.findall(r'\d+\.\d+', cooldown)
-                if match:
-                    # Extract the matched numbers
-                    cooldown_numbers = [float(num) for num in match]
-                    
-                    # Remove the 's' suffix
-                    #cooldown_numbers = [num[0] for num in cooldown_numbers]
-                    
-                    # Print the extracted numbers
-                    return (f"{item['Name']}'s cooldown for their first ability is **{cooldown}!**")
-                elif cooldown == "":
-                    return (f"No number found in {godname}'s Cooldown.")
-                else: 
-                    return (f"{item['Name']}'s cooldown for their first ability is a flat **{cooldown}!**")
+        cooldowns = []
+        debug = static_log.isEnabledFor(logging.DEBUG)
+        for item in god_index.gods():
+            cooldown_numbers = list(item["Abilities"][0]["cooldown_values"])
+            cooldowns.append(cooldown_numbers)
+            if debug:
+                static_log.debug("%s: %s", item["Name"], cooldown_numbers or "No number found in Cooldown")
+        return cooldowns
+
+    item = god_index.lookup(godname)
+    if item is None:
         return ("God name is invalid.")
+    cooldown = item['Cooldown']
+    cooldown_numbers = item["Abilities"][0]["cooldown_values"]
+    if len(set(cooldown_numbers)) > 1:
+        return (f"{item['Name']}'s cooldown for their first ability is **{cooldown}!**")
+    elif cooldown == "":
+        return (f"No number found in {godname}'s Cooldown.")
+    else: 
+        return (f"{item['Name']}'s cooldown for their first ability is a flat **{cooldown}!**")
                     
+class GodAssetStore:
+    """
+    Index of god icon and card art urls, built from get_god_skins output and loaded once.
+    Lookups are dictionary hits by lowercase god name or god id, instead of reopening a json file per lookup.
+
+    Parameters:
+    - path (str): Json file the index is saved to/loaded from
+
+    Notes:
+    - Build it with extractGodURL(godSkinData) (or build() + save()), lookups load the file on first use
+    - Falls back to the old CARDART_FOR_{letter}_GODS.json files if the index file doesn't exist yet
+    """
+
+    def __init__(self, path='GOD_ASSETS.json'):
+        self.path = path
+        self._by_name = {}
+        self._by_id = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def build(self, godSkinData):
+        """
+        Indexes get_god_skins responses; a list of per-god lists (like extractGodURL takes) or one flat list of skins.
+        """
+        by_name = {}
+        by_id = {}
+        for skins in godSkinData:
+            if isinstance(skins, dict):
+                skins = [skins]
+            for skin in skins:
+                name = str(skin.get('god_name', ''))
+                if not name:
+                    continue
+                entry = by_name.get(name.lower())
+                if entry is None:
+                    entry = {"god_id" : skin.get('god_id'), "god_name" : name, "godIcon_URL" : skin.get('godIcon_URL') or "", "card_arts" : []}
+                    by_name[name.lower()] = entry
+                    if entry["god_id"] is not None:
+                        by_id[str(entry["god_id"])] = entry
+                if not entry["godIcon_URL"] and skin.get('godIcon_URL'):
+                    entry["godIcon_URL"] = skin['godIcon_URL']
+                if skin.get('godSkin_URL'):
+                    entry["card_arts"].append(skin['godSkin_URL'])
+        with self._lock:
+            self._by_name = by_name
+            self._by_id = by_id
+            self._loaded = True
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json_dump(list(self._by_name.values()), f, indent=2)
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json_load(f)
+            by_name = {str(entry["god_name"]).lower() : entry for entry in entries}
+            by_id = {str(entry["god_id"]) : entry for entry in entries if entry.get("god_id") is not None}
+            with self._lock:
+                self._by_name, self._by_id, self._loaded = by_name, by_id, True
+            return
+
+        legacy = []
+        for letter in string.ascii_uppercase:
+            try:
+                with open(f'CARDART_FOR_{letter}_GODS.json', 'r', encoding='utf-8') as f:
+                    legacy.append(json_load(f))
+            except (OSError, ValueError):
+                continue
+        self.build(legacy)
+
+    def lookup(self, god):
+        """
+        Returns the index entry for a god name (any case) or god id, None if it isn't known.
+        """
+        if not self._loaded:
+            self._load()
+        key = str(god).strip()
+        entry = self._by_id.get(key)
+        if entry is None:
+            entry = self._by_name.get(key.lower())
+        return entry
+
+    def icon_url(self, god):
+        entry = self.lookup(god)
+        if entry is None or not entry["godIcon_URL"]:
+            return "[No icon]"
+        return entry["godIcon_URL"]
+
+    def card_arts(self, god):
+        entry = self.lookup(god)
+        if entry is None:
+            return []
+        return list(entry["card_arts"])
+
+
+# shared index used by findingGodURL/findingGodCardArts
+god_asset_store = GodAssetStore()
+
+
 def findingGodURL(godname):
-    first_letter = str(godname[0]).upper()
-    with open(f'CARDART_FOR_{first_letter}_GODS.json', 'r') as GodIconFile:
-        data = json.load(GodIconFile)
-        for item in data:
-            print(item)
-            if (str(item["god_name"])).lower() == str(godname).lower():
-                return item["godIcon_URL"]
-        
-        return "[No icon]"
+    return god_asset_store.icon_url(godname)
     
 def findingGodCardArts(godname):
-    cardart_list = []
-    first_letter = str(godname[0]).upper()
-    with open(f'CARDART_FOR_{first_letter}_GODS.json', 'r') as CardArtFile:
-        data = json.load(CardArtFile)
-        for item in data:
-            print(item)
-            if (str(item["god_name"])).lower() == str(godname).lower():
-                if item["godSkin_URL"] != "":
-                    cardart = item["godSkin_URL"]
-                    cardart_list.append(cardart)
-        
-        return cardart_list
+    # Legendary/Diamond skins don't have card art urls, so they aren't in the list
+    return god_asset_store.card_arts(godname)
 
 def extractGodURL(godSkinData):
-    godlist = []
+    # one indexed file instead of 26 CARDART_FOR_{letter}_GODS.json files
     if len(godSkinData) != 0:
-        for letter in string.ascii_uppercase:
-            with open(f'CARDART_FOR_{letter}_GODS.json', 'w') as f:
-                for eachgod in godSkinData:
-                    for each_god_item in eachgod: # <--- Chatgpt did this line and it fixed everything
-                        #print (len(godSkinData))
-                        
-                        if (each_god_item['god_name'][0] == letter):
-                            godlist.append(each_god_item)
-                            #godSkinData.pop(-1)
-                            #print(f"popped, this is " + each_god_item['god_name'] +" "+ each_god_item['skin_name'] +" for the " + letter + " letter. \n")
-                        elif (godlist != []): #This conditional prevents extra [] in the output
-                            #print (f'About to Write in the {letter} Gods.\n')
-                            json.dump(godlist, f, indent=2)
-                            godlist = []
-                            print (f'Wrote in the {letter} Gods.\n')
-                        if len(godSkinData) == 0: #I dont even think this part runs ever
-
-                        #if eachgod == godSkinData[-1]:
-                            # json.dump(godlist, f, indent=2)
-                            # print (f'Wrote in the {letter} Gods. Super Done.\n')
-                            # print(eachgod)
-                            # print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-                            # print(godSkinData[-1])
-                            return
-                    #godSkinData.pop(-1)
-                #print (f'This is in the {letter} Gods.\n') 
-                if (letter == 'Z'):
-                    json.dump(godlist, f, indent=2)
-
-                # Write the gods data to the file
-            
-                # json.dump(godSkinData, f, indent=2)
-                # print("Dumped2")
+        god_asset_store.build(godSkinData)
+        god_asset_store.save()
     return
 
 
-
 if __name__ == '__main__':
 
     # sessionId = valid_session_check()
@@ -1968,7 +5236,8 @@ if __name__ == '__main__':
     # extractGodData(godDataAPI)
     # OurGodID = GodID()
 
-    # #godSkinAPI = GodSkins(sessionId, OurGodID)
+    # #godSkinAPI = []
+    # #fetch_all_god_skins(lambda god_id, skins: godSkinAPI.append(skins), god_ids=OurGodID)
     # #extractGodURL (godSkinAPI)
 
     # MyData(sessionId)
@@ -1996,8 +5265,8 @@ if __name__ == '__main__':
     #     json.dump(info, newfile, indent=4)
     wow = get_match_details(match_id='1363671177')
     #print (wow)
-    with open('getmatchtest_june15.json', 'w') as newfile:
-        json.dump(wow, newfile, indent=4)
+    with open('getmatchtest_june15.json', 'w', encoding='utf-8') as newfile:
+        json_dump(wow, newfile, indent=4)
     # info = get_motd()
     #info = MyData()
     # list123 = []
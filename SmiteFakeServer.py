@@ -0,0 +1,527 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+from SmiteDataAPIFrame import MATCH_PLAYER_FIELDS, PLAYER_PROFILE_FIELDS, QUEUE_STAT_FIELDS
+
+
+##############################################################################
+############################ Fake HiRez Server ###############################
+##############################################################################
+
+# fail_next() kinds, same wording HiRez uses so _failure_kind() classifies them the same way
+FAULT_SERVER = 'server'         # 500
+FAULT_CLIENT = 'client'         # 404
+FAULT_RATE_LIMIT = 'rate_limit' # 429
+FAULT_SESSION = 'session'       # [{"ret_msg": "Invalid session id."}]
+FAULT_DAILY = 'daily'           # [{"ret_msg": "Daily request limit reached"}]
+FAULT_GARBAGE = 'garbage'       # 200 with a body that isn't json
+FAULTS = (FAULT_SERVER, FAULT_CLIENT, FAULT_RATE_LIMIT, FAULT_SESSION, FAULT_DAILY, FAULT_GARBAGE)
+
+GOD_NAMES = ('Achilles', 'Agni', 'Ah Muzen Cab', 'Ah Puch', 'Amaterasu', 'Anhur', 'Anubis', 'Ao Kuang', 'Aphrodite', 'Apollo',
+             'Arachne', 'Ares', 'Artemis', 'Artio', 'Athena', 'Awilix', 'Bacchus', 'Bakasura', 'Baron Samedi', 'Bastet',
+             'Bellona', 'Cabrakan', 'Camazotz', 'Cerberus', 'Cernunnos', 'Chaac', "Chang'e", 'Chernobog', 'Chiron', 'Chronos',
+             'Cthulhu', 'Cu Chulainn', 'Cupid', 'Da Ji', 'Danzaburou', 'Discordia', 'Erlang Shen', 'Eset', 'Fafnir', 'Fenrir',
+             'Freya', 'Ganesha', 'Geb', 'Gilgamesh', 'Guan Yu', 'Hachiman', 'Hades', 'He Bo', 'Heimdallr', 'Hel',
+             'Hera', 'Hercules', 'Horus', 'Hou Yi', 'Hun Batz', 'Ishtar', 'Izanami', 'Janus', 'Jing Wei', 'Jormungandr',
+             'Kali', 'Khepri', 'King Arthur', 'Kukulkan', 'Kumbhakarna', 'Kuzenbo', 'Lancelot', 'Loki', 'Maman Brigitte', 'Martichoras',
+             'Maui', 'Medusa', 'Mercury', 'Merlin', 'Morgan Le Fay', 'Mulan', 'Ne Zha', 'Neith', 'Nemesis', 'Nike',
+             'Nox', 'Nu Wa', 'Odin', 'Olorun', 'Osiris', 'Pele', 'Persephone', 'Poseidon', 'Ra', 'Raijin',
+             'Rama', 'Ratatoskr', 'Ravana', 'Scylla', 'Serqet', 'Set', 'Shiva', 'Skadi', 'Sobek', 'Sol',
+             'Sun Wukong', 'Surtr', 'Susano', 'Sylvanus', 'Terra', 'Thanatos', 'The Morrigan', 'Thor', 'Thoth', 'Tiamat',
+             'Tsukuyomi', 'Tyr', 'Ullr', 'Vamana', 'Vulcan', 'Xbalanque', 'Xing Tian', 'Yemoja', 'Ymir', 'Yu Huang',
+             'Zeus', 'Zhong Kui')
+
+
+def _md5(text):
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+class FakeHiRezServer:
+    """
+    Local stand-in for the HiRez api, speaks the url scheme general_API_url() builds so the library can run offline.
+
+    Parameters:
+    - host (str): Interface to listen on
+    - port (int): Port to listen on, 0 picks a free one (see base_url)
+    - fixtures_dir (str): Folder of recorded responses, '{method}/{params}.json' or '{method}.json' (any params)
+    - latency (float): Seconds every request takes before it's answered
+    - jitter (float): Extra random latency, up to this many seconds
+    - error_rate (float): Share of requests (0-1) answered with a 500
+    - session_length (int): Seconds a session stays valid, after that requests get "Invalid session id."
+    - daily_limit (int): Requests per devId before "Daily request limit reached", None for no limit
+    - credentials (dict): {devId : authKey}, when given signatures are checked like HiRez does
+    - record_from (str): Real api url; every request is forwarded there and the answers saved to fixtures_dir (replay them later without it)
+    - players_per_match (int): Players in every synthetic match
+    - seed (int): Seed for the synthetic data, the same seed always gives the same answers
+
+    Usage:
+    - with FakeHiRezServer(latency=0.05) as server:
+          SmiteDataAPIFrame.set_base_url(server.base_url)
+          SmiteDataAPIFrame.get_match_details(match_id=1234)
+
+    Notes:
+    - Anything without a fixture gets synthetic data (matches, gods, items, skins, players, ...), ret_msg is always set
+    - fail_next() queues exact faults for the next requests, on top of error_rate
+    - Request counts per method are in .stats, reset them with reset_stats()
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, fixtures_dir=None, latency=0.0, jitter=0.0, error_rate=0.0,
+                 session_length=15 * 60, daily_limit=None, credentials=None, record_from=None, players_per_match=10, seed=0):
+        self.host = host
+        self.port = port
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.session_length = session_length
+        self.daily_limit = daily_limit
+        self.credentials = {str(dev_id) : str(key) for dev_id, key in (credentials or {}).items()}
+        self.record_from = record_from if record_from is None or record_from.endswith('/') else record_from + '/'
+        self.players_per_match = players_per_match
+        self.seed = seed
+        self.stats = Counter()
+        self._faults = []
+        self._sessions = {}
+        self._requests_by_dev = Counter()
+        self._bodies = {}
+        self._templates = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """
+        Url to hand to set_base_url()/SmiteHTTPClient, ex. 'http://127.0.0.1:8080/smiteapi.svc/'
+        """
+        return f'http://{self.host}:{self.port}/smiteapi.svc/'
+
+    def start(self):
+        """
+        Starts serving on a background thread, returns self.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def fail_next(self, *kinds):
+        """
+        Makes the next requests (not createsession/ping) fail, one fault per request in order.
+
+        Parameters:
+        - kinds (str): FAULT_SERVER, FAULT_CLIENT, FAULT_RATE_LIMIT, FAULT_SESSION, FAULT_DAILY or FAULT_GARBAGE
+        """
+        for kind in kinds:
+            if kind not in FAULTS:
+                raise ValueError(f"Unknown fault {kind!r}, expected one of {FAULTS}")
+        with self._lock:
+            self._faults.extend(kinds)
+
+    def expire_sessions(self):
+        """
+        Kills every session right away, like HiRez does on a server restart.
+        """
+        with self._lock:
+            self._sessions.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats.clear()
+
+    # request handling
+
+    def handle(self, path):
+        """
+        Answers one GET path, returns (status, body bytes).
+        """
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        # everything up to '{method}json' is the base url's path (ex. smiteapi.svc)
+        for index, part in enumerate(parts):
+            if part.lower().endswith('json'):
+                parts = parts[index:]
+                break
+        else:
+            return 404, b'Endpoint not found.'
+        # signatures are made with the method as the client wrote it, stats/fixtures use lower case
+        signed_method = parts[0][:-len('json')]
+        method = signed_method.lower()
+        with self._lock:
+            self.stats[method] += 1
+
+        if self.record_from is not None:
+            # recording: the real api answers (and checks sessions/signatures), its answers become the fixtures
+            return self._record(method, None if method in ('ping', 'createsession') else parts[5:], '/'.join(parts))
+
+        self._sleep()
+        if method == 'ping':
+            return 200, json.dumps(f"Smite API (ver 5.0.0.0) [PATCH - 10.1] - Ping successful. Server Date:{time.strftime('%m/%d/%Y %I:%M:%S %p', time.gmtime())}").encode('utf-8')
+
+        if method == 'createsession':
+            if len(parts) < 4:
+                return 404, b'Endpoint not found.'
+            dev_id, signature, timestamp = parts[1], parts[2], parts[3]
+            refused = self._check_signature(dev_id, signed_method, signature, timestamp)
+            if refused:
+                return 200, json.dumps({"ret_msg" : refused, "session_id" : "", "timestamp" : timestamp}).encode('utf-8')
+            session_id = _md5(f"{dev_id}{time.time()}{self._random.random()}").upper()
+            with self._lock:
+                self._sessions[session_id] = (dev_id, time.time())
+            return 200, json.dumps({"ret_msg" : "Approved", "session_id" : session_id, "timestamp" : time.strftime('%m/%d/%Y %I:%M:%S %p', time.gmtime())}).encode('utf-8')
+
+        if len(parts) < 5:
+            return 404, b'Endpoint not found.'
+        dev_id, signature, session_id, timestamp, params = parts[1], parts[2], parts[3], parts[4], parts[5:]
+
+        fault = self._next_fault()
+        if fault is not None:
+            return self._fault_response(fault)
+        refused = self._check_signature(dev_id, signed_method, signature, timestamp)
+        if refused:
+            return 200, json.dumps([{"ret_msg" : refused}]).encode('utf-8')
+        over_limit = False
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session[0] != dev_id or time.time() - session[1] >= self.session_length:
+                self._sessions.pop(session_id, None)
+                session = None
+            else:
+                self._requests_by_dev[dev_id] += 1
+                over_limit = self.daily_limit is not None and self._requests_by_dev[dev_id] > self.daily_limit
+        if session is None:
+            return self._fault_response(FAULT_SESSION)
+        if over_limit:
+            return self._fault_response(FAULT_DAILY)
+
+        body = self._fixture(method, params)
+        if body is None:
+            body = self._synthetic_body(method, params)
+        return 200, body
+
+    def _synthetic_body(self, method, params):
+        # synthetic data is deterministic, so the encoded bodies are kept and the server's own cost stays out of benchmarks
+        key = (method, tuple(params))
+        body = self._bodies.get(key)
+        if body is None:
+            body = json.dumps(self.synthetic(method, params)).encode('utf-8')
+            if method not in ('getdataused', 'gethirezserverstatus', 'testsession'):
+                with self._lock:
+                    if len(self._bodies) >= 50000:
+                        self._bodies.clear()
+                    self._bodies[key] = body
+        return body
+
+    def _sleep(self):
+        delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _next_fault(self):
+        with self._lock:
+            if self._faults:
+                return self._faults.pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return FAULT_SERVER
+        return None
+
+    @staticmethod
+    def _fault_response(kind):
+        if kind == FAULT_SERVER:
+            return 500, b'{"Message":"An error has occurred."}'
+        if kind == FAULT_CLIENT:
+            return 404, b'Endpoint not found.'
+        if kind == FAULT_RATE_LIMIT:
+            return 429, b'Too many requests.'
+        if kind == FAULT_SESSION:
+            return 200, json.dumps([{"ret_msg" : "Invalid session id."}]).encode('utf-8')
+        if kind == FAULT_DAILY:
+            return 200, json.dumps([{"ret_msg" : "Daily request limit reached"}]).encode('utf-8')
+        return 200, b'<html>Service Unavailable</html>'
+
+    def _check_signature(self, dev_id, method, signature, timestamp):
+        # returns the refusal ret_msg, or None if the request is signed fine (or signatures aren't checked)
+        if not self.credentials:
+            return None
+        key = self.credentials.get(dev_id)
+        if key is None:
+            return f"Invalid developer id: {dev_id}"
+        if _md5(f"{dev_id}{method}{key}{timestamp}") != signature.lower():
+            return "Invalid signature. Your session may be expired"
+        return None
+
+    # fixtures
+
+    def _fixture_paths(self, method, params):
+        # most specific first
+        if params:
+            yield os.path.join(self.fixtures_dir, method, '_'.join(params).replace(',', '-') + '.json')
+        yield os.path.join(self.fixtures_dir, method + '.json')
+
+    def _fixture(self, method, params):
+        if self.fixtures_dir is None:
+            return None
+        for path in self._fixture_paths(method, params):
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+        return None
+
+    def _record(self, method, params, path):
+        # the client already signed the url, so it's sent to the real api as is; params is None for unsaved calls
+        try:
+            response = requests.get(self.record_from + path, timeout=30)
+        except requests.RequestException:
+            return 502, b'Recording upstream failed.'
+        if response.status_code == 200 and params is not None and self.fixtures_dir is not None:
+            fixture = next(self._fixture_paths(method, params))
+            os.makedirs(os.path.dirname(fixture), exist_ok=True)
+            with open(fixture, 'wb') as f:
+                f.write(response.content)
+        return response.status_code, response.content
+
+    # synthetic data
+
+    def _rng(self, *key):
+        # same key, same data, no matter how many requests came before
+        return random.Random(_md5(f"{self.seed}:{key}"))
+
+    def synthetic(self, method, params):
+        """
+        Returns made up (but correctly shaped) data for method, what's served when there's no fixture.
+        """
+        generate = getattr(self, '_synthetic_' + method, None)
+        if generate is None:
+            return [{"ret_msg" : None}]
+        return generate(*params)
+
+    def _row_templates(self):
+        # a fixed set of fully random player rows, matches are built from copies so big batches stay cheap to make
+        if self._templates is None:
+            rng = self._rng('templates')
+            templates = []
+            for number in range(64):
+                row = {}
+                for attribute, key, kind in MATCH_PLAYER_FIELDS:
+                    if kind is int:
+                        row[key] = rng.randint(0, 30000)
+                    elif kind is float:
+                        row[key] = round(rng.random() * 100, 2)
+                    else:
+                        row[key] = f"{attribute}_{rng.randint(0, 999)}"
+                templates.append(row)
+            self._templates = templates
+        return self._templates
+
+    def _synthetic_match_rows(self, match_id):
+        rng = self._rng('match', match_id)
+        queue = rng.choice((426, 435, 448, 451, 450, 440))
+        duration = rng.randint(900, 2700)
+        templates = self._row_templates()
+        rows = []
+        for slot in range(self.players_per_match):
+            row = dict(rng.choice(templates))
+            row.update({"Match" : int(match_id), "match_queue_id" : queue, "Match_Duration" : duration, "Minutes" : duration // 60,
+                        "Time_In_Match_Seconds" : duration, "TaskForce" : 1 + slot % 2, "Win_Status" : "Winner" if slot % 2 == 0 else "Loser",
+                        "playerId" : rng.randint(1000000, 999999999), "playerName" : f"Player{match_id}_{slot}",
+                        "Reference_Name" : rng.choice(GOD_NAMES), "Entry_Datetime" : time.strftime('%m/%d/%Y %I:%M:%S %p', time.gmtime(1.6e9 + int(match_id) % 10**8)),
+                        "ret_msg" : None})
+            rows.append(row)
+        return rows
+
+    def _synthetic_getmatchdetails(self, match_id='0', *params):
+        return self._synthetic_match_rows(match_id)
+
+    def _synthetic_getmatchdetailsbatch(self, match_ids='', *params):
+        return [row for match_id in match_ids.split(',') if match_id for row in self._synthetic_match_rows(match_id)]
+
+    def _synthetic_getmatchidsbyqueue(self, queue='426', date='20240101', hour='-1', *params):
+        rng = self._rng('queue', queue, date, hour)
+        count = rng.randint(200, 400) if hour == '-1' else rng.randint(10, 30)
+        # every 10 minute window ("h,mm") has its own ids, window 0 is the whole day
+        window = 0
+        if hour != '-1':
+            hours, _, minutes = hour.partition(',')
+            window = 1 + int(hours) * 6 + int(minutes or 0) // 10
+        base = (int(date) % 10**6 * 1000 + int(queue) % 1000) * 1000 + window
+        return [{"Active_Flag" : "n", "Match" : str(base * 1000 + number), "ret_msg" : None} for number in range(count)]
+
+    def _synthetic_getgods(self, language_code='1', *params):
+        gods = []
+        for number, name in enumerate(GOD_NAMES):
+            rng = self._rng('god', name)
+            god = {"Name" : name, "id" : 1000 + number, "Pantheon" : rng.choice(('Greek', 'Norse', 'Egyptian', 'Chinese', 'Hindu')),
+                   "Roles" : rng.choice(('Mage', 'Warrior', 'Hunter', 'Assassin', 'Guardian')), "Title" : f"title {language_code}",
+                   "godIcon_URL" : f"https://webcdn.hirezstudios.com/smite/god-icons/{name.lower().replace(' ', '-')}.jpg",
+                   "godCard_URL" : f"https://webcdn.hirezstudios.com/smite/god-cards/{name.lower().replace(' ', '-')}.jpg",
+                   "Lore" : "x" * rng.randint(500, 2000), "ret_msg" : None}
+            for ability in range(1, 6):
+                cooldowns = '/'.join(str(max(1, rng.randint(8, 18) - rank)) for rank in range(5)) + 's'
+                god[f"Ability_{ability}"] = {"Id" : god["id"] * 10 + ability, "Summary" : f"{name} Ability {ability}", "Description" : {"itemDescription" : {
+                    "cooldown" : cooldowns, "cost" : '/'.join(str(50 + 5 * rank) for rank in range(5)),
+                    "description" : "y" * rng.randint(100, 400),
+                    "rankitems" : [{"description" : "Damage:", "value" : '/'.join(str(60 + 40 * rank) for rank in range(5)) + " (+60% of your Magical Power)"},
+                                   {"description" : "Radius:", "value" : "20 units"}]}}}
+            gods.append(god)
+        return gods
+
+    def _synthetic_getitems(self, language_code='1', *params):
+        items = []
+        for number in range(250):
+            rng = self._rng('item', number)
+            items.append({"ItemId" : 7000 + number, "DeviceName" : f"Item {number}", "Price" : rng.randint(0, 3000), "ItemTier" : rng.randint(1, 4),
+                          "ActiveFlag" : "y", "Type" : "Item", "ItemDescription" : {"Description" : "z" * rng.randint(50, 300), "Menuitems" : [
+                              {"Description" : "Physical Power", "Value" : f"+{rng.randint(10, 60)}"}], "SecondaryDescription" : ""}, "ret_msg" : None})
+        return items
+
+    def _synthetic_getgodskins(self, god_id='1000', language_code='1', *params):
+        index = int(god_id) - 1000
+        name = GOD_NAMES[index] if 0 <= index < len(GOD_NAMES) else f"God {god_id}"
+        slug = name.lower().replace(' ', '-')
+        return [{"god_id" : int(god_id), "god_name" : name, "skin_id1" : number, "skin_name" : f"Skin {number}", "obtainability" : "Normal",
+                 "price_favor" : 0, "price_gems" : 300 * number, "godIcon_URL" : f"https://webcdn.hirezstudios.com/smite/god-icons/{slug}.jpg",
+                 "godSkin_URL" : f"https://webcdn.hirezstudios.com/smite/god-skins/{slug}_skin-{number}.jpg", "ret_msg" : None} for number in range(4)]
+
+    def _synthetic_getgodaltabilities(self, language_code='1', *params):
+        return [{"god_id" : 1000 + number, "god_name" : name, "alt_name" : f"{name} Alt", "item_id" : 9000 + number, "ret_msg" : None} for number, name in enumerate(GOD_NAMES[:20])]
+
+    def _synthetic_getgodrecommendeditems(self, god_id='1000', language_code='1', *params):
+        return [{"God_Id" : int(god_id), "Item_Id" : 7000 + number, "Item" : f"Item {number}", "Role" : "Standard", "ret_msg" : None} for number in range(8)]
+
+    def _synthetic_getpatchinfo(self, *params):
+        return {"version_string" : "10.1", "ret_msg" : None}
+
+    def _synthetic_getdataused(self, *params):
+        return [{"Active_Sessions" : len(self._sessions), "Concurrent_Sessions" : 50, "Request_Limit_Daily" : self.daily_limit or 7500,
+                 "Session_Cap" : 500, "Session_Time_Limit" : self.session_length // 60, "Total_Requests_Today" : sum(self._requests_by_dev.values()),
+                 "Total_Sessions_Today" : len(self._sessions), "ret_msg" : None}]
+
+    def _player_id(self, name):
+        return int(_md5(str(name).lower())[:7], 16)
+
+    def _synthetic_getplayeridbyname(self, player_name='', *params):
+        return [{"player_id" : self._player_id(player_name), "portal" : "Steam", "portal_id" : "5", "privacy_flag" : "n", "ret_msg" : None}]
+
+    def _synthetic_getplayeridsbygamertag(self, portal_id='1', gamer_tag='', *params):
+        return [{"player_id" : self._player_id(gamer_tag), "portal" : "Hi-Rez", "portal_id" : str(portal_id), "privacy_flag" : "n", "ret_msg" : None}]
+
+    def _synthetic_getplayeridbyportaluserid(self, portal_id='1', portal_user_id='', *params):
+        return [{"player_id" : self._player_id(portal_user_id), "portal" : "Hi-Rez", "portal_id" : str(portal_id), "privacy_flag" : "n", "ret_msg" : None}]
+
+    def _synthetic_profile(self, player):
+        rng = self._rng('player', player)
+        profile = {}
+        for attribute, key, kind in PLAYER_PROFILE_FIELDS:
+            profile[key] = rng.randint(0, 5000) if kind is int else round(rng.random() * 3000, 2) if kind is float else f"{attribute}_{rng.randint(0, 99)}"
+        player_id = int(player) if str(player).isdigit() else self._player_id(player)
+        profile.update({"Id" : player_id, "ActivePlayerId" : player_id, "Name" : str(player) if not str(player).isdigit() else f"Player{player}", "ret_msg" : None})
+        return profile
+
+    def _synthetic_getplayer(self, player='', *params):
+        return [self._synthetic_profile(player)]
+
+    def _synthetic_getplayerbatch(self, player_ids='', *params):
+        return [self._synthetic_profile(player_id) for player_id in player_ids.split(',') if player_id]
+
+    def _synthetic_getplayerstatus(self, player_id='0', *params):
+        rng = self._rng('status', player_id)
+        status = rng.randint(0, 5)
+        return [{"Match" : rng.randint(10**9, 2 * 10**9) if status == 3 else 0, "match_queue_id" : 426 if status == 3 else 0,
+                 "personal_status_message" : "", "status" : status, "status_string" : ("Offline", "In Lobby", "god Selection", "In Game", "Online", "Unknown")[status],
+                 "ret_msg" : None}]
+
+    def _synthetic_getqueuestats(self, player_id='0', queue='426', *params):
+        rows = []
+        for number in range(self._rng('queuestats', player_id, queue).randint(3, 12)):
+            rng = self._rng('queuestat', player_id, queue, number)
+            row = {key : rng.randint(0, 500) if kind is int else round(rng.random() * 100, 2) if kind is float else f"{attribute}_{rng.randint(0, 99)}"
+                   for attribute, key, kind in QUEUE_STAT_FIELDS}
+            row.update({"player_id" : int(player_id) if str(player_id).isdigit() else 0, "Queue" : str(queue), "God" : GOD_NAMES[number], "GodId" : 1000 + number, "ret_msg" : None})
+            rows.append(row)
+        return rows
+
+    def _synthetic_getmatchhistory(self, player_id='0', *params):
+        rng = self._rng('history', player_id)
+        return [{"Match" : rng.randint(10**9, 2 * 10**9), "God" : rng.choice(GOD_NAMES), "Win_Status" : rng.choice(("Win", "Loss")),
+                 "playerId" : int(player_id) if str(player_id).isdigit() else 0, "ret_msg" : None} for number in range(50)]
+
+    def _synthetic_gethirezserverstatus(self, *params):
+        return [{"entry_datetime" : time.strftime('%m/%d/%Y %I:%M:%S %p', time.gmtime()), "environment" : "live", "limited_access" : False,
+                 "platform" : platform, "status" : "UP", "version" : "10.1", "ret_msg" : None} for platform in ("pc", "xbox", "ps4", "switch", "epic")]
+
+    def _synthetic_testsession(self, *params):
+        return "This was a successful test with the following parameters added: developer: fake time: " + time.strftime('%m/%d/%Y %I:%M:%S %p', time.gmtime())
+
+
+def _make_handler(server):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # headers and body go out in separate writes, without this delayed acks add ~40ms to every keep-alive request
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            status, body = server.handle(self.path)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # quiet, the counts are in server.stats
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake HiRez api for offline testing/benchmarking of SmiteDataAPIFrame.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--fixtures', default=None, help="folder of recorded responses ('{method}/{params}.json' or '{method}.json')")
+    parser.add_argument('--record', default=None, metavar='API_URL', help="forward every request to this api and save the answers to --fixtures")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random extra latency, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests (0-1) answered with a 500")
+    parser.add_argument('--session-length', type=int, default=15 * 60, help="seconds a session stays valid")
+    parser.add_argument('--daily-limit', type=int, default=None, help="requests per devId before 'Daily request limit reached'")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeHiRezServer(host=args.host, port=args.port, fixtures_dir=args.fixtures, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, session_length=args.session_length, daily_limit=args.daily_limit,
+                             record_from=args.record, seed=args.seed).start()
+    print(f"Fake HiRez api on {server.base_url} (SMITE_API_URL={server.base_url}), ctrl+c to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
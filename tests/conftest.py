@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+# the modules live in the repo root, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import SmiteDataAPIFrame as smite
+from SmiteFakeServer import FakeHiRezServer
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """
+    A FakeHiRezServer every endpoint points at, with sessions/cache/checkpoints in tmp_path,
+    no rate limit, no backoff waits and test keys.
+    """
+    monkeypatch.chdir(tmp_path)
+    fake = FakeHiRezServer().start()
+    monkeypatch.setattr(smite, 'devId', 1000)
+    monkeypatch.setattr(smite, 'authKey', 'TESTKEY')
+    monkeypatch.setattr(smite, 'http_client', smite.SmiteHTTPClient(base_url=fake.base_url))
+    monkeypatch.setattr(smite, 'rate_limiter', smite.RateLimiter(requests_per_second=None, daily_requests=10**6,
+                                                                   daily_sessions=10**6, concurrent_sessions=10**6))
+    monkeypatch.setattr(smite, 'session_manager', smite.SessionManager(str(tmp_path / 'CurrentSessionID.txt'), str(tmp_path / 'timestamp.txt')))
+    monkeypatch.setattr(smite, 'response_cache', smite.ResponseCache(str(tmp_path / 'cache.sqlite3'), enabled=False))
+    monkeypatch.setattr(smite, 'retry_policy', smite.RetryPolicy(max_attempts=4, base_delay=0, max_delay=0))
+    monkeypatch.setattr(smite, 'static_data', smite.StaticDataManager(root=str(tmp_path / 'static_data')))
+    monkeypatch.setattr(smite, 'credential_pool', None)
+    monkeypatch.setattr(smite, '_metrics_sinks', [])
+    yield fake
+    fake.stop()
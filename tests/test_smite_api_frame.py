@@ -0,0 +1,364 @@
+import asyncio
+import json
+import random
+import threading
+
+import pytest
+
+import SmiteDataAPIFrame as smite
+from SmiteFakeServer import FAULT_CLIENT, FAULT_DAILY, FAULT_GARBAGE, FAULT_RATE_LIMIT, FAULT_SERVER, FAULT_SESSION
+
+
+##############################################################################
+############################ Retries & Sessions ##############################
+##############################################################################
+
+def test_retries_server_faults(server):
+    server.fail_next(FAULT_SERVER, FAULT_RATE_LIMIT, FAULT_GARBAGE)
+    data = smite.get_player_status(player_id=5)
+    assert data[0]["ret_msg"] is None
+    assert server.stats["getplayerstatus"] == 4
+
+
+def test_client_error_is_not_retried(server):
+    server.fail_next(FAULT_CLIENT)
+    with pytest.raises(smite.SmiteRequestError) as error:
+        smite.get_player_status(player_id=5)
+    assert error.value.status_code == 404
+    assert server.stats["getplayerstatus"] == 1
+
+
+def test_retries_run_out(server):
+    server.fail_next(*[FAULT_SERVER] * smite.retry_policy.max_attempts)
+    with pytest.raises(smite.SmiteRequestError) as error:
+        smite.get_player_status(player_id=5)
+    assert error.value.attempts == smite.retry_policy.max_attempts
+
+
+def test_session_renewal(server):
+    smite.get_player_status(player_id=5)
+    first_session = smite.session_manager.session_id
+    server.fail_next(FAULT_SESSION)
+    assert smite.get_player_status(player_id=6)[0]["ret_msg"] is None
+    assert server.stats["createsession"] == 2
+    assert smite.session_manager.session_id != first_session
+
+
+def test_concurrent_session_expiry_renews_once(server):
+    smite.get_player_status(player_id=1)
+    server.expire_sessions()
+    server.latency = 0.1
+    # every thread gets the dead session back, only the first one may throw the renewed session away
+    threads = [threading.Thread(target=smite.get_player_status, kwargs={"player_id" : number}) for number in range(2, 18)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.stats["createsession"] == 2
+    assert server.stats["getplayerstatus"] == 1 + 2 * 16
+
+
+def test_createsession_garbage_is_retried(server, monkeypatch):
+    bodies = [b'<html>Service Unavailable</html>', b'[]']
+    handle = server.handle
+
+    def broken_createsession(path):
+        if 'createsessionjson' in path.lower() and bodies:
+            return 200, bodies.pop(0)
+        return handle(path)
+
+    monkeypatch.setattr(server, 'handle', broken_createsession)
+    assert smite.get_player_status(player_id=5)[0]["ret_msg"] is None
+    # both broken bodies were used up, then the real createsession ran
+    assert not bodies and server.stats["createsession"] == 1
+
+
+def test_daily_limit_without_pool(server):
+    server.fail_next(FAULT_DAILY)
+    with pytest.raises(smite.QuotaExceededError):
+        smite.get_player_status(player_id=5)
+
+
+def test_pool_failover_on_daily_limit(server, monkeypatch):
+    pool = smite.CredentialPool([(1001, 'KEY1'), (1002, 'KEY2')], strategy='round_robin')
+    for credential in pool.credentials:
+        credential.rate_limiter.requests_per_second = None
+    monkeypatch.setattr(smite, 'credential_pool', pool)
+    server.fail_next(FAULT_DAILY)
+    assert smite.get_player_status(player_id=5)[0]["ret_msg"] is None
+    assert [credential.available() for credential in pool.credentials].count(False) == 1
+
+
+def test_credential_gets_its_own_session(server, monkeypatch):
+    credential = smite.Credential(1001, 'KEY1', rate_limiter=smite.RateLimiter(requests_per_second=None))
+    assert credential.session_manager is not smite.session_manager
+    assert credential.session_manager.session_file == 'CurrentSessionID_1001.txt'
+    assert smite.Credential(1002, 'KEY2').rate_limiter is not smite.rate_limiter
+    # PersonalKeys still go through the module's session and budget
+    assert smite.Credential().session_manager is smite.session_manager
+
+    monkeypatch.setattr(smite, 'credential_pool', smite.CredentialPool([credential]))
+    smite.get_player_status(player_id=5)
+    assert credential.session_manager.is_valid()
+    assert smite.session_manager.session_id is None
+
+
+def test_pool_skips_keys_out_of_sessions(server, monkeypatch):
+    # least_used prefers the first key (bigger budget) until it can't open a session
+    first = smite.Credential(1001, 'KEY1', rate_limiter=smite.RateLimiter(requests_per_second=None, daily_requests=10**6, daily_sessions=1))
+    second = smite.Credential(1002, 'KEY2', rate_limiter=smite.RateLimiter(requests_per_second=None, daily_requests=1000))
+    pool = smite.CredentialPool([first, second])
+    monkeypatch.setattr(smite, 'credential_pool', pool)
+    smite.get_player_status(player_id=5)
+    assert first.requests == 1 and second.requests == 0
+
+    # its only session dies, the renewal hits the session budget and the request moves to the second key
+    server.fail_next(FAULT_SESSION)
+    assert smite.get_player_status(player_id=6)[0]["ret_msg"] is None
+    assert second.requests == 1
+    assert pool.pick() is second
+    # out of sessions isn't out of requests
+    assert first.rate_limiter.remaining()["requests_remaining"] > 0
+
+
+def test_missing_keys(server, monkeypatch):
+    monkeypatch.setattr(smite, 'devId', None)
+    monkeypatch.setattr(smite, 'authKey', None)
+    with pytest.raises(smite.SmiteAPIError, match="devId/authKey"):
+        smite.get_player(player_name="x")
+
+
+def test_single_flight(server):
+    server.latency = 0.2
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(smite.get_player_status(player_id=7))) for number in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 5 and all(result == results[0] for result in results)
+    assert server.stats["getplayerstatus"] == 1
+
+
+def test_stream_retries_before_first_element(server):
+    match_ids = list(range(1000, 1025))
+    expected = smite.get_match_details_BATCH(match_id_list=match_ids)
+    server.fail_next(FAULT_SERVER, FAULT_SESSION)
+    assert list(smite.stream_match_details_BATCH(match_ids)) == expected
+
+
+@pytest.mark.skipif(smite.aiohttp is None, reason="aiohttp isn't installed")
+def test_async_retries(server):
+    async def call():
+        async with smite.AsyncSmiteClient() as client:
+            return await client.get_player_status(player_id=5)
+
+    server.fail_next(FAULT_SERVER, FAULT_GARBAGE, FAULT_SESSION)
+    assert asyncio.run(call())[0]["ret_msg"] is None
+    assert server.stats["getplayerstatus"] == 4
+
+
+def test_metrics_sink(server):
+    counter = smite.add_metrics_sink(smite.MetricsCounter())
+    server.fail_next(FAULT_SERVER)
+    smite.get_player_status(player_id=5)
+    requests = counter.snapshot()["requests"]["getplayerstatus"]
+    assert requests["requests"] == 2 and requests["retries"] == 1
+    assert requests["failures"] == {"server" : 1}
+    assert 'smite_requests_total{method="getplayerstatus",status="500"} 1' in counter.prometheus()
+
+
+##############################################################################
+################################ Streaming ###################################
+##############################################################################
+
+def _random_json(rng, depth=0):
+    kind = rng.randrange(7 if depth < 3 else 5)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return round(rng.uniform(-1000, 1000), 3)
+    if kind == 2:
+        return rng.choice(['', 'a', 'quote " and \\ backslash', 'brackets ] } [ {', 'comma, colon:', 'é中'])
+    if kind == 3:
+        return rng.choice([True, False, None])
+    if kind == 4:
+        return 'x' * rng.randint(0, 40)
+    if kind == 5:
+        return [_random_json(rng, depth + 1) for number in range(rng.randint(0, 4))]
+    return {f'key{number}' : _random_json(rng, depth + 1) for number in range(rng.randint(0, 4))}
+
+
+def _chunks(body, rng):
+    position = 0
+    while position < len(body):
+        size = rng.randint(1, 7)
+        yield body[position:position + size]
+        position += size
+
+
+def test_iter_json_array_small_chunks():
+    rng = random.Random(0)
+    for number in range(300):
+        values = [_random_json(rng) for count in range(rng.randint(0, 6))]
+        body = json.dumps(values, indent=rng.choice([None, 1])).encode('utf-8')
+        assert list(smite.iter_json_array(_chunks(body, rng))) == values
+
+
+def test_iter_json_array_truncated():
+    with pytest.raises(ValueError):
+        list(smite.iter_json_array([b'[{"a": 1}, {"b": ', b'-1500.']))
+
+
+##############################################################################
+############################## Response Cache ################################
+##############################################################################
+
+def test_patch_cache_entries_expire(tmp_path):
+    cache = smite.ResponseCache(str(tmp_path / 'cache.sqlite3'))
+    cache.set_patch_version('10.1')
+    cache.set('get_gods:{}', [{"id" : 1}], smite.CACHE_PATCH)
+    assert cache.get('get_gods:{}', smite.CACHE_PATCH) == [{"id" : 1}]
+    # still the current patch as far as the cache knows, but older than PATCH_FALLBACK_TTL
+    cache._connect().execute("UPDATE responses SET stored_at = stored_at - ?", (smite.PATCH_FALLBACK_TTL + 1,))
+    assert cache.get('get_gods:{}', smite.CACHE_PATCH) is None
+
+
+@pytest.mark.skipif(smite.aiohttp is None, reason="aiohttp isn't installed")
+def test_async_client_uses_response_cache(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(smite, 'response_cache', smite.ResponseCache(str(tmp_path / 'enabled.sqlite3')))
+    smite.get_match_details_BATCH(match_id_list=list(range(1000, 1005)))
+    batches = server.stats["getmatchdetailsbatch"]
+
+    async def calls():
+        async with smite.AsyncSmiteClient() as client:
+            return (await client.get_match_details(match_id=1000), await client.get_match_details_BATCH(match_id_list=list(range(1000, 1010))),
+                    await client.get_patch_info())
+
+    single, batch, patch_info = asyncio.run(calls())
+    assert single and server.stats["getmatchdetails"] == 0
+    # only the 5 matches that weren't cached yet were requested, in one batch
+    assert server.stats["getmatchdetailsbatch"] == batches + 1
+    assert batch == smite.get_match_details_BATCH(match_id_list=list(range(1000, 1010)))
+    assert server.stats["getmatchdetailsbatch"] == batches + 1
+    assert smite.response_cache.patch_version == smite._patch_version(patch_info)
+
+
+##############################################################################
+############################### Static Data ##################################
+##############################################################################
+
+def test_compact_localized_round_trip():
+    data_by_language = {
+        1 : [{"id" : 1, "Name" : "Zeus", "Cost" : 5, "Ability" : {"Cooldown" : 10, "Text" : "Strike"}, "Extra" : None},
+             {"id" : 2, "Name" : "Thor"}],
+        2 : [{"id" : 2, "Name" : "Thor"},
+             {"id" : 1, "Name" : "Zeus DE", "Cost" : 5, "Ability" : {"Text" : "Schlag", "Cooldown" : 10, "Rank" : 2}}],
+        3 : [{"id" : 1, "Cost" : 5, "Name" : "Zeus", "Ability" : {"Cooldown" : 10, "Text" : "Strike"}, "Extra" : 7},
+             {"id" : 3, "Name" : "Only here"}],
+    }
+    # saved and loaded like a snapshot
+    compact = json.loads(json.dumps(smite.compact_localized(data_by_language, ("id",))))
+    for language, records in data_by_language.items():
+        assert json.dumps(smite.expand_localized(compact, language)) == json.dumps(records)
+
+
+def test_compact_localized_identical_records():
+    compact = smite.compact_localized({1 : [{"id" : 1, "n" : "a"}], 2 : [{"id" : 1, "n" : "a"}]}, ("id",))
+    assert smite.expand_localized(compact, 2) == [{"id" : 1, "n" : "a"}]
+
+
+def test_god_skins_from_compact_snapshot(server):
+    smite.static_data.fetch_god_skins_all_languages(god_ids=[1000, 1001], languages=(1, 2))
+    skins = smite.static_data.god_skins(1000, language_code=2)
+    assert skins and all(str(skin["god_id"]) == "1000" for skin in skins)
+    assert skins == smite.get_god_skins(god_id=1000, language_code=2)
+
+
+def test_god_skins_missing_from_snapshot_are_fetched(server):
+    smite.static_data.fetch_god_skins_all_languages(god_ids=[1000], languages=(1,))
+    calls = server.stats["getgodskins"]
+    skins = smite.static_data.god_skins(1001)
+    assert skins and all(str(skin["god_id"]) == "1001" for skin in skins)
+    assert server.stats["getgodskins"] == calls + 1
+
+
+def test_fetch_all_god_skins_on_clean_install(server, monkeypatch):
+    monkeypatch.setattr(smite, 'god_index', smite.GodIndex())
+    skins = {}
+    report = smite.fetch_all_god_skins(lambda god_id, god_skins: skins.update({god_id : god_skins}))
+    assert report["succeeded"] and not report["failed"]
+    assert sorted(skins) == sorted(smite.god_index.ids())
+
+    # no god list at all is an error, not an empty fetch
+    monkeypatch.setattr(smite, 'god_index', smite.GodIndex('missing.json'))
+    monkeypatch.setattr(smite.static_data, 'gods', lambda language_code=1: [])
+    with pytest.raises(smite.SmiteAPIError, match="god_ids"):
+        smite.static_data.fetch_god_skins_all_languages(languages=(1,))
+
+
+def test_god_index_lookups_never_hit_the_api(server, monkeypatch):
+    with open('gods_data_modified_NEW1.json', 'w', encoding='utf-8') as f:
+        json.dump([{"Name" : "Zeus", "GodID" : 1000, "Cooldown" : "10/9/8"}], f)
+    monkeypatch.setattr(smite, 'god_index', smite.GodIndex())
+    assert smite.Cooldowns('zeus') == "Zeus's cooldown for their first ability is **10/9/8!**"
+    assert smite.GodID() == [1000]
+    assert sum(server.stats.values()) == 0
+
+
+def test_god_index_builds_on_clean_install(server, monkeypatch):
+    monkeypatch.setattr(smite, 'god_index', smite.GodIndex())
+    god_ids = smite.GodID()
+    assert god_ids and server.stats["getgods"] == 1
+    name = smite.god_index.lookup(god_ids[0])["Name"]
+    assert smite.Cooldowns(name) != "God name is invalid."
+    # saved, the next process loads it without asking the api
+    monkeypatch.setattr(smite, 'god_index', smite.GodIndex())
+    assert smite.GodID() == god_ids
+    assert server.stats["getgods"] == 1
+
+
+##############################################################################
+############################# Match Harvesting ###############################
+##############################################################################
+
+def test_harvester_retries_a_failed_window(server, tmp_path):
+    checkpoint_file = str(tmp_path / 'harvest.jsonl')
+    harvester = smite.MatchIdHarvester(451, checkpoint_file=checkpoint_file, settle_minutes=0)
+    failures = [RuntimeError("sink is down")]
+    rows = []
+
+    def sink(batch):
+        if failures:
+            raise failures.pop()
+        rows.extend(batch)
+
+    with pytest.raises(RuntimeError):
+        harvester.run('20240101', '20240101', details_sink=sink)
+    total = harvester.run('20240101', '20240101', details_sink=sink)
+    assert total > 0
+    assert {str(row["Match"]) for row in rows} == harvester.seen_match_ids
+
+    with open(checkpoint_file) as f:
+        windows = [json.loads(line) for line in f]
+    assert len(windows) == 144 and all(window["matches"] for window in windows)
+
+    # a restart skips every checkpointed window
+    polls = server.stats["getmatchidsbyqueue"]
+    restarted = smite.MatchIdHarvester(451, checkpoint_file=checkpoint_file, settle_minutes=0)
+    assert restarted.run('20240101', '20240101', details_sink=sink) == 0
+    assert server.stats["getmatchidsbyqueue"] == polls
+
+
+##############################################################################
+################################# Players ####################################
+##############################################################################
+
+def test_player_ids_without_caching(server):
+    # nothing is remembered, the answers still have to come back
+    resolver = smite.PlayerResolver(ttl=0, negative_ttl=0)
+    player_ids = resolver.player_ids(["PlayerOne", "PlayerTwo", "playerone"])
+    assert list(player_ids) == ["PlayerOne", "PlayerTwo", "playerone"]
+    assert player_ids["PlayerOne"] and player_ids["PlayerTwo"]
+    assert player_ids["playerone"] == player_ids["PlayerOne"]
+    assert server.stats["getplayeridbyname"] == 2